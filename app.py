@@ -50,4 +50,8 @@ layout = pn.template.FastListTemplate(
 layout.servable()
 
 if __name__ == "__main__":
-    pn.serve(layout)
+    from utils.metricsEndpoint import ROUTES
+
+    # Plain-text metrics at /metrics; with `panel serve`, pass
+    # `--plugins utils.metricsEndpoint` instead
+    pn.serve(layout, extra_patterns=ROUTES)
@@ -0,0 +1,76 @@
+"""Server startup time, with views imported lazily versus eagerly.
+
+Every measurement runs in a fresh interpreter, so nothing is cached between
+them. Run from the repository root:
+
+    python benchmarks/startup.py [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMER = """
+import time
+start = time.perf_counter()
+{body}
+print(time.perf_counter() - start)
+"""
+
+# What a new session costs now: the app module, with every view left unimported
+LAZY = "import app"
+
+# What it cost when the sidebar imported every view up front
+EAGER = """
+import importlib
+import app
+from utils.sidebar import VIEWS
+for module_name, _ in VIEWS.values():
+    importlib.import_module(module_name)
+"""
+
+# Cost of the first opening of one view, paid by the first click on it
+FIRST_OPEN = """
+import app
+from utils.sidebar import create_view
+start = time.perf_counter()
+create_view({key!r})
+"""
+
+
+def time_snippet(body, repeat):
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", TIMER.format(body=body)],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    from utils.sidebar import VIEWS
+
+    lazy = time_snippet(LAZY, args.repeat)
+    eager = time_snippet(EAGER, args.repeat)
+    print(f"startup, lazy views:  {lazy:7.3f} s")
+    print(f"startup, eager views: {eager:7.3f} s  ({eager / lazy:.1f}x slower)")
+    for key in VIEWS:
+        first_open = time_snippet(FIRST_OPEN.format(key=key), args.repeat)
+        print(f"first open of {key}: {first_open:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Benchmark suite over the demo/data files and synthetic event lists.
+
+Times loading, binning with to_lc (and the binning pyramid) across dt, saving,
+previewing, simulating, dynamical power spectra and plot generation. Every run
+is stored as JSON in benchmarks/results/ and compared with the previous run (or
+--baseline): cases slower by more than --threshold are reported as regressions,
+and the script then exits with status 1. Run from the repository root:
+
+    python benchmarks/suite.py [--sizes 1e5,1e6] [--repeat 5] [--filter to_lc]
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_ROOT, "demo", "data")
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+import panel as pn
+import holoviews as hv
+from stingray import Lightcurve
+from stingray.events import EventList
+
+from utils.binningPyramid import BinningPyramid
+from utils.decimation import DEFAULT_PIXELS
+from utils.dynamicalPowerSpectrum import dynamical_power_spectrum
+from utils.eventSimulation import light_curve_shape, simulate_event_times
+from utils.globals import session_event_data
+from utils.ingestionCache import read_event_list_cached
+from utils.saveEngine import write_event_list_atomic
+
+EVENT_FILES = (
+    "monol_testA.evt",
+    "monol_testA_calib.evt",
+    "monol_testA_calib_unsrt.evt",
+    "xte_test.evt.gz",
+    "xte_gx_test.evt.gz",
+)
+LIGHT_CURVE_FILES = ("lcurveA.fits",)
+DT_VALUES = (0.01, 0.1, 1.0, 10.0)
+SAVE_FORMATS = ("hdf5", "pickle")
+PREVIEW_LISTS = 200
+# Synthetic lists have this mean count rate, so exposure scales with size
+SYNTHETIC_RATE = 100.0
+# Slowdowns below this many seconds are timer noise, not regressions
+MIN_DELTA = 1e-3
+
+
+def synthetic_event_list(n_events, seed=0):
+    exposure = n_events / SYNTHETIC_RATE
+    n_bins = int(np.ceil(exposure))
+    model = light_curve_shape("Sinusoidal", n_bins, 2 * SYNTHETIC_RATE, None)
+    times, gti = simulate_event_times(model, 1.0, seed=seed)
+    energy = np.random.default_rng(seed).uniform(0.3, 12.0, len(times))
+    return EventList(time=times, gti=gti, energy=energy, mjdref=58000.0)
+
+
+def size_label(n_events):
+    return f"{n_events:.0e}".replace("+0", "").replace("+", "")
+
+
+def collect_cases(sizes, workdir):
+    # (name, setup) pairs; setup() prepares the inputs and returns the callable
+    # that is timed, so preparation never counts towards a case
+    cases = []
+
+    for file_name in EVENT_FILES:
+        path = os.path.join(DATA_DIR, file_name)
+        cases.append((f"load/{file_name}", lambda path=path: lambda: EventList.read(path, "ogip")))
+
+        def cached(path=path):
+            cache_dir = os.path.join(workdir, "ingestion-cache")
+            read_event_list_cached(cache_dir, path, "ogip")
+            return lambda: read_event_list_cached(cache_dir, path, "ogip")
+
+        cases.append((f"load_cached/{file_name}", cached))
+
+    for file_name in LIGHT_CURVE_FILES:
+        path = os.path.join(DATA_DIR, file_name)
+        cases.append((f"load/{file_name}", lambda path=path: lambda: Lightcurve.read(path, fmt="ogip")))
+
+    for n_events in sizes:
+        label = size_label(n_events)
+        event_list = synthetic_event_list(n_events)
+
+        def load_hdf5(event_list=event_list, label=label):
+            path = os.path.join(workdir, f"synthetic-{label}.hdf5")
+            write_event_list_atomic(event_list, path, "hdf5")
+            return lambda: EventList.read(path, "hdf5")
+
+        cases.append((f"load/synthetic-{label}.hdf5", load_hdf5))
+
+        for dt in DT_VALUES:
+            cases.append(
+                (
+                    f"to_lc/{label}/dt={dt:g}",
+                    lambda event_list=event_list, dt=dt: lambda: event_list.to_lc(dt),
+                )
+            )
+
+            def pyramid(event_list=event_list, dt=dt):
+                built = BinningPyramid(event_list)
+                if built.multiple(dt) is None:
+                    return None
+                return lambda: built.lightcurve(event_list, dt)
+
+            cases.append((f"pyramid_lc/{label}/dt={dt:g}", pyramid))
+
+        for file_format in SAVE_FORMATS:
+            def save(event_list=event_list, file_format=file_format, label=label):
+                path = os.path.join(workdir, f"saved-{label}.{file_format}")
+                return lambda: write_event_list_atomic(event_list, path, file_format)
+
+            cases.append((f"save/{label}/{file_format}", save))
+
+        cases.append(
+            (
+                f"simulate/{label}",
+                lambda n_events=n_events: lambda: synthetic_event_list(n_events),
+            )
+        )
+
+        cases.append(
+            (
+                f"dynamical_pds/{label}/dt=1/1024",
+                lambda event_list=event_list: lambda: dynamical_power_spectrum(
+                    event_list.time, event_list.gti, 16.0, 1 / 1024
+                ),
+            )
+        )
+
+        def plot(event_list=event_list):
+            from functionality.QuickLook.LightCurve import create_decimated_plot
+
+            lc = event_list.to_lc(0.1)
+            return lambda: hv.render(create_decimated_plot(lc.time, lc.counts, DEFAULT_PIXELS))
+
+        cases.append((f"plot/{label}/dt=0.1", plot))
+
+    def preview():
+        from utils.dataIngestion import preview_loaded_files
+
+        registry = session_event_data()
+        registry.clear()
+        for i in range(PREVIEW_LISTS):
+            registry.add(f"list_{i}", synthetic_event_list(10_000, seed=i))
+        widgets = (
+            pn.widgets.TextAreaInput(),
+            pn.widgets.TextAreaInput(),
+            pn.widgets.Tabulator(),
+        )
+        return lambda: preview_loaded_files(None, *widgets)
+
+    cases.append((f"preview/{PREVIEW_LISTS}_lists", preview))
+    return cases
+
+
+def time_case(func, repeat):
+    func()  # warm-up: imports, caches and first-touch page faults
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+        "repeat": repeat,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    import stingray
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "stingray": stingray.__version__,
+        "panel": pn.__version__,
+        "holoviews": hv.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def latest_results(exclude=None):
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    paths = [path for path in paths if path != exclude]
+    return paths[-1] if paths else None
+
+
+def compare(current, baseline, threshold):
+    # Returns (name, baseline median, current median, ratio) per regression
+    regressions = []
+    for name, result in current.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = result["median"] / previous["median"]
+        if ratio > 1 + threshold and result["median"] - previous["median"] > MIN_DELTA:
+            regressions.append((name, previous["median"], result["median"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="1e5,1e6",
+        help="comma-separated sizes of the synthetic event lists",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--baseline", help="results file to compare with (default: latest run)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown of the median reported as a regression",
+    )
+    parser.add_argument("--no-save", action="store_true", help="do not store this run")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    hv.extension("bokeh")
+    sizes = [int(float(size)) for size in args.sizes.split(",") if size.strip()]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, setup in collect_cases(sizes, workdir):
+            if args.filter not in name:
+                continue
+            func = setup()
+            if func is None:
+                continue
+            results[name] = time_case(func, args.repeat)
+            print(f"{name:45s} {results[name]['median'] * 1e3:10.2f} ms")
+
+    run = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "environment": environment(),
+        "sizes": sizes,
+        "results": results,
+    }
+
+    saved_path = None
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        saved_path = os.path.join(RESULTS_DIR, f"{stamp}-{run['git_commit'] or 'nogit'}.json")
+        with open(saved_path, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"\nResults stored in {os.path.relpath(saved_path, REPO_ROOT)}")
+
+    baseline_path = args.baseline or latest_results(exclude=saved_path)
+    if baseline_path is None:
+        print("No previous run to compare with.")
+        return 0
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline["results"], args.threshold)
+    print(
+        f"Compared with {os.path.relpath(baseline_path, REPO_ROOT)} "
+        f"(commit {baseline.get('git_commit')})"
+    )
+    if baseline.get("environment") != run["environment"]:
+        print("Note: the baseline was recorded in a different environment.")
+    if not regressions:
+        print(f"No regressions above {args.threshold:.0%}.")
+        return 0
+
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}:")
+    for name, before, after, ratio in regressions:
+        print(f"  {name:45s} {before * 1e3:9.2f} ms -> {after * 1e3:9.2f} ms ({ratio:.2f}x)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import asyncio
+import holoviews as hv
+import numpy as np
+import panel as pn
+from utils.globals import session_event_data, power_spectrum_cache
+from utils.computePipeline import LatestRequestRunner, check_cancelled
+from utils.metrics import timed
+from utils.powerSpectrum import NORMALIZATIONS
+from utils.dynamicalPowerSpectrum import dynamical_power_spectrum, downsample_image
+
+hv.extension("bokeh")
+
+
+def compute_dynamical_power(
+    event_list, is_sorted, segment_size, dt, norm, progress=None, cancel_event=None
+):
+    def compute():
+        times = event_list.time if is_sorted else np.sort(event_list.time)
+        return dynamical_power_spectrum(
+            times,
+            event_list.gti,
+            segment_size,
+            dt,
+            norm=norm,
+            progress=progress,
+            cancel_event=cancel_event,
+        )
+
+    return power_spectrum_cache.get_or_compute(
+        event_list, ("dynamical_pds", float(segment_size), float(dt), norm), compute
+    )
+
+
+def create_spectrogram_plot(result, width, height, log_power):
+    # Only about one value per pixel of the visible range is sent to the
+    # browser; zooming re-slices the full array on the server
+    time, freq, power = result["time"], result["freq"], result["power"]
+
+    def visible_image(x_range, y_range):
+        rows = slice(None)
+        cols = slice(None)
+        if x_range is not None:
+            rows = slice(*np.searchsorted(time, x_range))
+        if y_range is not None:
+            cols = slice(*np.searchsorted(freq, y_range))
+        visible = power[rows, cols]
+        if not visible.size:
+            visible, rows, cols = power, slice(None), slice(None)
+        image, row_factor, col_factor = downsample_image(visible, width, height)
+        if log_power:
+            image = np.log10(np.where(image > 0, image, np.nan))
+        x = time[rows][: image.shape[0] * row_factor].reshape(-1, row_factor).mean(axis=1)
+        y = freq[cols][: image.shape[1] * col_factor].reshape(-1, col_factor).mean(axis=1)
+        return hv.QuadMesh(
+            (x, y, image.T),
+            ["Time", "Frequency (Hz)"],
+            "log10 Power" if log_power else "Power",
+        )
+
+    return hv.DynamicMap(visible_image, streams=[hv.streams.RangeXY()]).opts(
+        hv.opts.QuadMesh(
+            width=width, height=height, cmap="viridis", colorbar=True, tools=["hover"]
+        )
+    )
+
+
+def create_dynamical_power_spectrum_tab():
+    pn.extension()
+    loaded_event_data = session_event_data()
+
+    if not loaded_event_data:
+        return pn.pane.Markdown(
+            "### No loaded items available.\n\nPlease go to the Loading tab to load items."
+        )
+
+    event_list_dropdown = pn.widgets.Select(
+        name="Select Event List",
+        options=loaded_event_data.dropdown_options(),
+    )
+    dt_input = pn.widgets.FloatInput(name="dt (s)", value=1 / 1024, start=1e-6, width=150)
+    segment_size_input = pn.widgets.FloatInput(
+        name="Segment Size (s)", value=4.0, start=1e-6, width=150
+    )
+    norm_selector = pn.widgets.Select(
+        name="Normalization",
+        options=list(NORMALIZATIONS),
+        value="leahy",
+        width=150,
+    )
+    log_power_checkbox = pn.widgets.Checkbox(name="Logarithmic power", value=True)
+    progress_bar = pn.indicators.Progress(value=0, max=100, width=300, visible=False)
+    busy_indicator = pn.indicators.LoadingSpinner(value=False, size=25)
+    spectrogram_output_hv = pn.pane.HoloViews(width=700, height=400)
+    summary_output = pn.pane.Markdown("")
+
+    def hide_progress():
+        progress_bar.visible = False
+
+    def notify_error(error):
+        hide_progress()
+        if pn.state.notifications is not None:
+            pn.state.notifications.error(f"Dynamical power spectrum failed: {error}")
+
+    runner = LatestRequestRunner(
+        busy_indicator=busy_indicator,
+        on_error=notify_error,
+        on_cancel=hide_progress,
+        name="dynamicalpowerspectrum",
+    )
+
+    @timed("dynamicalpowerspectrum.generate_spectrogram")
+    def generate_spectrogram(event=None):
+        entry = loaded_event_data.get_by_id(event_list_dropdown.value)
+        if entry is None:
+            return
+        event_list = entry.event_list
+        is_sorted = entry.metadata.get("is_sorted", False)
+        dt = dt_input.value
+        segment_size = segment_size_input.value
+        norm = norm_selector.value
+        log_power = log_power_checkbox.value
+        width = spectrogram_output_hv.width
+        height = spectrogram_output_hv.height
+        loop = asyncio.get_event_loop()
+
+        progress_bar.value = 0
+        progress_bar.visible = True
+
+        def compute(cancel_event):
+            def set_progress(fraction):
+                # A superseded request no longer owns the bar
+                if not cancel_event.is_set():
+                    progress_bar.value = int(100 * fraction)
+
+            def report_progress(fraction):
+                # Called from the worker thread; widgets are updated on the loop
+                loop.call_soon_threadsafe(set_progress, fraction)
+
+            result = compute_dynamical_power(
+                event_list, is_sorted, segment_size, dt, norm, report_progress, cancel_event
+            )
+            check_cancelled(cancel_event)
+            plot = create_spectrogram_plot(result, width, height, log_power)
+            summary = (
+                f"**Segments:** {result['n_segments']} of {result['n_bin']} bins &nbsp; "
+                f"**Spectrogram:** {len(result['time'])} x {len(result['freq'])}"
+            )
+            if result["segments_per_row"] > 1 or result["freqs_per_column"] > 1:
+                summary += (
+                    f" (averaging {result['segments_per_row']} segments x "
+                    f"{result['freqs_per_column']} frequencies per cell)"
+                )
+            return plot, summary
+
+        def apply(result):
+            hide_progress()
+            spectrogram_output_hv.object, summary_output.object = result
+
+        runner.submit(compute, apply)
+
+    generate_button = pn.widgets.Button(
+        name="Generate Dynamical Power Spectrum", button_type="primary"
+    )
+    generate_button.on_click(generate_spectrogram)
+
+    return pn.Column(
+        event_list_dropdown,
+        pn.Row(dt_input, segment_size_input),
+        pn.Row(norm_selector, log_power_checkbox),
+        pn.Row(generate_button, busy_indicator, progress_bar),
+        summary_output,
+        spectrogram_output_hv,
+    )
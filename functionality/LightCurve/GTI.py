@@ -0,0 +1,232 @@
+import holoviews as hv
+import numpy as np
+import panel as pn
+from utils.globals import session_event_data, lightcurve_cache, gti_mask_cache
+from utils.computePipeline import LatestRequestRunner, check_cancelled
+from utils.metrics import timed
+from utils.decimation import minmax_decimate, DEFAULT_PIXELS
+from utils.bulkEventInput import parse_gti
+from utils.gtiEngine import (
+    normalize_gti,
+    gti_key,
+    gti_exposure,
+    gti_mask,
+    intersect_gti,
+    gti_from_threshold,
+)
+
+hv.extension("bokeh")
+
+# GTIs written out in the text area; longer sets are only summarised there
+MAX_SHOWN_GTIS = 200
+
+
+def event_list_span(event_list, is_sorted=False):
+    # The GTIs of an event list, or its full time range when it has none. For
+    # unsorted events stingray's default GTI, from the first to the last event,
+    # may be reversed and normalize to nothing.
+    if event_list.gti is not None and len(event_list.gti):
+        gti = normalize_gti(event_list.gti)
+        if len(gti):
+            return gti
+    time = event_list.time
+    if is_sorted:
+        return np.array([[time[0], time[-1]]])
+    return np.array([[np.min(time), np.max(time)]])
+
+
+def cached_gti_mask(event_list, gti, assume_sorted=None):
+    # Masks are cached per (event list, GTI set), so re-applying or comparing
+    # GTI sets never rescans the events
+    return gti_mask_cache.get_or_compute(
+        event_list,
+        ("gti_mask", gti_key(gti)),
+        lambda: gti_mask(event_list.time, gti, assume_sorted),
+    )
+
+
+def create_gti_plot(lc, gti):
+    time, counts = minmax_decimate(lc.time, lc.counts / lc.dt, DEFAULT_PIXELS)
+    curve = hv.Curve((time, counts), "Time", "Count rate")
+    spans = hv.VSpans(gti).opts(color="#00A170", alpha=0.2)
+    return (spans * curve).opts(width=700, height=300)
+
+
+def create_gti_tab():
+    pn.extension()
+    loaded_event_data = session_event_data()
+
+    if not loaded_event_data:
+        return pn.pane.Markdown(
+            "### No loaded items available.\n\nPlease go to the Loading tab to load items."
+        )
+
+    event_list_dropdown = pn.widgets.Select(
+        name="Select Event List",
+        options=loaded_event_data.dropdown_options(),
+    )
+    dt_input = pn.widgets.FloatInput(name="Bin size dt (s)", value=1.0, start=1e-6, width=150)
+    min_rate_input = pn.widgets.FloatInput(name="Min rate (ct/s)", value=None, width=150)
+    max_rate_input = pn.widgets.FloatInput(name="Max rate (ct/s)", value=None, width=150)
+    min_length_input = pn.widgets.FloatInput(
+        name="Min GTI length (s)", value=0.0, start=0.0, width=150
+    )
+    min_gap_input = pn.widgets.FloatInput(
+        name="Bridge gaps below (s)", value=0.0, start=0.0, width=150
+    )
+    gti_text_input = pn.widgets.TextAreaInput(
+        name="GTIs", placeholder="e.g., 0 100; 150 400", height=100, width=400
+    )
+    name_input = pn.widgets.TextInput(
+        name="Filtered Event List Name", placeholder="default: <name>_gti"
+    )
+    threshold_button = pn.widgets.Button(
+        name="Create from Threshold", button_type="primary"
+    )
+    entered_button = pn.widgets.Button(name="Use Entered GTIs", button_type="primary")
+    apply_button = pn.widgets.Button(name="Apply to Event List", button_type="success")
+    busy_indicator = pn.indicators.LoadingSpinner(value=False, size=25)
+    summary_output = pn.pane.Markdown("")
+    plot_output = pn.pane.HoloViews(width=700, height=300)
+
+    # The GTI set currently shown, in full, the event list it was computed for,
+    # and whether the text area has been edited by hand since
+    candidate = {"entry_id": None, "gti": None, "edited": False, "showing": False}
+
+    def notify_error(error):
+        if pn.state.notifications is not None:
+            pn.state.notifications.error(f"GTI operation failed: {error}")
+
+    runner = LatestRequestRunner(
+        busy_indicator=busy_indicator, on_error=notify_error, name="gti"
+    )
+
+    def show_candidate(entry_id, gti, n_kept, n_events, plot):
+        candidate["entry_id"], candidate["gti"] = entry_id, gti
+        plot_output.object = plot
+        summary_output.object = (
+            f"**{len(gti)} GTIs**, exposure {gti_exposure(gti):.3f} s; "
+            f"{n_kept} of {n_events} events inside."
+        )
+        text = "; ".join(f"{start:.6f} {stop:.6f}" for start, stop in gti[:MAX_SHOWN_GTIS])
+        if len(gti) > MAX_SHOWN_GTIS:
+            text += f"; ... ({len(gti) - MAX_SHOWN_GTIS} more)"
+        candidate["showing"] = True
+        try:
+            gti_text_input.value = text
+        finally:
+            candidate["showing"] = False
+        candidate["edited"] = False
+
+    def on_gti_text_change(event):
+        if not candidate["showing"]:
+            candidate["edited"] = True
+
+    def submit_gti(entry, dt, make_gti):
+        # make_gti(event_list, lc) -> GTI set; runs on the worker thread
+        entry_id = entry.id
+        event_list = entry.event_list
+        is_sorted = entry.metadata.get("is_sorted")
+
+        def compute(cancel_event):
+            # Rates binned from the events, so thresholds see the exact counts
+            lc = lightcurve_cache.get(event_list, dt, from_events=True)
+            check_cancelled(cancel_event)
+            span = event_list_span(event_list, is_sorted)
+            gti = intersect_gti(make_gti(event_list, lc), span)
+            mask = cached_gti_mask(event_list, gti, is_sorted)
+            check_cancelled(cancel_event)
+            return gti, int(np.count_nonzero(mask)), len(mask), create_gti_plot(lc, gti)
+
+        def apply(result):
+            show_candidate(entry_id, *result)
+
+        runner.submit(compute, apply)
+
+    @timed("gti.create_from_threshold")
+    def create_from_threshold(event=None):
+        entry = loaded_event_data.get_by_id(event_list_dropdown.value)
+        if entry is None:
+            return
+        dt = dt_input.value
+        limits = dict(
+            min_rate=min_rate_input.value,
+            max_rate=max_rate_input.value,
+            min_length=min_length_input.value or 0.0,
+            min_gap=min_gap_input.value or 0.0,
+        )
+
+        def make_gti(event_list, lc):
+            return gti_from_threshold(lc.counts, lc.dt, lc.time[0] - lc.dt / 2, **limits)
+
+        submit_gti(entry, dt, make_gti)
+
+    @timed("gti.use_entered_gtis")
+    def use_entered_gtis(event=None):
+        entry = loaded_event_data.get_by_id(event_list_dropdown.value)
+        if entry is None:
+            return
+        reusable = candidate["entry_id"] == entry.id and not candidate["edited"]
+        if candidate["gti"] is not None and reusable:
+            # The text may only summarise the set; the full one is kept
+            gti = candidate["gti"]
+        elif "..." in gti_text_input.value:
+            notify_error(
+                f"Only the first {MAX_SHOWN_GTIS} GTIs are shown; enter the full "
+                "list without '... (N more)'."
+            )
+            return
+        else:
+            try:
+                gti = normalize_gti(parse_gti(gti_text_input.value))
+            except ValueError as e:
+                notify_error(e)
+                return
+        submit_gti(entry, dt_input.value, lambda event_list, lc: gti)
+
+    @timed("gti.apply_to_event_list")
+    def apply_to_event_list(event=None):
+        entry = loaded_event_data.get_by_id(candidate["entry_id"])
+        gti = candidate["gti"]
+        if entry is None or gti is None:
+            summary_output.object = "Create or enter GTIs first."
+            return
+        name = name_input.value or f"{entry.name}_gti"
+        if name in loaded_event_data:
+            summary_output.object = f"A file with the name '{name}' already exists in memory. Please provide a different name."
+            return
+        event_list = entry.event_list
+        is_sorted = entry.metadata.get("is_sorted")
+
+        def compute(cancel_event):
+            mask = cached_gti_mask(event_list, gti, is_sorted)
+            filtered = event_list.apply_mask(mask)
+            filtered.gti = gti
+            return filtered
+
+        def apply(filtered):
+            loaded_event_data.add(name, filtered)
+            summary_output.object = (
+                f"Saved as **{name}**: {len(filtered.time)} events in {len(gti)} GTIs."
+            )
+
+        runner.submit(compute, apply)
+
+    gti_text_input.param.watch(on_gti_text_change, "value")
+    threshold_button.on_click(create_from_threshold)
+    entered_button.on_click(use_entered_gtis)
+    apply_button.on_click(apply_to_event_list)
+
+    return pn.Column(
+        event_list_dropdown,
+        pn.pane.Markdown("#### GTIs from count-rate thresholds"),
+        pn.Row(dt_input, min_rate_input, max_rate_input),
+        pn.Row(min_length_input, min_gap_input),
+        pn.Row(threshold_button, busy_indicator),
+        pn.pane.Markdown("#### GTIs entered or edited by hand"),
+        gti_text_input,
+        entered_button,
+        plot_output,
+        summary_output,
+        pn.Row(name_input, apply_button),
+    )
@@ -1,4 +1,8 @@
 import panel as pn
+from functionality.LightCurve.GTI import create_gti_tab
+from functionality.LightCurve.DynamicalPowerSpectrum import (
+    create_dynamical_power_spectrum_tab,
+)
 
 def create_light_curve_analysis_panel():
     # Initialize Panel extension
@@ -13,12 +17,12 @@ def create_light_curve_analysis_panel():
     tab2 = pn.Column(tab2_content, name="Light Curve")
 
     # Tab 3: GTI
-    tab3_content = pn.pane.Markdown("### GTI\n\nThis is the content for GTI.")
+    tab3_content = create_gti_tab()
     tab3 = pn.Column(tab3_content, name="GTI")
 
-    # Tab 4: tab4
-    tab4_content = pn.pane.Markdown("### tab4\n\nThis is the content for tab4.")
-    tab4 = pn.Column(tab4_content, name="tab4")
+    # Tab 4: Dynamical Power Spectrum
+    tab4_content = create_dynamical_power_spectrum_tab()
+    tab4 = pn.Column(tab4_content, name="Dynamical PDS")
 
     # Tab 5: tab5
     tab5_content = pn.pane.Markdown("### tab5\n\nThis is the content for tab5.")
@@ -57,7 +61,7 @@ def create_light_curve_analysis_panel():
         ("Data ingestion", tab1),
         ("Light Curve", tab2),
         ("GTI", tab3),
-        ("tab4", tab4),
+        ("Dynamical PDS", tab4),
         ("tab5", tab5),
         ("tab6", tab6),
         ("tab7", tab7),
@@ -0,0 +1,157 @@
+import holoviews as hv
+import panel as pn
+from utils.globals import session_event_data
+from utils.computePipeline import LatestRequestRunner, check_cancelled
+from utils.metrics import timed
+from utils.crossCorrelation import (
+    CrossCorrelationEngine,
+    bin_on_common_grid,
+    parse_energy_bands,
+)
+
+hv.extension("bokeh")
+
+
+def build_series(entries, bands):
+    # One series per event list, or per (event list, energy band) when bands are given
+    if not bands:
+        return [(entry.name, entry.event_list, None) for entry in entries]
+    return [
+        (f"{entry.name} [{emin:g}-{emax:g}]", entry.event_list, (emin, emax))
+        for entry in entries
+        for emin, emax in bands
+    ]
+
+
+def create_quicklook_crosscorrelation():
+    pn.extension()
+    loaded_event_data = session_event_data()
+
+    if not loaded_event_data:
+        tab1_content = pn.pane.Markdown(
+            "### No loaded items available.\n\nPlease go to the Loading tab to load items."
+        )
+    else:
+        event_list_selector = pn.widgets.MultiSelect(
+            name="Select Event Lists",
+            options=loaded_event_data.dropdown_options(),
+            size=8,
+        )
+        energy_bands_input = pn.widgets.TextInput(
+            name="Energy Bands (optional)",
+            placeholder="e.g., 0.3-2, 2-10",
+        )
+        dt_input = pn.widgets.FloatInput(
+            name="dt (s)", value=1.0, start=1e-6, width=150
+        )
+        max_lag_input = pn.widgets.FloatInput(
+            name="Maximum Lag (s)", value=100.0, start=0.0, width=150
+        )
+        lag_resolution_input = pn.widgets.FloatInput(
+            name="Lag Resolution (s)", value=1.0, start=1e-6, width=150
+        )
+
+        ccf_output_hv = pn.pane.HoloViews(width=700, height=400)
+        summary_output = pn.pane.Markdown("")
+        busy_indicator = pn.indicators.LoadingSpinner(value=False, size=25)
+
+        def notify_error(error):
+            if pn.state.notifications is not None:
+                pn.state.notifications.error(f"Cross-correlation failed: {error}")
+
+        runner = LatestRequestRunner(
+            busy_indicator=busy_indicator,
+            on_error=notify_error,
+            name="crosscorrelation",
+        )
+
+        # Transforms of the current selection, reused while only the maximum lag
+        # or the lag resolution change
+        engine_state = {"key": None, "engine": None}
+
+        @timed("crosscorrelation.generate_crosscorrelation")
+        def generate_crosscorrelation(event=None):
+            selected_ids = tuple(event_list_selector.value)
+            bands_text = energy_bands_input.value
+            dt = dt_input.value
+            max_lag = max_lag_input.value
+            lag_resolution = lag_resolution_input.value
+
+            def compute(cancel_event):
+                bands = parse_energy_bands(bands_text) if bands_text else []
+                entries = [loaded_event_data.get_by_id(i) for i in selected_ids]
+                series = build_series(entries, bands)
+                if len(series) < 2:
+                    raise ValueError(
+                        "Select at least two event lists, or energy bands of one list."
+                    )
+
+                key = (selected_ids, tuple(bands), float(dt))
+                engine = engine_state["engine"]
+                if engine_state["key"] != key:
+                    _, counts = bin_on_common_grid(series, dt)
+                    check_cancelled(cancel_event)
+                    engine = CrossCorrelationEngine(
+                        [label for label, _, _ in series], counts, dt
+                    )
+                check_cancelled(cancel_event)
+
+                lags, ccfs = engine.correlate(
+                    max_lag=max_lag, lag_resolution=lag_resolution
+                )
+                curves = [
+                    hv.Curve(
+                        (lags, ccf),
+                        "Lag (s)",
+                        "Cross-correlation",
+                        label=f"{engine.labels[i]} x {engine.labels[j]}",
+                    )
+                    for (i, j), ccf in zip(engine.pairs(), ccfs)
+                ]
+                plot = hv.Overlay(curves).opts(
+                    width=700, height=400, legend_position="right"
+                )
+                summary = (
+                    f"**Series:** {len(engine.labels)} &nbsp; "
+                    f"**Pairs:** {len(curves)} &nbsp; "
+                    f"**Common bins:** {engine.n_bin}"
+                )
+                return key, engine, plot, summary
+
+            def apply(result):
+                key, engine, plot, summary = result
+                engine_state["key"], engine_state["engine"] = key, engine
+                ccf_output_hv.object = plot
+                summary_output.object = summary
+
+            runner.submit(compute, apply)
+
+        @timed("crosscorrelation.on_lag_change")
+        def on_lag_change(event):
+            # Only inverse FFTs are needed, so follow the lag inputs directly
+            if engine_state["engine"] is not None:
+                generate_crosscorrelation()
+
+        max_lag_input.param.watch(on_lag_change, "value")
+        lag_resolution_input.param.watch(on_lag_change, "value")
+
+        generate_button = pn.widgets.Button(
+            name="Generate Cross-Correlation", button_type="primary"
+        )
+        generate_button.on_click(generate_crosscorrelation)
+
+        tab1_content = pn.Column(
+            event_list_selector,
+            energy_bands_input,
+            dt_input,
+            pn.Row(max_lag_input, lag_resolution_input),
+            pn.Row(generate_button, busy_indicator),
+            summary_output,
+            ccf_output_hv,
+        )
+
+    tabs = pn.Tabs(
+        ("Cross-Correlation", tab1_content), dynamic=True, sizing_mode="stretch_width"
+    )
+
+    return tabs
@@ -0,0 +1,176 @@
+import holoviews as hv
+import numpy as np
+import panel as pn
+from utils.globals import session_event_data, lightcurve_cache, energy_index_cache
+from utils.computePipeline import LatestRequestRunner, check_cancelled
+from utils.metrics import timed
+from utils.decimation import minmax_decimate
+from utils.bulkEventInput import parse_numbers
+from utils.energyBands import EnergyIndex, band_lightcurves, check_bands, hardness_ratio
+
+hv.extension("bokeh")
+
+
+def band_label(band):
+    return f"{band[0]:g}-{band[1]:g} keV"
+
+
+def compute_band_lightcurves(event_list, bands, dt, cancel_event=None):
+    # The energy index is kept per list, so a new set of bands costs one
+    # scatter of band labels plus one binning pass
+    def compute():
+        if event_list.energy is None:
+            raise ValueError("This event list has no energy information.")
+        energy_index = energy_index_cache.get_or_compute(
+            event_list, ("energy_index",), lambda: EnergyIndex(event_list.energy)
+        )
+        check_cancelled(cancel_event)
+        return band_lightcurves(event_list, bands, dt, energy_index)
+
+    key = ("energy_bands", float(dt), tuple(map(float, np.ravel(bands))))
+    return lightcurve_cache.get_or_compute(event_list, key, compute)
+
+
+def create_quicklook_energy_bands():
+    pn.extension()
+    loaded_event_data = session_event_data()
+
+    if not loaded_event_data:
+        tab1_content = pn.pane.Markdown(
+            "### No loaded items available.\n\nPlease go to the Loading tab to load items."
+        )
+    else:
+        event_list_dropdown = pn.widgets.Select(
+            name="Select Event List",
+            options=loaded_event_data.dropdown_options(),
+        )
+        dt_input = pn.widgets.FloatInput(name="dt (s)", value=1.0, start=1e-6, width=150)
+        bands_input = pn.widgets.TextAreaInput(
+            name="Energy Bands (keV)",
+            value="0.3 2; 2 10",
+            placeholder="e.g., 0.3 2; 2 5; 5 10",
+            height=80,
+            width=300,
+        )
+        soft_band_selector = pn.widgets.Select(name="Soft Band", width=150)
+        hard_band_selector = pn.widgets.Select(name="Hard Band", width=150)
+
+        bands_output_hv = pn.pane.HoloViews(width=700, height=300)
+        hardness_output_hv = pn.pane.HoloViews(width=700, height=250)
+        summary_output = pn.pane.Markdown("")
+        busy_indicator = pn.indicators.LoadingSpinner(value=False, size=25)
+
+        def notify_error(error):
+            if pn.state.notifications is not None:
+                pn.state.notifications.error(f"Energy band light curves failed: {error}")
+
+        runner = LatestRequestRunner(
+            busy_indicator=busy_indicator,
+            on_error=notify_error,
+            name="energybands",
+        )
+
+        def parse_bands():
+            try:
+                return check_bands(parse_numbers(bands_input.value))
+            except ValueError as e:
+                notify_error(e)
+                return None
+
+        # Set while the selectors are refilled for a new set of bands, so that
+        # their watchers do not start a second computation
+        selectors = {"updating": False}
+
+        def update_band_selectors(bands):
+            labels = [band_label(band) for band in bands]
+            options = {label: i for i, label in enumerate(labels)}
+            if list(soft_band_selector.options) == labels:
+                return
+            selectors["updating"] = True
+            try:
+                soft_band_selector.options = options
+                hard_band_selector.options = options
+                soft_band_selector.value = 0
+                hard_band_selector.value = len(labels) - 1
+            finally:
+                selectors["updating"] = False
+
+        @timed("energybands.generate_band_lightcurves")
+        def generate_band_lightcurves(event=None):
+            selected_event_list_id = event_list_dropdown.value
+            bands = parse_bands()
+            if selected_event_list_id is None or bands is None:
+                return
+            update_band_selectors(bands)
+            dt = dt_input.value
+            soft, hard = soft_band_selector.value, hard_band_selector.value
+            width = bands_output_hv.width
+            event_list = loaded_event_data.get_by_id(selected_event_list_id).event_list
+
+            def compute(cancel_event):
+                lcs = compute_band_lightcurves(event_list, bands, dt, cancel_event)
+                check_cancelled(cancel_event)
+
+                curves = []
+                for band, lc in zip(bands, lcs):
+                    x, y = minmax_decimate(lc.time, lc.counts, width)
+                    curves.append(hv.Curve((x, y), "Time", "Counts", label=band_label(band)))
+                bands_plot = hv.Overlay(curves).opts(
+                    width=700, height=300, legend_position="top_right"
+                )
+
+                ratio, _ = hardness_ratio(lcs[soft].counts, lcs[hard].counts)
+                # Bins without counts have no ratio
+                defined = np.isfinite(ratio)
+                x, y = minmax_decimate(lcs[0].time[defined], ratio[defined], width)
+                hardness_plot = hv.Curve(
+                    (x, y), "Time", f"({band_label(bands[hard])} - {band_label(bands[soft])}) / sum"
+                ).opts(width=700, height=250, color="black")
+
+                totals = ", ".join(
+                    f"{band_label(band)}: {int(lc.counts.sum())}" for band, lc in zip(bands, lcs)
+                )
+                summary = (
+                    f"**Bins:** {len(lcs[0].time)} at dt = {lcs[0].dt:g} s &nbsp; "
+                    f"**Counts:** {totals}"
+                )
+                return bands_plot, hardness_plot, summary
+
+            def apply(result):
+                (
+                    bands_output_hv.object,
+                    hardness_output_hv.object,
+                    summary_output.object,
+                ) = result
+
+            runner.submit(compute, apply)
+
+        @timed("energybands.on_band_selection")
+        def on_band_selection(event):
+            # Band light curves are cached, so only the hardness ratio is redone
+            if bands_output_hv.object is not None and not selectors["updating"]:
+                generate_band_lightcurves()
+
+        soft_band_selector.param.watch(on_band_selection, "value")
+        hard_band_selector.param.watch(on_band_selection, "value")
+
+        generate_button = pn.widgets.Button(
+            name="Generate Band Light Curves", button_type="primary"
+        )
+        generate_button.on_click(generate_band_lightcurves)
+
+        tab1_content = pn.Column(
+            event_list_dropdown,
+            pn.Row(dt_input, bands_input),
+            pn.Row(soft_band_selector, hard_band_selector),
+            pn.Row(generate_button, busy_indicator),
+            summary_output,
+            bands_output_hv,
+            hardness_output_hv,
+        )
+
+    tabs = pn.Tabs(
+        ("Energy Bands", tab1_content), dynamic=True, sizing_mode="stretch_width"
+    )
+
+    return tabs
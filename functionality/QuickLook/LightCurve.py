@@ -1,16 +1,220 @@
 import holoviews as hv
 import panel as pn
-from utils.globals import loaded_event_data
+from utils.globals import session_event_data, session_streamed_products, lightcurve_cache
 import numpy as np
 import pandas as pd
+from concurrent.futures import wait, FIRST_COMPLETED
 import hvplot.pandas
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from utils.decimation import minmax_decimate, slice_range
+from utils.computePipeline import LatestRequestRunner, check_cancelled
+from utils.metrics import timed
+from utils.executors import get_process_pool
+from utils.batchBinning import (
+    ALIGNMENTS,
+    times_source,
+    event_list_span,
+    shared_grid,
+    bin_on_grid,
+)
 
 hv.extension("bokeh")
 
 
+def create_decimated_plot(time, counts, n_pixels):
+    # Only the min/max envelope of the visible range is sent to the browser.
+    # Zooming updates the RangeX stream, which re-slices the full-resolution
+    # arrays on the server, so narrow ranges end up showing every bin.
+    def visible_curve(x_range):
+        start, stop = slice_range(time, x_range)
+        x, y = minmax_decimate(time[start:stop], counts[start:stop], n_pixels)
+        return hv.Curve((x, y), "Time", "Counts")
+
+    return hv.DynamicMap(visible_curve, streams=[hv.streams.RangeX()])
+
+
+def compute_batch_counts(entries, dt, alignment, cancel_event=None):
+    # Every list is binned by a worker process straight onto the shared grid;
+    # returns the grid time axis and one row of counts per list
+    spans = [event_list_span(entry.event_list, entry.metadata) for entry in entries]
+    grid_starts, n_bins = shared_grid(spans, dt, alignment)
+    pool = get_process_pool()
+    futures = {
+        pool.submit(
+            bin_on_grid,
+            times_source(entry.event_list.time),
+            entry.event_list.gti,
+            grid_start,
+            dt,
+            n_bins,
+        ): row
+        for row, (entry, grid_start) in enumerate(zip(entries, grid_starts))
+    }
+
+    counts = np.empty((len(entries), n_bins))
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            check_cancelled(cancel_event)
+            for future in done:
+                counts[futures[future]] = future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+    offset = grid_starts[0] if alignment == ALIGNMENTS[0] else 0.0
+    time = offset + (np.arange(n_bins) + 0.5) * dt
+    return time, counts
+
+
+def create_batch_plot(names, time, counts, layout, n_pixels):
+    curves = []
+    for name, row in zip(names, counts):
+        # Bins outside the GTIs are NaN and left out of the envelope
+        defined = np.isfinite(row)
+        x, y = minmax_decimate(time[defined], row[defined], n_pixels)
+        curves.append(hv.Curve((x, y), "Time", "Counts", label=name))
+    if layout == "Overlay":
+        return hv.Overlay(curves).opts(width=700, height=400, legend_position="right")
+    return hv.Layout([curve.opts(width=700, height=200) for curve in curves]).cols(1)
+
+
+def create_batch_overlay(loaded_event_data):
+    event_list_selector = pn.widgets.MultiSelect(
+        name="Select Event Lists",
+        options=loaded_event_data.dropdown_options(),
+        size=8,
+    )
+    dt_input = pn.widgets.FloatInput(name="dt (s)", value=1.0, start=1e-6, width=150)
+    alignment_selector = pn.widgets.RadioButtonGroup(
+        name="Alignment", options=list(ALIGNMENTS), value=ALIGNMENTS[0]
+    )
+    layout_selector = pn.widgets.RadioButtonGroup(
+        name="Layout", options=["Overlay", "Stacked"], value="Overlay"
+    )
+    batch_output_hv = pn.pane.HoloViews(width=700, height=400)
+    summary_output = pn.pane.Markdown("")
+    busy_indicator = pn.indicators.LoadingSpinner(value=False, size=25)
+
+    # Counts of the last request, so that switching the layout only re-plots
+    last_batch = {"key": None, "result": None}
+
+    def notify_error(error):
+        if pn.state.notifications is not None:
+            pn.state.notifications.error(f"Batch light curves failed: {error}")
+
+    runner = LatestRequestRunner(
+        busy_indicator=busy_indicator,
+        on_error=notify_error,
+        name="lightcurve.batch",
+    )
+
+    @timed("lightcurve.generate_batch")
+    def generate_batch(event=None):
+        entries = [
+            entry
+            for entry in map(loaded_event_data.get_by_id, event_list_selector.value)
+            if entry is not None
+        ]
+        if not entries:
+            summary_output.object = "Select at least one event list."
+            return
+        dt = dt_input.value
+        alignment = alignment_selector.value
+        layout = layout_selector.value
+        n_pixels = batch_output_hv.width
+        key = (tuple(entry.id for entry in entries), dt, alignment)
+        names = [entry.name for entry in entries]
+
+        def compute(cancel_event):
+            if last_batch["key"] == key:
+                time, counts = last_batch["result"]
+            else:
+                time, counts = compute_batch_counts(entries, dt, alignment, cancel_event)
+            check_cancelled(cancel_event)
+            plot = create_batch_plot(names, time, counts, layout, n_pixels)
+            summary = (
+                f"**Event lists:** {len(entries)} &nbsp; "
+                f"**Shared grid:** {len(time)} bins of {dt:g} s"
+            )
+            return (time, counts), plot, summary
+
+        def apply(result):
+            last_batch["key"], last_batch["result"] = key, result[0]
+            batch_output_hv.object, summary_output.object = result[1:]
+
+        runner.submit(compute, apply)
+
+    @timed("lightcurve.on_batch_layout_change")
+    def on_layout_change(event):
+        if batch_output_hv.object is not None:
+            generate_batch()
+
+    layout_selector.param.watch(on_layout_change, "value")
+
+    generate_batch_button = pn.widgets.Button(
+        name="Generate Batch Light Curves", button_type="primary"
+    )
+    generate_batch_button.on_click(generate_batch)
+
+    return pn.Column(
+        event_list_selector,
+        dt_input,
+        pn.Row(alignment_selector, layout_selector),
+        pn.Row(generate_batch_button, busy_indicator),
+        summary_output,
+        batch_output_hv,
+    )
+
+
+def create_streamed_view(streamed_products):
+    # Products binned while streaming from disk: the light curve, its GTIs and
+    # the energy histogram are already small, so they are plotted directly
+    product_dropdown = pn.widgets.Select(
+        name="Select Streamed File", options=list(streamed_products)
+    )
+    lightcurve_output_hv = pn.pane.HoloViews(width=700, height=300)
+    energy_output_hv = pn.pane.HoloViews(width=700, height=250)
+    summary_output = pn.pane.Markdown("")
+
+    @timed("lightcurve.show_streamed")
+    def show_streamed(event=None):
+        products = streamed_products.get(product_dropdown.value)
+        if products is None:
+            return
+        lc = products["lightcurve"]
+        spans = hv.VSpans(products["gti"]).opts(color="#00A170", alpha=0.2)
+        curve = create_decimated_plot(lc.time, lc.counts, lightcurve_output_hv.width)
+        lightcurve_output_hv.object = (spans * curve).opts(width=700, height=300)
+
+        energy_counts = products["energy_counts"]
+        if energy_counts is None:
+            energy_output_hv.object = None
+        else:
+            edges = products["energy_edges"]
+            if edges is None:
+                edges = np.arange(len(energy_counts) + 1)
+            energy_output_hv.object = hv.Histogram(
+                (edges, energy_counts), kdims=products["energy_column"], vdims="Counts"
+            ).opts(width=700, height=250)
+        summary_output.object = (
+            f"**Events:** {products['n_events']} ({products['n_outside']} outside "
+            f"the grid) &nbsp; **Bins:** {len(lc.counts)} of {lc.dt:g} s &nbsp; "
+            f"**GTIs:** {len(products['gti'])}"
+        )
+
+    product_dropdown.param.watch(show_streamed, "value")
+    show_streamed()
+
+    return pn.Column(
+        product_dropdown, summary_output, lightcurve_output_hv, energy_output_hv
+    )
+
+
 def create_quicklook_lightcurve():
     pn.extension()
+    loaded_event_data = session_event_data()
 
     if not loaded_event_data:
         tab1_content = pn.pane.Markdown(
@@ -19,7 +223,7 @@ def create_quicklook_lightcurve():
     else:
         event_list_dropdown = pn.widgets.Select(
             name="Select Event List",
-            options={name: i for i, (name, event) in enumerate(loaded_event_data)},
+            options=loaded_event_data.dropdown_options(),
         )
 
         dt_slider = pn.widgets.FloatSlider(
@@ -30,14 +234,53 @@ def create_quicklook_lightcurve():
             value=1,
         )
 
+        plot_mode_selector = pn.widgets.RadioButtonGroup(
+            name="Plot Mode",
+            options=["Decimated", "Full Resolution"],
+            value="Decimated",
+        )
+
         line_output_hv = pn.pane.HoloViews(width=500, height=300)
-        dataframe_output = pn.pane.DataFrame(width=500, height=300)
+        # Remote pagination keeps the frame on the server: only the visible page
+        # is sent to the browser, and sorting/filtering run server-side
+        dataframe_output = pn.widgets.Tabulator(
+            pagination="remote",
+            page_size=20,
+            disabled=True,
+            show_index=False,
+            header_filters={
+                "Time": {"type": "number", "func": ">=", "placeholder": "Time >="},
+                "Counts": {"type": "number", "func": ">=", "placeholder": "Counts >="},
+            },
+            width=500,
+            height=300,
+        )
         line_output_matplotlib = pn.pane.Matplotlib(width=500, height=300)
+        # One spinner per runner: each runner turns its own off when done
+        plot_busy_indicator = pn.indicators.LoadingSpinner(value=False, size=25)
+        table_busy_indicator = pn.indicators.LoadingSpinner(value=False, size=25)
 
-        def create_dataframe(selected_event_list_index, dt):
-            if selected_event_list_index is not None:
-                event_list = loaded_event_data[selected_event_list_index][1]
-                lc_new = event_list.to_lc(dt=dt)
+        def notify_error(error):
+            if pn.state.notifications is not None:
+                pn.state.notifications.error(f"Light curve failed: {error}")
+
+        # One runner per output, so that a table request does not cancel a plot
+        plot_runner = LatestRequestRunner(
+            busy_indicator=plot_busy_indicator,
+            on_error=notify_error,
+            name="lightcurve.plot",
+        )
+        table_runner = LatestRequestRunner(
+            busy_indicator=table_busy_indicator,
+            on_error=notify_error,
+            name="lightcurve.table",
+        )
+
+        def create_dataframe(selected_event_list_id, dt):
+            if selected_event_list_id is not None:
+                entry = loaded_event_data.get_by_id(selected_event_list_id)
+                event_list = entry.event_list
+                lc_new = lightcurve_cache.get(event_list, dt)
 
                 df = pd.DataFrame(
                     {
@@ -48,30 +291,73 @@ def create_quicklook_lightcurve():
                 return df
             return None
 
+        @timed("lightcurve.generate_lightcurve")
         def generate_lightcurve(event=None):
-            selected_event_list_index = event_list_dropdown.value
+            # Widget values are read here, on the event loop, and handed to the
+            # worker thread
+            selected_event_list_id = event_list_dropdown.value
             dt = dt_slider.value
-            df = create_dataframe(selected_event_list_index, dt)
-            if df is not None:
+            decimated = plot_mode_selector.value == "Decimated"
+            hv_width = line_output_hv.width
+            matplotlib_width = line_output_matplotlib.width
+
+            def compute(cancel_event):
+                df = create_dataframe(selected_event_list_id, dt)
+                if df is None:
+                    return None
+                check_cancelled(cancel_event)
+                time = df["Time"].to_numpy()
+                counts = df["Counts"].to_numpy()
+
                 # Creating the line plot with HoloViews (Bokeh)
-                line_plot_hv = df.hvplot.line(x="Time", y="Counts")
-                line_output_hv.object = line_plot_hv
+                if decimated:
+                    line_plot_hv = create_decimated_plot(time, counts, hv_width)
+                else:
+                    line_plot_hv = df.hvplot.line(x="Time", y="Counts")
+                check_cancelled(cancel_event)
 
-                # Creating the line plot with Matplotlib
-                fig, ax = plt.subplots()
-                ax.plot(df["Time"], df["Counts"], label="Light Curve")
+                # Creating the line plot with Matplotlib, from the same envelope
+                # since the static image cannot show more than its pixel width.
+                # Figure is used directly as pyplot is not thread-safe.
+                if decimated:
+                    time, counts = minmax_decimate(time, counts, matplotlib_width)
+                fig = Figure()
+                ax = fig.subplots()
+                ax.plot(time, counts, label="Light Curve")
                 ax.set_xlabel("Time")
                 ax.set_ylabel("Counts")
                 ax.legend()
-                line_output_matplotlib.object = fig
+                return line_plot_hv, fig
+
+            def apply(result):
+                if result is not None:
+                    line_output_hv.object, line_output_matplotlib.object = result
 
+            plot_runner.submit(compute, apply)
+
+        @timed("lightcurve.show_dataframe")
         def show_dataframe(event=None):
-            selected_event_list_index = event_list_dropdown.value
+            selected_event_list_id = event_list_dropdown.value
             dt = dt_slider.value
-            df = create_dataframe(selected_event_list_index, dt)
-            if df is not None:
-                # Display the DataFrame
-                dataframe_output.object = df
+
+            def compute(cancel_event):
+                return create_dataframe(selected_event_list_id, dt)
+
+            def apply(df):
+                if df is not None:
+                    # Display the DataFrame
+                    dataframe_output.value = df
+
+            table_runner.submit(compute, apply)
+
+        @timed("lightcurve.on_dt_change")
+        def on_dt_change(event):
+            # Rebinning comes from the binning pyramid and requests are debounced,
+            # so once a light curve is shown it can follow the slider directly
+            if line_output_hv.object is not None:
+                generate_lightcurve()
+
+        dt_slider.param.watch(on_dt_change, "value")
 
         generate_lightcurve_button = pn.widgets.Button(
             name="Generate Light Curve", button_type="primary"
@@ -86,7 +372,13 @@ def create_quicklook_lightcurve():
         tab1_content = pn.Column(
             event_list_dropdown,
             dt_slider,
-            pn.Row(generate_lightcurve_button, show_dataframe_button),
+            plot_mode_selector,
+            pn.Row(
+                generate_lightcurve_button,
+                plot_busy_indicator,
+                show_dataframe_button,
+                table_busy_indicator,
+            ),
             pn.Row(line_output_hv, dataframe_output),
             line_output_matplotlib,
         )
@@ -94,6 +386,11 @@ def create_quicklook_lightcurve():
     tabs = pn.Tabs(
         ("Light Curve", tab1_content), dynamic=True, sizing_mode="stretch_width"
     )
+    if loaded_event_data:
+        tabs.append(("Batch Overlay", create_batch_overlay(loaded_event_data)))
+    streamed_products = session_streamed_products()
+    if streamed_products:
+        tabs.append(("Streamed", create_streamed_view(streamed_products)))
 
     return tabs
 
@@ -0,0 +1,137 @@
+import holoviews as hv
+import panel as pn
+from utils.globals import session_event_data, lightcurve_cache, power_spectrum_cache
+from utils.computePipeline import LatestRequestRunner, check_cancelled
+from utils.metrics import timed
+from utils.powerSpectrum import (
+    NORMALIZATIONS,
+    averaged_unnormalized_power,
+    normalize_averaged_power,
+    log_rebin,
+)
+
+hv.extension("bokeh")
+
+
+def compute_averaged_power(event_list, dt, segment_size, cancel_event=None):
+    # The unnormalized average is cached; normalization and rebinning are cheap
+    # and applied on top, so changing them never repeats the FFTs. The light
+    # curve is binned from the events, never rebinned from coarser counts.
+    def compute():
+        lc = lightcurve_cache.get(event_list, dt, from_events=True)
+        check_cancelled(cancel_event)
+        return averaged_unnormalized_power(lc, segment_size)
+
+    return power_spectrum_cache.get_or_compute(
+        event_list, ("averaged_pds", float(dt), float(segment_size)), compute
+    )
+
+
+def create_quicklook_powerspectrum():
+    pn.extension()
+    loaded_event_data = session_event_data()
+
+    if not loaded_event_data:
+        tab1_content = pn.pane.Markdown(
+            "### No loaded items available.\n\nPlease go to the Loading tab to load items."
+        )
+    else:
+        event_list_dropdown = pn.widgets.Select(
+            name="Select Event List",
+            options=loaded_event_data.dropdown_options(),
+        )
+        dt_input = pn.widgets.FloatInput(
+            name="dt (s)", value=1 / 64, start=1e-6, width=150
+        )
+        segment_size_input = pn.widgets.FloatInput(
+            name="Segment Size (s)", value=16.0, start=1e-6, width=150
+        )
+        norm_selector = pn.widgets.Select(
+            name="Normalization",
+            options=list(NORMALIZATIONS),
+            value="leahy",
+            width=150,
+        )
+        rebin_input = pn.widgets.FloatInput(
+            name="Log-Rebin Factor (0 = none)",
+            value=0.0,
+            start=0.0,
+            step=0.01,
+            width=150,
+        )
+
+        pds_output_hv = pn.pane.HoloViews(width=700, height=400)
+        summary_output = pn.pane.Markdown("")
+        busy_indicator = pn.indicators.LoadingSpinner(value=False, size=25)
+
+        def notify_error(error):
+            if pn.state.notifications is not None:
+                pn.state.notifications.error(f"Power spectrum failed: {error}")
+
+        runner = LatestRequestRunner(
+            busy_indicator=busy_indicator,
+            on_error=notify_error,
+            name="powerspectrum",
+        )
+
+        @timed("powerspectrum.generate_powerspectrum")
+        def generate_powerspectrum(event=None):
+            selected_event_list_id = event_list_dropdown.value
+            dt = dt_input.value
+            segment_size = segment_size_input.value
+            norm = norm_selector.value
+            rebin_factor = rebin_input.value
+
+            def compute(cancel_event):
+                if selected_event_list_id is None:
+                    return None
+                event_list = loaded_event_data.get_by_id(
+                    selected_event_list_id
+                ).event_list
+                result = compute_averaged_power(
+                    event_list, dt, segment_size, cancel_event
+                )
+                check_cancelled(cancel_event)
+
+                power, power_err = normalize_averaged_power(result, norm)
+                freq, power, power_err = log_rebin(
+                    result["freq"], power, power_err, rebin_factor
+                )
+                positive = power > 0
+                plot = hv.Curve(
+                    (freq[positive], power[positive]),
+                    "Frequency (Hz)",
+                    f"Power ({norm})",
+                ).opts(logx=True, logy=True, width=700, height=400, tools=["hover"])
+                summary = (
+                    f"**Segments averaged:** {result['n_segments']} &nbsp; "
+                    f"**Bins per segment:** {result['n_bin']} &nbsp; "
+                    f"**Frequencies:** {len(freq)}"
+                )
+                return plot, summary
+
+            def apply(result):
+                if result is not None:
+                    pds_output_hv.object, summary_output.object = result
+
+            runner.submit(compute, apply)
+
+        generate_button = pn.widgets.Button(
+            name="Generate Power Spectrum", button_type="primary"
+        )
+        generate_button.on_click(generate_powerspectrum)
+
+        tab1_content = pn.Column(
+            event_list_dropdown,
+            pn.Row(dt_input, segment_size_input),
+            pn.Row(norm_selector, rebin_input),
+            pn.Row(generate_button, busy_indicator),
+            summary_output,
+            pds_output_hv,
+        )
+
+    tabs = pn.Tabs(
+        ("Power Spectrum", tab1_content), dynamic=True, sizing_mode="stretch_width"
+    )
+
+    return tabs
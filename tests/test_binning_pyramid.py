@@ -0,0 +1,63 @@
+import os
+import warnings
+import numpy as np
+import pytest
+from stingray.events import EventList
+from utils.binningPyramid import BinningPyramid, BinningPyramidStore
+from utils.lightCurveCache import LightCurveCache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "demo", "data")
+EVENT_FILES = (
+    "monol_testA.evt",
+    "monol_testA_calib_unsrt.evt",
+    "xte_test.evt.gz",
+    "xte_gx_test.evt.gz",
+)
+DT_VALUES = (0.1, 0.2, 0.3, 1.0, 1.6, 7.3, 10.0, 50.0, 100.0)
+
+
+@pytest.fixture(scope="module", params=EVENT_FILES)
+def event_list(request):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return EventList.read(os.path.join(DATA_DIR, request.param), "ogip")
+
+
+def to_lc(event_list, dt):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return event_list.to_lc(dt)
+
+
+@pytest.mark.parametrize("dt", DT_VALUES)
+def test_cache_matches_to_lc(event_list, dt):
+    cache = LightCurveCache(pyramids=BinningPyramidStore())
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        lc = cache.get(event_list, dt)
+    expected = to_lc(event_list, dt)
+    assert lc.dt == expected.dt
+    np.testing.assert_allclose(lc.time, expected.time)
+    np.testing.assert_array_equal(lc.counts, expected.counts)
+
+
+def test_pyramid_only_serves_whole_multiples(event_list):
+    pyramid = BinningPyramid(event_list)
+    assert pyramid.lightcurve(event_list, pyramid.base_dt * 1.5) is None
+    lc = pyramid.lightcurve(event_list, pyramid.base_dt * 6)
+    np.testing.assert_array_equal(lc.counts, to_lc(event_list, pyramid.base_dt * 6).counts)
+
+
+def test_store_is_byte_bounded():
+    rng = np.random.default_rng(0)
+    lists = [
+        EventList(time=np.sort(rng.uniform(0, 1000, 1000)), gti=np.array([[0, 1000.0]]))
+        for _ in range(3)
+    ]
+    one = BinningPyramid(lists[0]).nbytes
+    store = BinningPyramidStore(max_bytes=2 * one)
+    for event_list in lists:
+        store.get(event_list)
+    assert store.nbytes <= 2 * one
+    store.clear()
+    assert store.nbytes == 0
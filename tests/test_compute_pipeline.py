@@ -0,0 +1,38 @@
+import asyncio
+import threading
+from utils.computePipeline import LatestRequestRunner, check_cancelled
+
+
+def run_requests(cancel_last=False):
+    # A request that blocks until it is cancelled, then either a newer request
+    # or a plain cancel
+    events = []
+    runner = LatestRequestRunner(debounce=0, on_cancel=lambda: events.append("cancelled"))
+    started = threading.Event()
+
+    def slow(cancel_event):
+        started.set()
+        cancel_event.wait(5)
+        check_cancelled(cancel_event)
+        return "slow"
+
+    async def main():
+        first = runner.submit(slow, events.append)
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        if cancel_last:
+            runner.cancel()
+            await asyncio.gather(first, return_exceptions=True)
+            return
+        second = runner.submit(lambda cancel_event: "fast", events.append)
+        await asyncio.gather(first, second, return_exceptions=True)
+
+    asyncio.run(main())
+    return events
+
+
+def test_superseded_request_is_not_reported_as_cancelled():
+    assert run_requests() == ["fast"]
+
+
+def test_cancelling_the_newest_request_calls_on_cancel():
+    assert run_requests(cancel_last=True) == ["cancelled"]
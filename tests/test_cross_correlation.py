@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from utils.crossCorrelation import CrossCorrelationEngine
+
+DT = 0.5
+LAG = 3.0
+
+
+def lagged_pair(n_bin=400, lag_bins=int(LAG / DT), seed=0):
+    # Poisson counts of a random signal, and the same signal lag_bins later
+    rng = np.random.default_rng(seed)
+    signal = np.convolve(rng.uniform(0, 20, n_bin + lag_bins), np.ones(3), "same")
+    first = rng.poisson(signal[lag_bins:])
+    second = rng.poisson(signal[:-lag_bins])
+    return np.vstack([first, second]).astype(np.float64)
+
+
+def reference_ccf(counts, max_k):
+    # np.correlate over the full overlap, normalized like the engine
+    first, second = counts - counts.mean(axis=1, keepdims=True)
+    full = np.correlate(second, first, mode="full")
+    full /= np.sqrt((first**2).sum() * (second**2).sum())
+    middle = len(first) - 1
+    return full[middle - max_k : middle + max_k + 1]
+
+
+def reference_rebin(ccf, factor, max_k):
+    # Weighted mean of the lags around every multiple of factor
+    half = factor // 2
+    weights = np.ones(2 * half + 1)
+    if factor % 2 == 0:
+        weights[[0, -1]] = 0.5
+    lags, values = [], []
+    for k in range(-(max_k // factor) * factor, max_k + 1, factor):
+        window = np.arange(k - half, k + half + 1)
+        inside = np.abs(window) <= max_k
+        values.append(
+            np.sum(weights[inside] * ccf[window[inside] + max_k]) / weights[inside].sum()
+        )
+        lags.append(k * DT)
+    return np.array(lags), np.array(values)
+
+
+@pytest.mark.parametrize("max_lag", (None, 20.0))
+def test_ccf_matches_np_correlate(max_lag):
+    counts = lagged_pair()
+    engine = CrossCorrelationEngine(["a", "b"], counts, DT)
+    lags, ccfs = engine.correlate(max_lag=max_lag)
+    max_k = (len(lags) - 1) // 2
+    np.testing.assert_allclose(lags, np.arange(-max_k, max_k + 1) * DT)
+    np.testing.assert_allclose(ccfs[0], reference_ccf(counts, max_k), atol=1e-12)
+    assert lags[np.argmax(ccfs[0])] == LAG
+
+
+@pytest.mark.parametrize("lag_resolution", (1.0, 1.5, 3.0))
+def test_rebinned_ccf_is_centred_on_its_lags(lag_resolution):
+    counts = lagged_pair()
+    engine = CrossCorrelationEngine(["a", "b"], counts, DT)
+    lags, ccfs = engine.correlate(max_lag=20.0, lag_resolution=lag_resolution)
+    factor = int(round(lag_resolution / DT))
+    max_k = int(20.0 / DT)
+
+    expected_lags, expected = reference_rebin(reference_ccf(counts, max_k), factor, max_k)
+    np.testing.assert_allclose(lags, expected_lags)
+    np.testing.assert_allclose(ccfs[0], expected, atol=1e-12)
+    # A grid symmetric about zero, with the peak still on the true lag
+    np.testing.assert_allclose(lags, -lags[::-1])
+    assert 0.0 in lags
+    assert lags[np.argmax(ccfs[0])] == LAG
@@ -0,0 +1,49 @@
+import warnings
+import numpy as np
+import pytest
+from stingray import DynamicalPowerspectrum
+from stingray.events import EventList
+from utils.dynamicalPowerSpectrum import dynamical_power_spectrum
+
+DT = 0.125
+SEGMENT_SIZE = 16.0
+GTI = np.array([[0.0, 100.0], [130.0, 260.0]])
+
+
+@pytest.fixture(scope="module")
+def event_list():
+    # A rate that changes between the GTIs, so that segments differ
+    rng = np.random.default_rng(0)
+    times = np.sort(
+        np.concatenate([rng.uniform(0, 100, 5000), rng.uniform(130, 260, 9000)])
+    )
+    return EventList(times, gti=GTI)
+
+
+def reference(event_list, norm):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return DynamicalPowerspectrum(event_list.to_lc(DT), SEGMENT_SIZE, norm=norm)
+
+
+@pytest.mark.parametrize("norm", ("leahy", "frac", "abs", "none"))
+def test_matches_stingray(event_list, norm):
+    expected = reference(event_list, norm)
+    result = dynamical_power_spectrum(event_list.time, GTI, SEGMENT_SIZE, DT, norm=norm)
+    np.testing.assert_allclose(result["time"], expected.time)
+    np.testing.assert_allclose(result["freq"], expected.freq)
+    np.testing.assert_allclose(result["power"], expected.dyn_ps.T, rtol=1e-10)
+
+
+def test_averaged_down_to_the_shape_bounds(event_list):
+    expected = reference(event_list, "leahy").dyn_ps.T
+    result = dynamical_power_spectrum(
+        event_list.time, GTI, SEGMENT_SIZE, DT, max_freq_bins=10, max_time_bins=5
+    )
+    # 14 segments in rows of 3, and 63 frequencies in columns of 7
+    assert result["power"].shape == (5, 9)
+    assert result["segments_per_row"] == 3
+    assert result["freqs_per_column"] == 7
+    columns = expected.reshape(14, 9, 7).mean(axis=2)
+    rows = [columns[i : i + 3].mean(axis=0) for i in range(0, 14, 3)]
+    np.testing.assert_allclose(result["power"], rows, rtol=1e-10)
@@ -0,0 +1,54 @@
+import os
+import warnings
+import numpy as np
+import pytest
+from stingray.events import EventList
+from utils.energyBands import (
+    EnergyIndex,
+    band_lightcurves,
+    multiband_counts,
+    time_grid,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "demo", "data")
+BANDS = np.array([[3.0, 5.0], [0.5, 3.0], [5.0, 12.0]])
+DT_VALUES = (0.1, 1.0, 7.3)
+
+
+@pytest.fixture(scope="module")
+def event_list():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return EventList.read(os.path.join(DATA_DIR, "monol_testA_calib.evt"), "ogip")
+
+
+def band_events(event_list, band):
+    # The events of one band as their own list, over the same GTIs
+    inside = (event_list.energy >= band[0]) & (event_list.energy < band[1])
+    return EventList(
+        event_list.time[inside], gti=event_list.gti, dt=event_list.dt, mjdref=event_list.mjdref
+    )
+
+
+@pytest.mark.parametrize("dt", DT_VALUES)
+def test_band_lightcurves_match_to_lc(event_list, dt):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        lcs = band_lightcurves(event_list, BANDS, dt, EnergyIndex(event_list.energy))
+        for band, lc in zip(BANDS, lcs):
+            expected = band_events(event_list, band).to_lc(dt)
+            assert lc.dt == expected.dt
+            np.testing.assert_allclose(lc.time, expected.time)
+            np.testing.assert_array_equal(lc.counts, expected.counts)
+
+
+def test_chunked_pass_matches_one_pass(event_list):
+    labels = EnergyIndex(event_list.energy).band_labels(BANDS)
+    tstart, n_bins = time_grid(event_list, 1.0)
+    args = (event_list.time, labels, len(BANDS), 1.0, tstart, n_bins)
+    counts = multiband_counts(*args)
+    np.testing.assert_array_equal(multiband_counts(*args, chunk_events=97), counts)
+    # Events outside every band, or after the last bin, are left out
+    in_grid = event_list.time < tstart + n_bins * 1.0
+    assert counts.sum() == np.count_nonzero((labels >= 0) & in_grid)
+    assert np.any(labels < 0)
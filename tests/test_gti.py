@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from stingray.events import EventList
+from stingray.gti import create_gti_mask
+from functionality.LightCurve.GTI import event_list_span
+from utils.bulkEventInput import parse_gti
+from utils.gtiEngine import (
+    gti_from_threshold,
+    gti_mask,
+    intersect_gti,
+    normalize_gti,
+)
+
+
+def random_gti(rng, n_gti=50, tstop=1000.0):
+    edges = np.sort(rng.uniform(0, tstop, 2 * n_gti))
+    return edges.reshape(-1, 2)
+
+
+@pytest.mark.parametrize("assume_sorted", (True, False, None))
+def test_mask_matches_create_gti_mask(assume_sorted):
+    rng = np.random.default_rng(0)
+    gti = random_gti(rng)
+    times = np.sort(rng.uniform(-10, 1010, 20_000))
+    expected = create_gti_mask(times, gti, dt=0)
+    if assume_sorted is False:
+        order = rng.permutation(len(times))
+        times, expected = times[order], expected[order]
+    np.testing.assert_array_equal(gti_mask(times, gti, assume_sorted), expected)
+
+
+def test_parse_and_normalize():
+    gti = normalize_gti(parse_gti("5 10; 0 4\n3,4.5\t12 12"))
+    np.testing.assert_array_equal(gti, [[0, 4.5], [5, 10]])
+    with pytest.raises(ValueError, match="start and a stop"):
+        parse_gti("0 4 5")
+
+
+def test_intersect():
+    gti_a = np.array([[0.0, 4.0], [5.0, 10.0]])
+    gti_b = np.array([[2.0, 6.0], [10.0, 12.0]])
+    np.testing.assert_array_equal(intersect_gti(gti_a, gti_b), [[2, 4], [5, 6]])
+    assert intersect_gti(gti_a, np.empty((0, 2))).shape == (0, 2)
+
+
+def test_threshold_on_known_counts():
+    counts = np.array([5, 5, 0, 5, 0, 0, 0, 5, 5, 5, 9])
+    gti = gti_from_threshold(counts, 0.5, 100.0, min_rate=5, max_rate=12)
+    np.testing.assert_allclose(gti, [[100, 101], [101.5, 102], [103.5, 105]])
+    # The one-bin gap is bridged, then the shorter last interval dropped
+    gti = gti_from_threshold(
+        counts, 0.5, 100.0, min_rate=5, max_rate=12, min_gap=1.0, min_length=1.6
+    )
+    np.testing.assert_allclose(gti, [[100, 102]])
+
+
+def test_span_of_an_unsorted_list_without_gti():
+    # As read from a file whose events are not in time order
+    event_list = EventList(np.arange(4.0))
+    event_list.time = np.array([3.0, 1.0, 7.0, 2.0])
+    event_list.gti = None
+    np.testing.assert_array_equal(event_list_span(event_list), [[1.0, 7.0]])
+    # Stingray's default GTI for such a list runs backwards
+    event_list.gti = np.array([[3.0, 2.0]])
+    np.testing.assert_array_equal(event_list_span(event_list), [[1.0, 7.0]])
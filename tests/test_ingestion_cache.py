@@ -0,0 +1,88 @@
+import os
+import time
+import warnings
+import numpy as np
+import pytest
+from stingray.events import EventList
+from utils.ingestionCache import (
+    cache_key,
+    load_event_list,
+    prune_cache,
+    read_event_list_cached,
+    store_event_list,
+    _entries,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "demo", "data")
+EVENT_FILES = ("monol_testA.evt", "monol_testA_calib.evt", "xte_test.evt.gz")
+
+
+def read(path):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return EventList.read(path, "ogip")
+
+
+@pytest.mark.parametrize("file_name", EVENT_FILES)
+def test_cached_event_list_matches_read(tmp_path, file_name):
+    path = os.path.join(DATA_DIR, file_name)
+    expected = read(path)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        first = read_event_list_cached(str(tmp_path), path, "ogip")
+        cached = read_event_list_cached(str(tmp_path), path, "ogip")
+
+    # The second load is a hit, memory-mapped from the cache
+    assert isinstance(cached.time, np.memmap)
+    assert not isinstance(first.time, np.memmap)
+    for name in [expected.main_array_attr, "gti"] + expected.array_attrs():
+        np.testing.assert_array_equal(getattr(cached, name), getattr(expected, name))
+    assert cached.mjdref == expected.mjdref
+    assert cached.dt == expected.dt
+
+
+def test_key_depends_on_content_and_format(tmp_path):
+    path = os.path.join(DATA_DIR, "monol_testA.evt")
+    copy = tmp_path / "copy.evt"
+    copy.write_bytes(open(path, "rb").read())
+    assert cache_key(path, "ogip") == cache_key(str(copy), "ogip")
+    assert cache_key(path, "ogip") != cache_key(path, "fits")
+
+
+def test_cached_arrays_are_copy_on_write(tmp_path):
+    event_list = EventList(np.arange(10.0), gti=[[0, 10]])
+    store_event_list(str(tmp_path), "ab" * 32, event_list)
+    loaded = load_event_list(str(tmp_path), "ab" * 32)
+    loaded.time[0] = -1
+    reloaded = load_event_list(str(tmp_path), "ab" * 32)
+    np.testing.assert_array_equal(reloaded.time, np.arange(10.0))
+
+
+def test_prune_removes_least_recently_used_entries(tmp_path):
+    cache_dir = str(tmp_path)
+    keys = [f"{i:02d}" * 32 for i in range(4)]
+    for i, key in enumerate(keys):
+        event_list = EventList(np.arange(10_000.0) + i, gti=[[0, 1e4]])
+        store_event_list(cache_dir, key, event_list)
+        # Distinct last-use times, oldest first
+        os.utime(os.path.join(cache_dir, key[:2], key, "meta.pkl"), (i, i))
+    entry_size = max(size for _, size, _ in _entries(cache_dir))
+
+    # Using the oldest entry makes it the most recent
+    time.sleep(0.01)
+    assert load_event_list(cache_dir, keys[0]) is not None
+
+    removed = prune_cache(cache_dir, 2 * entry_size)
+    assert removed == 2
+    assert load_event_list(cache_dir, keys[1]) is None
+    assert load_event_list(cache_dir, keys[2]) is None
+    assert load_event_list(cache_dir, keys[0]) is not None
+    assert load_event_list(cache_dir, keys[3]) is not None
+
+
+def test_prune_keeps_the_entry_just_stored(tmp_path):
+    cache_dir = str(tmp_path)
+    key = "cd" * 32
+    store_event_list(cache_dir, key, EventList(np.arange(10_000.0), gti=[[0, 1e4]]))
+    assert prune_cache(cache_dir, 0, keep=key) == 0
+    assert load_event_list(cache_dir, key) is not None
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import numpy as np
+from stingray.events import EventList
+from utils.eventListRegistry import EventListRegistry
+from utils.memoryBudget import MemoryBudget
+
+
+def spill_files(directory):
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+    )
+
+
+def spilled_registry(budget, name):
+    registry = EventListRegistry(memory_budget=budget)
+    registry.add(name, EventList(np.sort(np.random.uniform(0, 100, 10_000)), gti=[[0, 100]]))
+    budget.enforce()
+    assert budget.spills == 1
+    return registry
+
+
+def test_budgets_sharing_a_spill_dir_keep_each_others_files(tmp_path):
+    first = MemoryBudget(0, str(tmp_path))
+    first_registry = spilled_registry(first, "first")
+    first_files = spill_files(first.spill_dir)
+    assert first_files
+
+    second = MemoryBudget(0, str(tmp_path))
+    second_registry = spilled_registry(second, "second")
+    assert second.spill_dir != first.spill_dir
+    assert spill_files(first.spill_dir) == first_files
+    assert spill_files(second.spill_dir)
+    # The first list is still readable from its memory-mapped files
+    assert len(first_registry.get("first").event_list.time) == 10_000
+    assert len(second_registry.get("second").event_list.time) == 10_000
+
+
+def test_spills_of_exited_processes_are_removed(tmp_path):
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    stale = tmp_path / f"pid-{process.pid}-deadbeef"
+    stale.mkdir()
+    (stale / "times.npy").write_bytes(b"")
+    unknown = tmp_path / "leftover"
+    unknown.mkdir()
+
+    budget = MemoryBudget(0, str(tmp_path))
+    spilled_registry(budget, "list")
+    assert not stale.exists()
+    assert not unknown.exists()
+    assert os.path.isdir(budget.spill_dir)
+
+
+def test_recent_spills_only_name_the_lists_of_the_session(tmp_path):
+    budget = MemoryBudget(0, str(tmp_path))
+    mine = spilled_registry(budget, "mine")
+    theirs = EventListRegistry(memory_budget=budget)
+    times = np.sort(np.random.uniform(0, 100, 10_000))
+    theirs.add("theirs", EventList(times, gti=[[0, 100]]))
+    budget.enforce()
+    assert budget.spills == 2
+
+    stats = budget.stats(registry=mine)
+    assert [name for _, name, _ in stats["recent"]] == ["mine"]
+    assert stats["spills"] == 2
+    assert budget.stats()["recent"] == []
@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+from stingray.events import EventList
+from functionality.QuickLook.PowerSpectrum import compute_averaged_power
+from utils.powerSpectrum import normalize_averaged_power
+
+
+@pytest.mark.parametrize("dt", [0.125, 0.25, 0.3])
+def test_leahy_white_noise_level_at_dt_off_the_pyramid_grid(dt):
+    # Poisson events have a flat Leahy power of 2, whatever the bin size
+    rng = np.random.default_rng(42)
+    times = np.sort(rng.uniform(0, 2000, 400_000))
+    event_list = EventList(time=times, gti=np.array([[0, 2000.0]]))
+
+    result = compute_averaged_power(event_list, dt, 16.0)
+    power, _ = normalize_averaged_power(result, "leahy")
+    assert np.mean(power) == pytest.approx(2.0, abs=0.03)
@@ -0,0 +1,81 @@
+import os
+import warnings
+import numpy as np
+import pytest
+from astropy.io import fits
+from stingray.events import EventList
+from utils.streamingReader import stream_binned_products, DEFAULT_ENERGY_BINS
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "demo", "data")
+# Each file with the file whose to_lc is the reference: stingray does not sort
+# the unsorted copy on reading, and takes its first and last events as the GTI
+EVENT_FILES = (
+    ("monol_testA.evt", "monol_testA.evt"),
+    ("monol_testA_calib.evt", "monol_testA_calib.evt"),
+    ("monol_testA_calib_unsrt.evt", "monol_testA_calib.evt"),
+    ("xte_test.evt.gz", "xte_test.evt.gz"),
+    ("xte_gx_test.evt.gz", "xte_gx_test.evt.gz"),
+)
+DT_VALUES = (0.1, 1.0, 7.3, 100.0)
+
+
+@pytest.fixture(scope="module", params=EVENT_FILES, ids=lambda files: files[0])
+def event_file(request):
+    file_name, reference_name = request.param
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        reference = EventList.read(os.path.join(DATA_DIR, reference_name), "ogip")
+    return os.path.join(DATA_DIR, file_name), reference
+
+
+@pytest.mark.parametrize("dt", DT_VALUES)
+def test_streamed_lightcurve_matches_to_lc(event_file, dt):
+    path, event_list = event_file
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = event_list.to_lc(dt)
+        # Small chunks, so that events of one bin span several chunks
+        products = stream_binned_products(path, dt, chunk_rows=97)
+    lc = products["lightcurve"]
+    assert lc.dt == expected.dt
+    np.testing.assert_allclose(lc.time, expected.time)
+    np.testing.assert_array_equal(lc.counts, expected.counts)
+    np.testing.assert_allclose(products["gti"], event_list.gti, rtol=0, atol=1e-6)
+
+
+def write_energy_file(path, energy_limits=None):
+    rng = np.random.default_rng(0)
+    time = np.sort(rng.uniform(0, 100, 1000))
+    energy = rng.uniform(0.5, 10, 1000).astype(np.float32)
+    hdu = fits.BinTableHDU.from_columns(
+        [
+            fits.Column(name="TIME", format="D", array=time),
+            fits.Column(name="ENERGY", format="E", array=energy),
+        ],
+        name="EVENTS",
+    )
+    if energy_limits is not None:
+        hdu.header["TLMIN2"], hdu.header["TLMAX2"] = energy_limits
+    fits.HDUList([fits.PrimaryHDU(), hdu]).writeto(path)
+    return energy
+
+
+def test_float_energy_without_edges_skips_the_histogram(tmp_path):
+    path = str(tmp_path / "energy.evt")
+    write_energy_file(path)
+    with pytest.warns(UserWarning, match="energy histogram is skipped"):
+        products = stream_binned_products(path, 1.0)
+    assert products["energy_column"] is None
+    assert products["energy_counts"] is None
+    assert products["n_events"] == 1000
+
+
+def test_float_energy_uses_the_declared_range(tmp_path):
+    path = str(tmp_path / "energy.evt")
+    energy = write_energy_file(path, energy_limits=(0.0, 12.0))
+    products = stream_binned_products(path, 1.0, chunk_rows=100)
+    expected_edges = np.linspace(0.0, 12.0, DEFAULT_ENERGY_BINS + 1)
+    np.testing.assert_allclose(products["energy_edges"], expected_edges)
+    np.testing.assert_array_equal(
+        products["energy_counts"], np.histogram(energy, bins=expected_edges)[0]
+    )
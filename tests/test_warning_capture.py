@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import warnings
+from utils.warningCapture import capture_warnings
+
+REPO_ROOT = os.path.dirname(os.path.dirname(__file__))
+
+
+def warn_twice():
+    for _ in range(2):
+        warnings.warn("repeated", UserWarning)
+
+
+def test_capture_counts_repeats_and_restores_warnings_state():
+    filters = list(warnings.filters)
+    showwarning = warnings.showwarning
+    with capture_warnings() as log:
+        warn_twice()
+        warn_twice()
+    assert [entry[-1] for entry in log.entries()] == [4]
+    assert warnings.filters == filters
+    assert warnings.showwarning is showwarning
+
+
+def test_nested_captures_share_the_outer_log():
+    with capture_warnings() as outer:
+        with capture_warnings() as inner:
+            warn_twice()
+        assert inner is outer
+    assert len(outer) == 1
+
+
+def run_python(code, *options):
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_leaves_warnings_alone():
+    result = run_python(
+        "import warnings\n"
+        "filters, show = list(warnings.filters), warnings.showwarning\n"
+        "import utils.warningCapture\n"
+        "assert warnings.filters == filters and warnings.showwarning is show\n"
+    )
+    assert result.stderr == ""
+
+
+def test_command_line_filters_are_respected():
+    code = (
+        "import warnings\n"
+        "from utils.warningCapture import capture_warnings\n"
+        "with capture_warnings() as log:\n"
+        "    warnings.warn('inside')\n"
+        "warnings.warn('outside')\n"
+        "print(len(log))\n"
+    )
+    assert run_python(code).stdout.strip() == "1"
+    ignored = run_python(code, "-W", "ignore")
+    assert ignored.stdout.strip() == "0"
+    assert ignored.stderr == ""
@@ -0,0 +1,92 @@
+import os
+import panel as pn
+import pandas as pd
+import holoviews as hv
+from .metrics import metrics
+from .metricsEndpoint import METRICS_PATH
+
+hv.extension("bokeh")
+
+SUMMARY_COLUMNS = {
+    "name": "Name",
+    "kind": "Kind",
+    "calls": "Calls",
+    "errors": "Errors",
+    "mean_ms": "Mean (ms)",
+    "p50_ms": "p50 (ms)",
+    "p95_ms": "p95 (ms)",
+    "p99_ms": "p99 (ms)",
+    "max_ms": "Max (ms)",
+}
+# The metrics are shared by every session and scraped as monotonic counters,
+# so only the server operator may allow resetting them from the browser
+RESET_ENV_VAR = "STINGRAY_EXPLORER_ALLOW_METRICS_RESET"
+
+
+def reset_allowed():
+    return os.environ.get(RESET_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+def create_admin_panel():
+    summary_table = pn.widgets.Tabulator(
+        pd.DataFrame(columns=list(SUMMARY_COLUMNS.values())),
+        disabled=True,
+        show_index=False,
+        selectable=1,
+        pagination="local",
+        page_size=25,
+        width=900,
+    )
+    histogram_output = pn.pane.HoloViews(width=700, height=300)
+    refresh_button = pn.widgets.Button(name="Refresh", button_type="primary")
+    reset_button = pn.widgets.Button(
+        name="Reset Metrics", button_type="danger", visible=reset_allowed()
+    )
+    rows = []
+
+    def show_histogram(row):
+        counts = metrics.histogram_counts(row["name"], row["kind"])
+        histogram_output.object = hv.Bars(
+            counts, kdims="Latency bucket (s, upper bound)", vdims="Calls"
+        ).opts(title=f"{row['name']} ({row['kind']})", width=700, height=300)
+
+    def refresh(event=None):
+        rows[:] = metrics.summary_rows()
+        summary = pd.DataFrame(rows, columns=list(SUMMARY_COLUMNS))
+        summary_table.value = summary.rename(columns=SUMMARY_COLUMNS).round(2)
+        if rows:
+            show_histogram(rows[(summary_table.selection or [0])[0]])
+        else:
+            histogram_output.object = None
+
+    def on_selection(event):
+        if event.new and event.new[0] < len(rows):
+            show_histogram(rows[event.new[0]])
+
+    def reset(event):
+        if not reset_allowed():
+            return
+        metrics.clear()
+        summary_table.selection = []
+        refresh()
+
+    refresh_button.on_click(refresh)
+    reset_button.on_click(reset)
+    summary_table.param.watch(on_selection, "selection")
+    refresh()
+
+    return pn.Column(
+        pn.pane.Markdown("# Latency"),
+        pn.pane.Markdown(
+            "Latency of every compute stage and callback dispatch since the "
+            "server started, across all sessions. Dispatch is the time a UI "
+            "callback holds the event loop before its work runs as the "
+            "`.compute` and `.apply` stages. Select a row to see its histogram. "
+            f"The same data is served as plain text at `/{METRICS_PATH}` when the "
+            "server runs with `--plugins utils.metricsEndpoint`. Resetting "
+            f"requires the server to run with `{RESET_ENV_VAR}=1`."
+        ),
+        pn.Row(refresh_button, reset_button),
+        summary_table,
+        histogram_output,
+    )
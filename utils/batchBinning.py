@@ -0,0 +1,79 @@
+import mmap
+import numpy as np
+from .gtiEngine import normalize_gti, gti_mask
+
+# Events binned per chunk, bounding the temporary arrays of a worker
+CHUNK_EVENTS = 4_000_000
+# Cap on the bins of a shared grid; wider grids need a larger dt
+MAX_GRID_BINS = 2**24
+ALIGNMENTS = ("Absolute time", "Time since start")
+
+
+def times_source(times):
+    # What a worker process needs to get the event times: the location of the
+    # file for arrays memory-mapped from the ingestion cache or spill
+    # directory, which is then reopened instead of pickling the data
+    root = times
+    while isinstance(root, np.ndarray) and not isinstance(root.base, mmap.mmap):
+        root = root.base
+    if isinstance(root, np.memmap) and times.flags.c_contiguous and root.filename:
+        offset = root.offset + (times.ctypes.data - root.ctypes.data)
+        return ("mmap", root.filename, offset, times.dtype.str, times.shape)
+    return ("array", np.asarray(times))
+
+
+def open_times(source):
+    if source[0] == "mmap":
+        _, filename, offset, dtype, shape = source
+        return np.memmap(filename, dtype=dtype, mode="r", offset=offset, shape=shape)
+    return source[1]
+
+
+def event_list_span(event_list, metadata=None):
+    gti = event_list.gti
+    if gti is not None and len(gti):
+        return float(np.min(gti)), float(np.max(gti))
+    if metadata is not None and metadata.get("tmin") is not None:
+        return metadata["tmin"], metadata["tmax"]
+    return float(np.min(event_list.time)), float(np.max(event_list.time))
+
+
+def shared_grid(spans, dt, alignment="Absolute time"):
+    """Start of the grid of each list and the common number of bins.
+
+    With absolute alignment every list is binned on one grid covering all of
+    them; otherwise each grid starts at its own list's start, so observations
+    taken at different epochs are compared in time since start.
+    """
+    starts = np.array([span[0] for span in spans], dtype=np.float64)
+    stops = np.array([span[1] for span in spans], dtype=np.float64)
+    if alignment == "Absolute time":
+        grid_starts = np.full(len(spans), starts.min())
+        length = stops.max() - starts.min()
+    else:
+        grid_starts = starts
+        length = np.max(stops - starts)
+    n_bins = max(int(np.ceil(length / dt)), 1)
+    if n_bins > MAX_GRID_BINS:
+        raise ValueError(
+            f"The shared grid would have {n_bins} bins; use a dt of at least "
+            f"{length / MAX_GRID_BINS:.3g} s."
+        )
+    return grid_starts, n_bins
+
+
+def bin_on_grid(source, gti, grid_start, dt, n_bins, chunk_events=CHUNK_EVENTS):
+    # Counts of one event list on a grid of n_bins bins from grid_start; bins
+    # whose centre is outside the GTIs are NaN. Runs in a worker process.
+    times = open_times(source)
+    counts = np.zeros(n_bins, dtype=np.int64)
+    for start in range(0, len(times), chunk_events):
+        bin_index = np.floor((times[start : start + chunk_events] - grid_start) / dt)
+        bin_index = bin_index[(bin_index >= 0) & (bin_index < n_bins)].astype(np.int64)
+        counts += np.bincount(bin_index, minlength=n_bins)
+
+    counts = counts.astype(np.float64)
+    if gti is not None and len(gti):
+        centres = grid_start + (np.arange(n_bins) + 0.5) * dt
+        counts[~gti_mask(centres, normalize_gti(gti), assume_sorted=True)] = np.nan
+    return counts
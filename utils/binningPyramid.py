@@ -0,0 +1,186 @@
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+from stingray import Lightcurve
+
+# Finest bin size kept by default, matching the QuickLook dt slider step
+DEFAULT_BASE_DT = 0.1
+# Cap on the number of finest-level bins; coarser base bins are used beyond it
+DEFAULT_MAX_BASE_BINS = 2**22
+# Default upper bound on the memory held by all pyramids of a store
+DEFAULT_MAX_BYTES = 256 * 1024**2
+
+
+def lightcurve_bins(tstart, tstop, dt):
+    # Number of bins exactly as chosen by Lightcurve.make_lightcurve, including
+    # its round-up of a last bin that is at least 99% full
+    tseg = tstop - tstart
+    n_bins = int(tseg / dt)
+    if tseg / dt - n_bins >= 0.99:
+        n_bins += 1
+    return n_bins
+
+
+def lightcurve_grid(event_list, dt):
+    # (tstart, number of bins) of the light curve of event_list.to_lc(dt)
+    gti = event_list.gti
+    time = event_list.time
+    if gti is not None and len(gti):
+        tstart, tstop = float(np.min(gti)), float(np.max(gti))
+    else:
+        tstart, tstop = float(np.min(time)), float(np.max(time))
+    return tstart, lightcurve_bins(tstart, tstop, dt)
+
+
+class BinningPyramid:
+    """Counts of one event list binned once at a fine dt, plus power-of-two
+    coarser levels.
+
+    Light curves at any dt that is a whole multiple of the base dt are then
+    obtained by summing bins of the closest level, in O(N_bins) rather than
+    O(N_events). The base grid starts where Lightcurve.make_lightcurve starts
+    and covers every later event, so the sums equal the counts of to_lc.
+    """
+
+    def __init__(
+        self, event_list, base_dt=DEFAULT_BASE_DT, max_base_bins=DEFAULT_MAX_BASE_BINS
+    ):
+        # The same dt that to_lc would use for this event list
+        base_dt = event_list.suggest_compatible_dt(base_dt, warn=False)
+        tstart, _ = lightcurve_grid(event_list, base_dt)
+        time = event_list.time
+        span = max(float(np.max(time)) - tstart, 0.0)
+
+        # Coarsen the base level until it fits the bin budget
+        while span / base_dt > max_base_bins:
+            base_dt *= 2
+
+        self.base_dt = base_dt
+        self.tstart = tstart
+        self.gti = event_list.gti
+        self.mjdref = event_list.mjdref
+
+        n_base = int(span // base_dt) + 1
+        bin_index = (time - tstart) // base_dt
+        inside = (bin_index >= 0) & (bin_index < n_base)
+        base = np.bincount(bin_index[inside].astype(np.int64), minlength=n_base)
+
+        # Odd-length levels are padded with an empty bin, so that every level
+        # still holds every event
+        self.levels = [base]
+        while len(self.levels[-1]) >= 2:
+            previous = self.levels[-1]
+            if len(previous) % 2:
+                previous = np.append(previous, 0)
+            self.levels.append(previous.reshape(-1, 2).sum(axis=1))
+
+    @property
+    def nbytes(self):
+        return sum(level.nbytes for level in self.levels)
+
+    def multiple(self, dt):
+        # Number of base bins per bin of dt, or None unless dt is a whole multiple
+        ratio = dt / self.base_dt
+        rounded = int(round(ratio))
+        if rounded >= 1 and abs(ratio - rounded) <= 1e-9 * ratio:
+            return rounded
+        return None
+
+    def counts(self, dt, n_bins):
+        # Counts of the first n_bins bins of dt, or None when dt is not a whole
+        # multiple of the base dt: fractions of base bins cannot be split exactly
+        rounded = self.multiple(dt)
+        if rounded is None:
+            return None
+        # Largest power of two dividing the ratio picks the coarsest usable level
+        k = min((rounded & -rounded).bit_length() - 1, len(self.levels) - 1)
+        level = self.levels[k]
+        factor = rounded >> k
+        needed = n_bins * factor
+        if len(level) < needed:
+            # No event lies beyond the last bin of the base level
+            level = np.concatenate([level, np.zeros(needed - len(level), level.dtype)])
+        return level[:needed].reshape(n_bins, factor).sum(axis=1)
+
+    def lightcurve(self, event_list, dt):
+        tstart, n_bins = lightcurve_grid(event_list, dt)
+        counts = self.counts(dt, n_bins)
+        if counts is None:
+            return None
+        time = tstart + np.arange(0.5, 0.5 + n_bins) * dt
+        return Lightcurve(
+            time,
+            counts,
+            dt=dt,
+            gti=self.gti,
+            mjdref=self.mjdref,
+            skip_checks=True,
+            err_dist="poisson",
+        )
+
+
+class BinningPyramidStore:
+    """Byte-bounded LRU store of one pyramid per event list.
+
+    Pyramids are built on first use and dropped when their event list is
+    garbage collected, when the store exceeds max_bytes, or when the memory
+    budget asks for memory back.
+    """
+
+    def __init__(
+        self,
+        base_dt=DEFAULT_BASE_DT,
+        max_base_bins=DEFAULT_MAX_BASE_BINS,
+        max_bytes=DEFAULT_MAX_BYTES,
+    ):
+        self.base_dt = base_dt
+        self.max_base_bins = max_base_bins
+        self.max_bytes = max_bytes
+        self._pyramids = OrderedDict()
+        self._watched = set()
+        self._lock = threading.Lock()
+
+    def get(self, event_list):
+        list_id = id(event_list)
+        with self._lock:
+            pyramid = self._pyramids.get(list_id)
+            if pyramid is not None:
+                self._pyramids.move_to_end(list_id)
+                return pyramid
+
+        pyramid = BinningPyramid(event_list, self.base_dt, self.max_base_bins)
+        if pyramid.nbytes > self.max_bytes:
+            return pyramid
+        with self._lock:
+            if list_id not in self._watched:
+                self._watched.add(list_id)
+                weakref.finalize(event_list, self.discard_id, list_id)
+            self._pyramids[list_id] = pyramid
+            self._shrink(self.max_bytes)
+        return pyramid
+
+    def _shrink(self, max_bytes):
+        # Called with the lock held; drops least recently used pyramids
+        while self._pyramids and self._nbytes() > max_bytes:
+            self._pyramids.popitem(last=False)
+
+    def _nbytes(self):
+        return sum(pyramid.nbytes for pyramid in self._pyramids.values())
+
+    def discard_id(self, list_id):
+        with self._lock:
+            self._watched.discard(list_id)
+            self._pyramids.pop(list_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._pyramids.clear()
+
+    def lightcurve(self, event_list, dt):
+        return self.get(event_list).lightcurve(event_list, dt)
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return self._nbytes()
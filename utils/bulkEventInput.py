@@ -0,0 +1,121 @@
+import io
+import os
+import warnings
+import numpy as np
+import pandas as pd
+
+_SEPARATORS = str.maketrans({",": " ", ";": " ", "\t": " ", "\n": " ", "\r": " "})
+
+
+def parse_numbers(text):
+    # Comma-, semicolon- or whitespace-separated numbers, parsed in C
+    text = text.translate(_SEPARATORS).strip()
+    if not text:
+        return np.empty(0, dtype=np.float64)
+    with warnings.catch_warnings():
+        # Older NumPy stops at the first bad token and only warns about it
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=np.float64, sep=" ")
+        except (DeprecationWarning, ValueError):
+            raise ValueError("The input contains values that are not numbers.") from None
+
+
+def parse_gti(text):
+    # "0 4; 5 10" -> [[0, 4], [5, 10]]
+    values = parse_numbers(text)
+    if len(values) % 2:
+        raise ValueError("Each GTI needs a start and a stop time.")
+    return values.reshape(-1, 2)
+
+
+def _pick_columns(names):
+    # (time, energy) column positions: by name when present, else by position
+    lowered = [str(name).strip().lower() for name in names]
+    time_col = lowered.index("time") if "time" in lowered else 0
+    if "energy" in lowered:
+        energy_col = lowered.index("energy")
+    else:
+        others = [i for i in range(len(lowered)) if i != time_col]
+        energy_col = others[0] if others else None
+    return time_col, energy_col
+
+
+def read_uploaded_events(filename, contents):
+    # Returns (times, energy or None) from the bytes of an uploaded CSV or NPY file
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".npy":
+        data = np.load(io.BytesIO(contents), allow_pickle=False)
+        if data.dtype.names:
+            names = data.dtype.names
+            time_col, energy_col = _pick_columns(names)
+            times = data[names[time_col]]
+            energy = None if energy_col is None else data[names[energy_col]]
+        elif data.ndim == 1:
+            times, energy = data, None
+        elif data.ndim == 2 and data.shape[1] in (1, 2):
+            times = data[:, 0]
+            energy = data[:, 1] if data.shape[1] == 2 else None
+        else:
+            raise ValueError(
+                "NPY files must hold times, or (n, 2) rows of time and energy."
+            )
+        times = np.asarray(times, dtype=np.float64)
+        return times, None if energy is None else np.asarray(energy, dtype=np.float64)
+
+    if extension == ".csv":
+        first_line = contents.split(b"\n", 1)[0].decode(errors="replace")
+        has_header = any(c.isalpha() and c not in "eE" for c in first_line)
+        table = pd.read_csv(
+            io.BytesIO(contents),
+            header=0 if has_header else None,
+            engine="c",
+            dtype=np.float64,
+        )
+        time_col, energy_col = _pick_columns(table.columns)
+        columns = table.to_numpy()
+        energy = None if energy_col is None else columns[:, energy_col]
+        return columns[:, time_col], energy
+
+    raise ValueError(f"Unsupported file type '{extension}': upload a .csv or .npy file.")
+
+
+def validate_events(times, energy=None, gti=None, sort=False):
+    # Vectorized checks of a bulk event list; returns the (possibly sorted) arrays
+    if not len(times):
+        raise ValueError("No photon arrival times were given.")
+    if not np.all(np.isfinite(times)):
+        raise ValueError("Photon arrival times must be finite numbers.")
+    if energy is not None and len(energy) != len(times):
+        raise ValueError(
+            f"Got {len(energy)} energies for {len(times)} photon arrival times."
+        )
+
+    decreasing = np.flatnonzero(times[1:] < times[:-1])
+    if len(decreasing):
+        if not sort:
+            raise ValueError(
+                f"Photon arrival times are not sorted: {len(decreasing)} decrease(s), "
+                f"the first at position {decreasing[0] + 1}."
+            )
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        if energy is not None:
+            energy = energy[order]
+
+    if gti is not None and len(gti):
+        if np.any(gti[:, 1] <= gti[:, 0]):
+            raise ValueError("Every GTI must stop after it starts.")
+        if np.any(gti[1:, 0] < gti[:-1, 1]):
+            raise ValueError("GTIs must be sorted and must not overlap.")
+        # The GTI each event would fall in, found for all events at once
+        index = np.searchsorted(gti[:, 0], times, side="right") - 1
+        inside = (index >= 0) & (times <= gti[np.maximum(index, 0), 1])
+        n_outside = len(times) - np.count_nonzero(inside)
+        if n_outside:
+            raise ValueError(
+                f"{n_outside} photon arrival time(s) fall outside the GTIs, "
+                f"the first at {times[~inside][0]}."
+            )
+
+    return times, energy, gti
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from .executors import get_thread_pool
+from .metrics import metrics
+
+# Pause before starting a computation, so that a burst of widget changes
+# (e.g. dragging a slider) only computes the final value
+DEFAULT_DEBOUNCE = 0.15
+
+
+class ComputationCancelled(Exception):
+    pass
+
+
+def check_cancelled(cancel_event):
+    # Called by compute functions between stages to stop early on stale requests
+    if cancel_event is not None and cancel_event.is_set():
+        raise ComputationCancelled()
+
+
+class LatestRequestRunner:
+    """Runs computations in the worker thread pool, keeping only the newest.
+
+    ``compute(cancel_event)`` runs off the event loop; ``apply(result)`` runs
+    back on the event loop and is the only place that should touch widgets.
+    Submitting a new request cancels a pending or in-flight older one.
+    ``on_cancel()`` runs on the event loop when the newest request is cancelled
+    without a newer one to take its place. With a name, the latency of both
+    stages of completed requests is recorded.
+    """
+
+    def __init__(
+        self,
+        debounce=DEFAULT_DEBOUNCE,
+        busy_indicator=None,
+        on_error=None,
+        name=None,
+        on_cancel=None,
+    ):
+        self.name = name
+        self.debounce = debounce
+        self.busy_indicator = busy_indicator
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self._task = None
+        self._cancel_event = None
+
+    def _set_busy(self, busy):
+        if self.busy_indicator is not None:
+            self.busy_indicator.value = busy
+
+    def cancel(self):
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def submit(self, compute, apply):
+        self.cancel()
+        cancel_event = threading.Event()
+        self._cancel_event = cancel_event
+        self._task = asyncio.ensure_future(self._run(compute, apply, cancel_event))
+        return self._task
+
+    def _observe(self, stage, started, error=False):
+        if self.name is not None:
+            metrics.observe(
+                f"{self.name}.{stage}", "stage", time.perf_counter() - started, error
+            )
+
+    async def _run(self, compute, apply, cancel_event):
+        self._set_busy(True)
+        stage = "compute"
+        started = time.perf_counter()
+        try:
+            await asyncio.sleep(self.debounce)
+            loop = asyncio.get_event_loop()
+            started = time.perf_counter()
+            result = await loop.run_in_executor(
+                get_thread_pool(), compute, cancel_event
+            )
+            # A newer request may have arrived while the worker was busy
+            check_cancelled(cancel_event)
+            self._observe(stage, started)
+            stage = "apply"
+            started = time.perf_counter()
+            apply(result)
+            self._observe(stage, started)
+        except (asyncio.CancelledError, ComputationCancelled):
+            if self.on_cancel is not None and self._cancel_event is cancel_event:
+                self.on_cancel()
+        except Exception as e:
+            self._observe(stage, started, error=True)
+            if self.on_error is None:
+                raise
+            self.on_error(e)
+        finally:
+            if self._cancel_event is cancel_event:
+                self._set_busy(False)
@@ -0,0 +1,126 @@
+import itertools
+import numpy as np
+from scipy.fft import next_fast_len
+
+# Pairs whose inverse transforms are computed together; bounds the temporary
+# (PAIR_BATCH, n_fft) array for long light curves
+PAIR_BATCH = 16
+
+
+def parse_energy_bands(text):
+    # "0.3-2, 2-10" -> [(0.3, 2.0), (2.0, 10.0)]
+    bands = []
+    for band in text.split(","):
+        if band.strip():
+            emin, emax = (float(value) for value in band.split("-"))
+            if emax <= emin:
+                raise ValueError(f"Invalid energy band '{band.strip()}'.")
+            bands.append((emin, emax))
+    return bands
+
+
+def bin_on_common_grid(series, dt):
+    # series: list of (label, event_list, energy_band or None). All of them are
+    # binned on one grid covering the time span common to every event list.
+    starts, stops = [], []
+    for _, event_list, _ in series:
+        gti = event_list.gti
+        if gti is not None and len(gti):
+            starts.append(gti[0, 0])
+            stops.append(gti[-1, 1])
+        else:
+            starts.append(np.min(event_list.time))
+            stops.append(np.max(event_list.time))
+    tstart, tstop = max(starts), min(stops)
+    n_bin = int(np.floor((tstop - tstart) / dt))
+    if n_bin < 2:
+        raise ValueError("The selected event lists do not overlap in time.")
+
+    counts = np.empty((len(series), n_bin), dtype=np.float64)
+    for i, (label, event_list, band) in enumerate(series):
+        time = event_list.time
+        if band is not None:
+            if event_list.energy is None:
+                raise ValueError(f"'{label}' has no energy information.")
+            energy = event_list.energy
+            time = time[(energy >= band[0]) & (energy < band[1])]
+        bin_index = np.floor((time - tstart) / dt).astype(np.int64)
+        inside = (bin_index >= 0) & (bin_index < n_bin)
+        counts[i] = np.bincount(bin_index[inside], minlength=n_bin)
+
+    return tstart, counts
+
+
+class CrossCorrelationEngine:
+    """FFT cross-correlations among a set of light curves on a common grid.
+
+    Every series is transformed once, in a single batched call, when the engine
+    is built. Correlations for any pair, maximum lag or lag resolution are then
+    obtained from those transforms with inverse FFTs only.
+    """
+
+    def __init__(self, labels, counts, dt):
+        self.labels = list(labels)
+        self.dt = dt
+        self.n_bin = counts.shape[1]
+
+        centred = counts - counts.mean(axis=1, keepdims=True)
+        self.norms = np.sqrt((centred**2).sum(axis=1))
+        # Zero padding to at least 2 * n_bin avoids circular wrap-around
+        self.n_fft = next_fast_len(2 * self.n_bin)
+        self.transforms = np.fft.rfft(centred, n=self.n_fft, axis=1)
+
+    def pairs(self):
+        return list(itertools.combinations(range(len(self.labels)), 2))
+
+    def correlate(self, pairs=None, max_lag=None, lag_resolution=None):
+        # Returns lags and a (n_pairs, n_lags) array of normalized correlations,
+        # where a positive lag means the second series lags the first
+        if pairs is None:
+            pairs = self.pairs()
+        max_k = self.n_bin - 1
+        if max_lag is not None:
+            max_k = min(int(np.floor(max_lag / self.dt)), max_k)
+
+        ccfs = np.empty((len(pairs), 2 * max_k + 1), dtype=np.float64)
+        for start in range(0, len(pairs), PAIR_BATCH):
+            batch = pairs[start : start + PAIR_BATCH]
+            first = np.array([i for i, _ in batch])
+            second = np.array([j for _, j in batch])
+            products = np.conj(self.transforms[first]) * self.transforms[second]
+            full = np.fft.irfft(products, n=self.n_fft, axis=1)
+            # Negative lags sit at the end of the circular result
+            window = np.concatenate(
+                [full[:, self.n_fft - max_k :], full[:, : max_k + 1]], axis=1
+            )
+            norm = self.norms[first] * self.norms[second]
+            norm[norm == 0] = np.inf
+            ccfs[start : start + len(batch)] = window / norm[:, None]
+
+        lags = np.arange(-max_k, max_k + 1) * self.dt
+
+        # Lags can only be coarsened, in whole multiples of the binning dt
+        factor = 1
+        if lag_resolution is not None:
+            factor = int(round(lag_resolution / self.dt))
+        if factor > 1:
+            lags, ccfs = self._rebin_lags(lags, ccfs, factor, max_k)
+        return lags, ccfs
+
+    @staticmethod
+    def _rebin_lags(lags, ccfs, factor, max_k):
+        # Average over `factor` lags centred on each kept lag, keeping one lag in
+        # `factor` and lag zero. An even box has no centre lag, so it spans
+        # factor + 1 lags with half weights at both ends.
+        if factor % 2:
+            kernel = np.ones(factor)
+        else:
+            kernel = np.ones(factor + 1)
+            kernel[[0, -1]] = 0.5
+        # Lags beyond max_k are missing, not zero: the edges average what exists
+        weights = np.convolve(np.ones(ccfs.shape[1]), kernel, mode="same")
+        smoothed = np.apply_along_axis(
+            lambda ccf: np.convolve(ccf, kernel, mode="same"), 1, ccfs
+        )
+        keep = np.arange(max_k % factor, 2 * max_k + 1, factor)
+        return lags[keep], smoothed[:, keep] / weights[keep]
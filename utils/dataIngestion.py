@@ -1,13 +1,38 @@
 import panel as pn
 from stingray.events import EventList
-from stingray import Lightcurve
 import asyncio
-import warnings
 import os
 import stat
+import time
 import numpy as np
+import pandas as pd
 from bokeh.models import Tooltip
-from .globals import loaded_event_data
+from .globals import session_event_data, session_streamed_products, memory_budget
+from .streamingReader import stream_binned_products
+from .saveEngine import write_event_list_atomic, remove_stale_temp_files
+from .ingestionCache import (
+    cache_key,
+    load_event_list as load_cached_event_list,
+    read_and_cache_event_list,
+    read_event_list_cached,
+    default_cache_root,
+    max_cache_bytes_from_environment,
+)
+from .bulkEventInput import (
+    parse_numbers,
+    parse_gti,
+    read_uploaded_events,
+    validate_events,
+)
+from .eventSimulation import (
+    SHAPES as SIMULATION_SHAPES,
+    METHODS as SIMULATION_METHODS,
+    light_curve_shape,
+    simulate_event_times,
+)
+from .metrics import timed
+from .warningCapture import captures_warnings, current_warning_log, in_context
+from .executors import get_process_pool, get_thread_pool, run_with_warnings
 
 # Initialize Panel extension
 pn.extension()
@@ -18,29 +43,18 @@ loaded_data_path = os.path.join(os.getcwd(), "demo", "loaded-data")
 # Create the loaded-data directory if it doesn't exist
 os.makedirs(loaded_data_path, exist_ok=True)
 
+# Parsed event columns of previously loaded files, keyed by content hash, and
+# the disk space they may take before the least recently used are removed
+ingestion_cache_path = os.path.join(default_cache_root(), "ingestion")
+ingestion_cache_max_bytes = max_cache_bytes_from_environment()
 
-# Custom warning handler
-class WarningHandler:
-    def __init__(self):
-        self.warnings = []
-
-    def warn(
-        self, message, category=None, filename=None, lineno=None, file=None, line=None
-    ):
-        warning_message = f"Message: {message}\nCategory: {category.__name__ if category else 'N/A'}\nFile: {filename if filename else 'N/A'}\nLine: {lineno if lineno else 'N/A'}\n"
-        self.warnings.append(warning_message)
-
-
-# Create an instance of the warning handler
-warning_handler = WarningHandler()
-
-# Redirect warnings to the custom handler
-warnings.showwarning = warning_handler.warn
 
 # # Global list to store event data
 # loaded_event_data = []
 
 
+@timed("ingestion.load_event_data", kind="stage")
+@captures_warnings
 async def load_event_data(
     event,
     file_selector,
@@ -49,7 +63,11 @@ async def load_event_data(
     format_checkbox,
     output,
     warning_output,
+    parallel_checkbox=None,
+    cache_checkbox=None,
 ):
+    warning_log = current_warning_log()
+    loaded_event_data = session_event_data()
     if not file_selector.value:
         output.value = "No file selected. Please select a file to upload."
         return
@@ -82,37 +100,190 @@ async def load_event_data(
         )
         return
 
+    use_cache = cache_checkbox is not None and cache_checkbox.value
+
+    if parallel_checkbox is not None and parallel_checkbox.value:
+        await load_event_data_parallel(
+            file_paths, filenames, formats, output, warning_output, use_cache
+        )
+        return
+
     try:
         loaded_files = []
         loop = asyncio.get_event_loop()
         for file_path, file_name, file_format in zip(file_paths, filenames, formats):
-            if any(file_name == event[0] for event in loaded_event_data):
+            if file_name in loaded_event_data:
                 output.value = f"A file with the name '{file_name}' already exists in memory. Please provide a different name."
                 return
 
-            event_list = await loop.run_in_executor(
-                None, EventList.read, file_path, file_format
-            )
-            loaded_event_data.append((file_name, event_list))
+            if use_cache:
+                event_list = await loop.run_in_executor(
+                    None,
+                    in_context(
+                        read_event_list_cached,
+                        ingestion_cache_path,
+                        file_path,
+                        file_format,
+                        ingestion_cache_max_bytes,
+                    ),
+                )
+            else:
+                event_list = await loop.run_in_executor(
+                    None, in_context(EventList.read, file_path, file_format)
+                )
+            loaded_event_data.add(file_name, event_list)
             loaded_files.append(
                 f"File '{file_path}' loaded successfully as '{file_name}' with format '{file_format}'."
             )
 
         output.value = "\n".join(loaded_files)
-        if warning_handler.warnings:
-            warning_output.value = "\n".join(warning_handler.warnings)
-        else:
-            warning_output.value = "No warnings."
+        warning_output.value = warning_log.format() or "No warnings."
     except Exception as e:
         output.value = f"An error occurred: {e}"
 
-    # Clear the warnings after displaying them
-    warning_handler.warnings.clear()
 
+@timed("ingestion.load_event_data_parallel", kind="stage")
+@captures_warnings
+async def load_event_data_parallel(
+    file_paths, filenames, formats, output, warning_output, use_cache=False
+):
+    warning_log = current_warning_log()
+    loaded_event_data = session_event_data()
+    # Reject name clashes up front, with memory and within the batch itself
+    seen_names = set()
+    for file_name in filenames:
+        if file_name in loaded_event_data or file_name in seen_names:
+            output.value = f"A file with the name '{file_name}' already exists in memory. Please provide a different name."
+            return
+        seen_names.add(file_name)
+
+    loop = asyncio.get_event_loop()
+    pool = get_process_pool()
+
+    async def read_one(file_path, file_name, file_format):
+        try:
+            read_function, read_args = EventList.read, (file_path, file_format)
+            if use_cache:
+                # Hits are memory-mapped here, in the server process; only misses
+                # are parsed by a worker, which also stores them in the cache
+                key = await loop.run_in_executor(
+                    None, in_context(cache_key, file_path, file_format)
+                )
+                event_list = await loop.run_in_executor(
+                    None, in_context(load_cached_event_list, ingestion_cache_path, key)
+                )
+                if event_list is not None:
+                    return file_path, file_name, file_format, event_list, [], None
+                read_function = read_and_cache_event_list
+                read_args = (
+                    ingestion_cache_path,
+                    key,
+                    file_path,
+                    file_format,
+                    ingestion_cache_max_bytes,
+                )
+
+            event_list, caught_warnings = await loop.run_in_executor(
+                pool, run_with_warnings, read_function, *read_args
+            )
+            return file_path, file_name, file_format, event_list, caught_warnings, None
+        except Exception as e:
+            return file_path, file_name, file_format, None, [], e
+
+    n_files = len(file_paths)
+    output.value = f"Loading {n_files} files in parallel..."
+    loaded_files = []
+    tasks = [
+        read_one(file_path, file_name, file_format)
+        for file_path, file_name, file_format in zip(file_paths, filenames, formats)
+    ]
+
+    # Report each file as soon as it finishes; a failure does not stop the rest
+    for n_done, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+        file_path, file_name, file_format, event_list, caught_warnings, error = (
+            await next_done
+        )
+        if error is not None:
+            loaded_files.append(
+                f"[{n_done}/{n_files}] Failed to load '{file_path}': {error}"
+            )
+        else:
+            loaded_event_data.add(file_name, event_list)
+            loaded_files.append(
+                f"[{n_done}/{n_files}] File '{file_path}' loaded successfully as '{file_name}' with format '{file_format}'."
+            )
+        for message, category, filename, lineno in caught_warnings:
+            warning_log.add(f"[{file_name}] {message}", category, filename, lineno)
+
+        output.value = "\n".join(loaded_files)
+        warning_output.value = warning_log.format() or "No warnings."
+
+
+@timed("ingestion.stream_event_data", kind="stage")
+@captures_warnings
+async def stream_event_data(
+    event, file_selector, filename_input, dt_input, output, warning_output
+):
+    warning_log = current_warning_log()
+    streamed_products = session_streamed_products()
+    if not file_selector.value:
+        output.value = "No file selected. Please select a file to stream."
+        return
+
+    file_paths = file_selector.value
+    filenames = (
+        [name.strip() for name in filename_input.value.split(",")]
+        if filename_input.value
+        else []
+    )
+    if len(filenames) < len(file_paths):
+        filenames.extend(
+            [
+                os.path.basename(path).split(".")[0]
+                for path in file_paths[len(filenames) :]
+            ]
+        )
+    dt = dt_input.value
+
+    streamed_files = []
+    loop = asyncio.get_event_loop()
+    for file_path, file_name in zip(file_paths, filenames):
+        if file_name in streamed_products:
+            streamed_files.append(
+                f"Binned products with the name '{file_name}' already exist in memory. Please provide a different name."
+            )
+            continue
+        try:
+            # Events are binned chunk by chunk; the full EventList is never built
+            products = await loop.run_in_executor(
+                None, in_context(stream_binned_products, file_path, dt)
+            )
+        except Exception as e:
+            streamed_files.append(
+                f"An error occurred while streaming '{file_path}': {e}"
+            )
+            continue
+
+        streamed_products[file_name] = products
+        streamed_files.append(
+            f"File '{file_path}' streamed as '{file_name}': {products['n_events']} events "
+            f"binned into {len(products['lightcurve'].counts)} bins of "
+            f"dt={products['lightcurve'].dt:g}, {len(products['gti'])} GTIs. "
+            "See QuickLook > Light Curve > Streamed."
+        )
+        output.value = "\n".join(streamed_files)
+
+    output.value = "\n".join(streamed_files)
+    warning_output.value = warning_log.format() or "No warnings."
 
-def save_loaded_files(
+
+@timed("ingestion.save_loaded_files", kind="stage")
+@captures_warnings
+async def save_loaded_files(
     event, filename_input, format_input, format_checkbox, output, warning_output
 ):
+    warning_log = current_warning_log()
+    loaded_event_data = session_event_data()
     if not loaded_event_data:
         output.value = "No files loaded to save."
         return
@@ -120,7 +291,7 @@ def save_loaded_files(
     filenames = (
         [name.strip() for name in filename_input.value.split(",")]
         if filename_input.value
-        else [event[0] for event in loaded_event_data]
+        else loaded_event_data.names()
     )
     formats = (
         [fmt.strip() for fmt in format_input.value.split(",")]
@@ -143,41 +314,63 @@ def save_loaded_files(
         output.value = "Please specify formats for all loaded files or check the default format option."
         return
 
-    saved_files = []
-    try:
-        for (loaded_name, event_list), file_name, file_format in zip(
-            loaded_event_data, filenames, formats
-        ):
-            if os.path.exists(
-                os.path.join(loaded_data_path, f"{file_name}.{file_format}")
-            ):
-                output.value = f"A file with the name '{file_name}' already exists. Please provide a different name."
-                return
+    save_paths = [
+        os.path.join(loaded_data_path, f"{file_name}.{file_format}")
+        for file_name, file_format in zip(filenames, formats)
+    ]
+    for file_name, save_path in zip(filenames, save_paths):
+        if os.path.exists(save_path) or save_paths.count(save_path) > 1:
+            output.value = f"A file with the name '{file_name}' already exists. Please provide a different name."
+            return
 
-            save_path = os.path.join(loaded_data_path, f"{file_name}.{file_format}")
-            if file_format == 'hdf5':
-                event_list.to_astropy_table().write(save_path, format=file_format, path='data')
-            else:
-                event_list.write(save_path, file_format)
+    remove_stale_temp_files(loaded_data_path)
 
-            saved_files.append(
-                f"File '{file_name}' saved successfully to '{save_path}'."
+    loop = asyncio.get_event_loop()
+    # Threads write the in-memory (or memory-mapped) lists where they are: a
+    # process worker would need a pickled copy of every list. h5py and astropy
+    # release the GIL while writing, so the files are still written in parallel.
+    pool = get_thread_pool()
+
+    async def save_one(event_list, file_name, file_format, save_path):
+        try:
+            await loop.run_in_executor(
+                pool,
+                in_context(write_event_list_atomic, event_list, save_path, file_format),
             )
+            return file_name, save_path, None
+        except Exception as e:
+            return file_name, save_path, e
 
-        output.value = "\n".join(saved_files)
-        if warning_handler.warnings:
-            warning_output.value = "\n".join(warning_handler.warnings)
-        else:
-            warning_output.value = "No warnings."
-    except Exception as e:
-        output.value = f"An error occurred while saving files: {e}"
+    tasks = [
+        save_one(event_list, file_name, file_format, save_path)
+        for (_, event_list), file_name, file_format, save_path in zip(
+            loaded_event_data.items(), filenames, formats, save_paths
+        )
+    ]
 
-    # Clear the warnings after displaying them
-    warning_handler.warnings.clear()
+    # Files are written concurrently; each is reported as soon as it is done
+    saved_files = []
+    n_files = len(tasks)
+    output.value = f"Saving {n_files} files..."
+    for n_done, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+        file_name, save_path, error = await next_done
+        if error is not None:
+            saved_files.append(
+                f"[{n_done}/{n_files}] An error occurred while saving '{file_name}': {error}"
+            )
+        else:
+            saved_files.append(
+                f"[{n_done}/{n_files}] File '{file_name}' saved successfully to '{save_path}'."
+            )
 
+        output.value = "\n".join(saved_files)
+        warning_output.value = warning_log.format() or "No warnings."
 
 
+@timed("ingestion.delete_selected_files", kind="stage")
+@captures_warnings
 def delete_selected_files(event, file_selector, output, warning_output):
+    warning_log = current_warning_log()
     if not file_selector.value:
         output.value = "No file selected. Please select a file to delete."
         return
@@ -200,40 +393,58 @@ def delete_selected_files(event, file_selector, output, warning_output):
             deleted_files.append(f"An error occurred while deleting '{file_path}': {e}")
 
     output.value = "\n".join(deleted_files)
-    if warning_handler.warnings:
-        warning_output.value = "\n".join(warning_handler.warnings)
-    else:
-        warning_output.value = "No warnings."
-
-    warning_handler.warnings.clear()
-
-
-def preview_loaded_files(event, output, warning_output, time_limit=10):
+    warning_output.value = warning_log.format() or "No warnings."
+
+
+PREVIEW_COLUMNS = {
+    "name": "File",
+    "n_events": "Events",
+    "count_rate": "Count rate (ct/s)",
+    "exposure": "Exposure (s)",
+    "n_gti": "GTIs",
+    "tmin": "First time",
+    "tmax": "Last time",
+    "energy_min": "Min energy",
+    "energy_max": "Max energy",
+    "is_sorted": "Sorted",
+    "mjdref": "MJDREF",
+}
+
+
+@timed("ingestion.preview_loaded_files", kind="stage")
+@captures_warnings
+def preview_loaded_files(event, output, warning_output, preview_table):
+    warning_log = current_warning_log()
+    # Built from the metadata index computed at load time: no pass over the
+    # event arrays, whatever their size or number
+    loaded_event_data = session_event_data()
     if not loaded_event_data:
         output.value = "No files loaded to preview."
+        preview_table.visible = False
         return
 
-    preview_data = []
-    for file_name, event_list in loaded_event_data:
-        try:
-            time_data = f"Times (first {time_limit}): {event_list.time[:time_limit]}"
-            mjdref = f"MJDREF: {event_list.mjdref}"
-            gti = f"GTI: {event_list.gti}"
-            preview_data.append(f"File: {file_name}\n{time_data}\n{mjdref}\n{gti}\n")
-        except Exception as e:
-            warning_handler.warn(str(e), category=RuntimeWarning)
+    summary = pd.DataFrame(loaded_event_data.summary_rows())
+    summary = summary[list(PREVIEW_COLUMNS)].rename(columns=PREVIEW_COLUMNS)
+    preview_table.value = summary
+    preview_table.visible = True
+    output.value = f"{len(summary)} event lists loaded. Click a column header to sort."
 
-    if preview_data:
-        output.value = "\n\n".join(preview_data)
-    else:
-        output.value = "No valid files loaded for preview."
+    warning_output.value = warning_log.format() or "No warnings."
 
-    if warning_handler.warnings:
-        warning_output.value = "\n".join(warning_handler.warnings)
-    else:
-        warning_output.value = "No warnings."
 
-    warning_handler.warnings.clear()
+def format_memory_status(stats):
+    mb = 1024**2
+    status = (
+        f"**In memory:** {stats['footprint_bytes'] / mb:.1f} MB of a "
+        f"{stats['budget_bytes'] / mb:.0f} MB budget (all sessions)\n\n"
+        f"**Disk-backed lists:** {stats['disk_backed_lists']} of "
+        f"{stats['event_lists']}, {stats['spills']} spilled so far "
+        f"({stats['spilled_bytes'] / mb:.1f} MB)\n"
+    )
+    for timestamp, name, nbytes in reversed(stats["recent"][-5:]):
+        when = time.strftime("%H:%M:%S", time.localtime(timestamp))
+        status += f"\n- {when}: spilled '{name}' ({nbytes / mb:.1f} MB)"
+    return status
 
 
 def create_loading_tab():
@@ -253,6 +464,12 @@ def create_loading_tab():
     format_checkbox = pn.widgets.Checkbox(
         name="Use default format (ogip for loading, hdf5 for saving)", value=False
     )
+    parallel_checkbox = pn.widgets.Checkbox(
+        name="Load files in parallel", value=False
+    )
+    cache_checkbox = pn.widgets.Checkbox(
+        name="Use ingestion cache (skip re-parsing known files)", value=True
+    )
     load_button = pn.widgets.Button(name="Load Event Data", button_type="primary")
     save_button = pn.widgets.Button(name="Save Loaded Data", button_type="success")
     delete_button = pn.widgets.Button(
@@ -261,12 +478,59 @@ def create_loading_tab():
     preview_button = pn.widgets.Button(
         name="Preview Loaded Files", button_type="default"
     )
+    stream_dt_input = pn.widgets.FloatInput(
+        name="Streaming dt", value=1.0, start=1e-6, width=150
+    )
+    stream_button = pn.widgets.Button(
+        name="Stream Binned Products", button_type="default"
+    )
     output = pn.widgets.TextAreaInput(
         name="Output", value="", disabled=True, height=200
     )
     warning_output = pn.widgets.TextAreaInput(
         name="Warnings", value="", disabled=True, height=200
     )
+    preview_table = pn.widgets.Tabulator(
+        pagination="remote",
+        page_size=20,
+        disabled=True,
+        show_index=False,
+        visible=False,
+    )
+    # This session's lists, the only ones named in the memory status
+    loaded_event_data = session_event_data()
+    memory_budget_input = pn.widgets.FloatInput(
+        name="Memory budget (MB)",
+        value=memory_budget.budget_bytes / 1024**2,
+        start=1,
+        width=150,
+    )
+    memory_refresh_button = pn.widgets.Button(name="Refresh", button_type="default")
+    memory_status = pn.pane.Markdown("")
+
+    def refresh_memory_status(*args):
+        memory_status.object = format_memory_status(
+            memory_budget.stats(registry=loaded_event_data)
+        )
+
+    def enforce_and_refresh(*args):
+        # Spilling runs off the event loop; the status is updated once it is done
+        future = get_thread_pool().submit(memory_budget.enforce)
+        doc = pn.state.curdoc
+        if doc is not None:
+            future.add_done_callback(
+                lambda _: doc.add_next_tick_callback(refresh_memory_status)
+            )
+        refresh_memory_status()
+
+    @timed("ingestion.on_memory_budget_change")
+    def on_memory_budget_change(event):
+        memory_budget.budget_bytes = int(event.new * 1024**2)
+        enforce_and_refresh()
+
+    memory_budget_input.param.watch(on_memory_budget_change, "value")
+    memory_refresh_button.on_click(refresh_memory_status)
+    refresh_memory_status()
 
     tooltip_format = pn.widgets.TooltipIcon(
         value=Tooltip(
@@ -282,14 +546,13 @@ def create_loading_tab():
         )
     )
 
+    @timed("ingestion.on_load_click")
     def on_load_click(event):
         # Clear previous outputs and warnings
         output.value = ""
         warning_output.value = ""
-        warning_handler.warnings.clear()
-        warnings.resetwarnings()
 
-        asyncio.create_task(
+        task = asyncio.create_task(
             load_event_data(
                 event,
                 file_selector,
@@ -298,44 +561,67 @@ def create_loading_tab():
                 format_checkbox,
                 output,
                 warning_output,
+                parallel_checkbox,
+                cache_checkbox,
             )
         )
+        task.add_done_callback(enforce_and_refresh)
 
 
-        
-
+    @timed("ingestion.on_save_click")
     def on_save_click(event):
         # Clear previous outputs and warnings
         output.value = ""
         warning_output.value = ""
-        warning_handler.warnings.clear()
-        warnings.resetwarnings()
 
-        save_loaded_files(
-            event, filename_input, format_input, format_checkbox, output, warning_output
+        asyncio.create_task(
+            save_loaded_files(
+                event,
+                filename_input,
+                format_input,
+                format_checkbox,
+                output,
+                warning_output,
+            )
         )
-        line_output_hv = pn.pane.HoloViews(height=300, width=500)
 
 
+    @timed("ingestion.on_delete_click")
     def on_delete_click(event):
         # Clear previous outputs and warnings
         output.value = ""
         warning_output.value = ""
-        warning_handler.warnings.clear()
-        warnings.resetwarnings()
 
         delete_selected_files(event, file_selector, output, warning_output)
 
+    @timed("ingestion.on_preview_click")
     def on_preview_click(event):
         # Clear previous outputs and warnings
         output.value = ""
         warning_output.value = ""
-        warning_handler.warnings.clear()
-        warnings.resetwarnings()
 
-        preview_loaded_files(event, output, warning_output)
+        preview_loaded_files(event, output, warning_output, preview_table)
+        refresh_memory_status()
+
+    @timed("ingestion.on_stream_click")
+    def on_stream_click(event):
+        # Clear previous outputs and warnings
+        output.value = ""
+        warning_output.value = ""
+
+        asyncio.create_task(
+            stream_event_data(
+                event,
+                file_selector,
+                filename_input,
+                stream_dt_input,
+                output,
+                warning_output,
+            )
+        )
 
     load_button.on_click(on_load_click)
+    stream_button.on_click(on_stream_click)
     save_button.on_click(on_save_click)
     delete_button.on_click(on_delete_click)
     preview_button.on_click(on_preview_click)
@@ -346,13 +632,20 @@ def create_loading_tab():
         pn.Row(filename_input, tooltip_file),
         pn.Row(format_input, tooltip_format),
         format_checkbox,
+        parallel_checkbox,
+        cache_checkbox,
         pn.Row(load_button, save_button, delete_button, preview_button),
+        pn.Row(stream_dt_input, stream_button),
         width_policy="min",
     )
 
     second_column = pn.Column(
         pn.pane.Markdown("# Output and Warnings"),
         pn.Column(output, warning_output),
+        preview_table,
+        pn.pane.Markdown("# Memory"),
+        pn.Row(memory_budget_input, memory_refresh_button),
+        memory_status,
         width_policy="min",
     )
 
@@ -360,6 +653,8 @@ def create_loading_tab():
     return tab_content
 
 
+@timed("ingestion.create_event_list", kind="stage")
+@captures_warnings
 def create_event_list(
     event,
     times_input,
@@ -369,31 +664,35 @@ def create_event_list(
     name_input,
     output,
     warning_output,
+    upload_input=None,
+    sort_checkbox=None,
 ):
+    warning_log = current_warning_log()
+    loaded_event_data = session_event_data()
     try:
-        if not times_input.value or not mjdref_input.value:
-            output.value = "Please enter Photon Arrival Times and MJDREF."
+        uploaded = upload_input is not None and upload_input.value
+        if (not times_input.value and not uploaded) or not mjdref_input.value:
+            output.value = "Please enter (or upload) Photon Arrival Times and MJDREF."
             return
 
-        times = [float(t) for t in times_input.value.split(",")]
+        if uploaded:
+            times, energy = read_uploaded_events(upload_input.filename, upload_input.value)
+        else:
+            times = parse_numbers(times_input.value)
+            energy = parse_numbers(energy_input.value) if energy_input.value else None
         mjdref = float(mjdref_input.value)
-        energy = (
-            [float(e) for e in energy_input.value.split(",")]
-            if energy_input.value
-            else None
-        )
-        gti = (
-            [
-                [float(g) for g in interval.split()]
-                for interval in gti_input.value.split(";")
-            ]
-            if gti_input.value
-            else None
+        gti = parse_gti(gti_input.value) if gti_input.value else None
+
+        times, energy, gti = validate_events(
+            times,
+            energy,
+            gti,
+            sort=sort_checkbox is not None and sort_checkbox.value,
         )
 
         if name_input.value:
             name = name_input.value
-            if any(name == event[0] for event in loaded_event_data):
+            if name in loaded_event_data:
                 output.value = f"A file with the name '{name}' already exists in memory. Please provide a different name."
                 return
         else:
@@ -401,67 +700,109 @@ def create_event_list(
 
         event_list = EventList(times, energy=energy, gti=gti, mjdref=mjdref)
 
-        loaded_event_data.append((name, event_list))
+        entry = loaded_event_data.add(name, event_list)
+        metadata = entry.metadata
 
         output.value = f"""
         Event List created successfully!
         Saved as: {name}
-        Times: {event_list.time}
+        Events: {metadata['n_events']} from {metadata['tmin']} to {metadata['tmax']}
         MJDREF: {event_list.mjdref}
-        GTI: {event_list.gti}
-        Energy: {event_list.energy if energy else 'Not provided'}
+        GTI: {event_list.gti if len(event_list.gti) <= 10 else f'{len(event_list.gti)} intervals'}
+        Energy: {f"{metadata['energy_min']} to {metadata['energy_max']}" if metadata['has_energy'] else 'Not provided'}
         """
     except ValueError as ve:
-        warning_handler.warn(str(ve), category=ValueError)
+        warning_log.add(str(ve), ValueError)
     except Exception as e:
-        warning_handler.warn(str(e), category=RuntimeError)
-
-    if warning_handler.warnings:
-        warning_output.value = "\n".join(warning_handler.warnings)
-    else:
-        warning_output.value = "No warnings."
+        warning_log.add(str(e), RuntimeError)
 
-    warning_handler.warnings.clear()
+    warning_output.value = warning_log.format() or "No warnings."
 
-def simulate_event_list(event, time_slider, count_slider, dt_input, name_input, method_selector, output, warning_output):
+@timed("ingestion.simulate_event_list", kind="stage")
+@captures_warnings
+async def simulate_event_list(
+    event,
+    time_slider,
+    count_slider,
+    dt_input,
+    name_input,
+    method_selector,
+    output,
+    warning_output,
+    shape_selector=None,
+    seed_input=None,
+    progress_bar=None,
+):
+    warning_log = current_warning_log()
+    loaded_event_data = session_event_data()
     try:
         if not name_input.value:
             output.value = "Please provide a name for the simulated event list."
             return
 
-        if any(name_input.value == event[0] for event in loaded_event_data):
+        if name_input.value in loaded_event_data:
             output.value = f"A file with the name '{name_input.value}' already exists in memory. Please provide a different name."
             return
 
-        times = np.arange(time_slider.value)
-        counts = np.floor(np.random.rand(time_slider.value) * count_slider.value)
-        dt = dt_input.value
-        lc = Lightcurve(times, counts, dt=dt, skip_checks=True)
-        
-        if method_selector.value == "Standard Method":
-            event_list = EventList.from_lc(lc)
+        # Without a seed one is drawn and reported, so that any run can be repeated
+        if seed_input is not None and seed_input.value.strip():
+            seed = int(seed_input.value)
         else:
-            event_list = EventList()
-            event_list.simulate_times(lc)
-        
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+        shape = shape_selector.value if shape_selector is not None else "Random"
+        method = method_selector.value
+        dt = dt_input.value
+        n_bins = time_slider.value
+        max_counts = count_slider.value
+
+        loop = asyncio.get_running_loop()
+
+        def set_progress(fraction):
+            if progress_bar is not None:
+                progress_bar.value = int(100 * fraction)
+
+        def report_progress(fraction):
+            # Called from the worker thread: widgets are only touched on the loop
+            loop.call_soon_threadsafe(set_progress, fraction)
+
+        def simulate():
+            # The shape and the times come from one generator, in a fixed order
+            rng = np.random.default_rng(seed)
+            model_counts = light_curve_shape(shape, n_bins, max_counts, rng)
+            return simulate_event_times(
+                model_counts, dt, method=method, seed=rng, progress=report_progress
+            )
+
         name = name_input.value
-        loaded_event_data.append((name, event_list))
-        
+        if progress_bar is not None:
+            progress_bar.value = 0
+            progress_bar.visible = True
+        output.value = f"Simulating '{name}' ({shape}, {method}, seed {seed})..."
+        try:
+            times, gti = await loop.run_in_executor(
+                get_thread_pool(), in_context(simulate)
+            )
+        finally:
+            if progress_bar is not None:
+                progress_bar.visible = False
+
+        if name in loaded_event_data:
+            output.value = f"A file with the name '{name}' already exists in memory. Please provide a different name."
+            return
+        event_list = EventList(time=times, gti=gti)
+        loaded_event_data.add(name, event_list)
+
         output.value = f"""
         Event List simulated successfully!
         Saved as: {name}
-        Times: {event_list.time}
-        Counts: {counts}
+        Events: {len(times)} over {n_bins} bins of {dt} s
+        Shape: {shape}, method: {method}
+        Seed: {seed} (enter it again to reproduce this list)
         """
     except Exception as e:
-        warning_handler.warn(str(e), category=RuntimeError)
-    
-    if warning_handler.warnings:
-        warning_output.value = "\n".join(warning_handler.warnings)
-    else:
-        warning_output.value = "No warnings."
-    
-    warning_handler.warnings.clear()
+        warning_log.add(str(e), RuntimeError)
+
+    warning_output.value = warning_log.format() or "No warnings."
 
 
 def create_event_list_tab():
@@ -473,13 +814,17 @@ def create_event_list_tab():
     )
 
     # Column 1: Create Event List
-    times_input = pn.widgets.TextInput(
-        name="Photon Arrival Times", placeholder="e.g., 0.5, 1.1, 2.2, 3.7"
+    times_input = pn.widgets.TextAreaInput(
+        name="Photon Arrival Times",
+        placeholder="e.g., 0.5, 1.1, 2.2, 3.7 (commas, spaces or new lines)",
+        height=100,
     )
     mjdref_input = pn.widgets.TextInput(name="MJDREF", placeholder="e.g., 58000.")
-    energy_input = pn.widgets.TextInput(
-        name="Energy (optional)", placeholder="e.g., 0., 3., 4., 20."
+    energy_input = pn.widgets.TextAreaInput(
+        name="Energy (optional)", placeholder="e.g., 0., 3., 4., 20.", height=100
     )
+    upload_input = pn.widgets.FileInput(accept=".csv,.npy")
+    sort_checkbox = pn.widgets.Checkbox(name="Sort unsorted times", value=False)
     gti_input = pn.widgets.TextInput(
         name="GTIs (optional)", placeholder="e.g., 0 4; 5 10"
     )
@@ -498,6 +843,8 @@ def create_event_list_tab():
             name_input,
             output,
             warning_output,
+            upload_input,
+            sort_checkbox,
         )
     )
 
@@ -506,20 +853,28 @@ def create_event_list_tab():
     time_slider = pn.widgets.IntSlider(name="Number of Time Bins", start=1, end=10000, value=10)
     count_slider = pn.widgets.IntSlider(name="Max Counts per Bin", start=1, end=10000, value=5)
     dt_input = pn.widgets.FloatSlider(name="Delta Time (dt)", start=0.0001, end=10000., step=0.001, value=1.0)
-    method_selector = pn.widgets.Select(name="Method", options=["Standard Method", "Inverse CDF Method"])
+    method_selector = pn.widgets.Select(name="Method", options=list(SIMULATION_METHODS))
+    shape_selector = pn.widgets.Select(name="Light Curve Shape", options=list(SIMULATION_SHAPES))
+    seed_input = pn.widgets.TextInput(name="Seed (optional)", placeholder="e.g., 42")
+    progress_bar = pn.indicators.Progress(value=0, max=100, width=300, visible=False)
     sim_name_input = pn.widgets.TextInput(name="Simulated Event List Name", placeholder="e.g., my_sim_event_list") 
     simulate_button = pn.widgets.Button(name="Simulate Event List", button_type="primary")
 
     simulate_button.on_click(
-        lambda event: simulate_event_list(
-            event,
-            time_slider,
-            count_slider,
-            dt_input,
-            sim_name_input,
-            method_selector,
-            output,
-            warning_output,
+        lambda event: asyncio.create_task(
+            simulate_event_list(
+                event,
+                time_slider,
+                count_slider,
+                dt_input,
+                sim_name_input,
+                method_selector,
+                output,
+                warning_output,
+                shape_selector,
+                seed_input,
+                progress_bar,
+            )
         )
     )
 
@@ -531,7 +886,10 @@ def create_event_list_tab():
                 times_input,
                 mjdref_input,
                 energy_input,
+                pn.pane.Markdown("Or upload times (and energies) as CSV or NPY:"),
+                upload_input,
                 gti_input,
+                sort_checkbox,
                 name_input,
                 create_button,
             ),
@@ -541,9 +899,12 @@ def create_event_list_tab():
                 time_slider,
                 count_slider,
                 dt_input,
+                shape_selector,
                 method_selector,
+                seed_input,
                 sim_name_input,
                 simulate_button,
+                progress_bar,
             ),
         ),
         pn.Row(
@@ -601,10 +962,7 @@ def create_event_list_tab():
             )
 
         output.value = "\n".join(converted_files)
-        if warning_handler.warnings:
-            warning_output.value = "\n".join(warning_handler.warnings)
-        else:
-            warning_output.value = "No warnings."
+        warning_output.value = warning_log.format() or "No warnings."
 
         # Display the converted tables
         tables_preview = []
@@ -617,9 +975,6 @@ def create_event_list_tab():
     except Exception as e:
         output.value = f"An error occurred: {e}"
 
-    # Clear the warnings after displaying them
-    warning_handler.warnings.clear()
-
 
 def create_help_tab():
     help_content = """
@@ -634,10 +989,14 @@ def create_help_tab():
     - **Enter File Names**: Specify custom names for the loaded files. If left blank, the names will be derived from the file paths.
     - **Enter Formats**: Specify the formats of the files being loaded. If left blank, the default format is used.
     - **Use default format**: Check this to use the default format ('ogip' for loading and 'hdf5' for saving).
+    - **Load files in parallel**: Read the selected files concurrently on a pool of worker processes. Each file reports its result as soon as it finishes, and a file that fails to load does not stop the others.
+    - **Use ingestion cache**: The first load of a file stores its parsed columns in a cache under `~/.cache/stingray-explorer` (or `STINGRAY_EXPLORER_CACHE_DIR`), keyed by the file's content and format. Later loads of the same content memory-map the cached columns instead of parsing the file again. Beyond `STINGRAY_EXPLORER_INGESTION_CACHE_MB` (4 GB by default), the least recently used entries are removed.
     - **Load Event Data**: Load the selected files into the event data list.
-    - **Save Loaded Data**: Save the loaded event data files to the specified directory.
+    - **Save Loaded Data**: Save the loaded event data files to the specified directory. Files are written concurrently, HDF5 files are gzip-compressed, and each file only appears under its final name once it has been written completely.
     - **Delete Selected Files**: Delete the selected files from the file system.
-    - **Preview Loaded Files**: Preview the contents of the loaded event data files.
+    - **Preview Loaded Files**: Show a sortable table summarising every loaded event list: number of events, count rate, exposure, number of GTIs, time and energy ranges, and whether the times are sorted. The summary is computed once when a list is loaded, so the preview is instant even with hundreds of lists.
+    - **Stream Binned Products**: For very large event files. Reads the events in fixed-size chunks and builds the light curve (at the chosen "Streaming dt"), the GTIs and the energy-channel histogram incrementally, without loading the full event list into memory.
+    - **Memory budget (MB)**: Upper bound on the memory held by loaded event lists across all sessions (default set by the `STINGRAY_EXPLORER_MEMORY_BUDGET_MB` environment variable). Beyond it, the least recently used lists are spilled to disk in the same cache directory and read back from there on demand. The Memory section shows the current footprint and the recent spills of this session's lists.
 
     ### Precautions
     - Ensure the file contains at least a 'time' column when loading event data.
@@ -662,20 +1021,24 @@ def create_help_tab():
     ### Functionality
     The "Creation" tab allows you to create new event lists or simulate event lists from light curves. Here is a detailed explanation of each component and its functionality:
 
-    - **Photon Arrival Times**: Enter photon arrival times in seconds from a reference MJD.
+    - **Photon Arrival Times**: Enter or paste photon arrival times in seconds from a reference MJD, separated by commas, spaces or new lines.
     - **MJDREF**: Enter the MJD reference for the photon arrival times.
-    - **Energy (optional)**: Enter the energy values associated with the photons.
-    - **GTIs (optional)**: Enter the Good Time Intervals (GTIs) for the event list.
+    - **Energy (optional)**: Enter or paste the energy values associated with the photons.
+    - **Upload (CSV or NPY)**: Instead of typing, upload the times, and optionally the energies, as a CSV file (columns named `time` and `energy`, or the first two columns) or an NPY array. Million-event files are parsed directly into arrays.
+    - **GTIs (optional)**: Enter the Good Time Intervals (GTIs) for the event list, e.g. "0 4; 5 10". Every photon must fall inside a GTI.
+    - **Sort unsorted times**: Sort the times (and their energies) instead of rejecting unsorted input.
     - **Event List Name**: Specify a name for the new event list.
     - **Create Event List**: Create a new event list with the specified parameters.
 
     ### Simulation of Event Lists
     - **Number of Time Bins**: Specify the number of time bins for the simulation.
-    - **Max Counts per Bin**: Specify the maximum counts per bin.
+    - **Max Counts per Bin**: Specify the maximum counts per bin, reached at the peak of the light curve shape.
     - **Delta Time (dt)**: Specify the delta time for the light curve.
-    - **Method**: Choose between "Standard Method" and "Inverse CDF Method" for simulating event lists.
+    - **Light Curve Shape**: The model light curve: random counts per bin, flat, sinusoidal, a Gaussian flare or an exponential decay.
+    - **Method**: Choose between "Standard Method" (the model counts, with every event at its bin centre) and "Inverse CDF Method" (a Poisson realisation of the model, with events spread uniformly within each bin).
+    - **Seed (optional)**: Seed of the random generator. The seed of every run is shown in the output; entering it again reproduces the same event list.
     - **Simulated Event List Name**: Specify a name for the simulated event list.
-    - **Simulate Event List**: Simulate an event list using the specified parameters.
+    - **Simulate Event List**: Simulate an event list using the specified parameters. The simulation runs in the background, in chunks, with a progress bar, so that lists of up to 1e8 events do not block the application.
 
     ### Precautions
     - Ensure that photon arrival times and MJDREF are provided when creating an event list.
@@ -759,11 +1122,6 @@ def create_data_ingestion_tabs():
     return tabs
 
 
-# Example usage in your main script (e.g., app.py)
-layout = pn.Column(create_data_ingestion_tabs())
-
-# Serve the layout
-layout.servable()
-
 if __name__ == "__main__":
-    pn.serve(layout)
+    # Standalone use; app.py builds the tabs on demand from the sidebar
+    pn.serve(pn.Column(create_data_ingestion_tabs()))
@@ -0,0 +1,42 @@
+import numpy as np
+
+# Default number of horizontal pixel buckets a decimated plot is reduced to
+DEFAULT_PIXELS = 1000
+
+
+def minmax_decimate(x, y, n_buckets=DEFAULT_PIXELS):
+    # Keep the minimum and the maximum of each of n_buckets equal slices of the
+    # data. For a plot n_buckets pixels wide this draws the same envelope as the
+    # full series, with at most 2 * n_buckets points. x must be sorted.
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return x, y
+
+    bucket_size = n // n_buckets
+    n_main = bucket_size * n_buckets
+    blocks = y[:n_main].reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+
+    index = [
+        offsets + np.argmin(blocks, axis=1),
+        offsets + np.argmax(blocks, axis=1),
+        # The end points keep the full x extent
+        [0, n - 1],
+    ]
+    if n_main < n:
+        # Leftover points at the end are folded into one extra bucket
+        tail = y[n_main:]
+        index.append([n_main + np.argmin(tail), n_main + np.argmax(tail)])
+    index = np.unique(np.concatenate(index))
+    return x[index], y[index]
+
+
+def slice_range(x, x_range):
+    # Index bounds of the sorted x that cover x_range, widened by one point on
+    # each side so that lines run to the plot edges
+    if x_range is None:
+        return 0, len(x)
+    start, stop = np.searchsorted(x, x_range)
+    return max(start - 1, 0), min(stop + 1, len(x))
@@ -0,0 +1,143 @@
+import numpy as np
+from stingray.fourier import normalize_periodograms
+from .computePipeline import check_cancelled
+from .powerSpectrum import SEGMENT_BATCH
+
+# Bins of one batch of segments. Bounds the temporary counts and complex FFT
+# arrays whatever the segment length and dt.
+BATCH_BINS = 2**22
+# Shape bounds of the spectrogram; finer ones are averaged down while streaming
+MAX_FREQ_BINS = 2048
+MAX_TIME_BINS = 4096
+
+
+def segment_starts(gti, tstart, tstop, segment_size):
+    # Start time of every segment lying fully inside a GTI
+    if gti is None or not len(gti):
+        gti = np.array([[tstart, tstop]])
+    gti = np.asarray(gti, dtype=np.float64)
+    n_segments = np.floor((gti[:, 1] - gti[:, 0]) / segment_size + 1e-9).astype(np.int64)
+    n_segments = np.maximum(n_segments, 0)
+    gti_of_segment = np.repeat(np.arange(len(gti)), n_segments)
+    rank_in_gti = np.arange(n_segments.sum()) - np.repeat(
+        np.cumsum(n_segments) - n_segments, n_segments
+    )
+    return gti[gti_of_segment, 0] + rank_in_gti * segment_size
+
+
+def _bin_segments(times, starts, segment_size, dt, n_bin):
+    # (len(starts), n_bin) counts of a batch of consecutive segments, from the
+    # contiguous run of sorted events they cover, in one bincount
+    first = np.searchsorted(times, starts[0], side="left")
+    last = np.searchsorted(times, starts[-1] + segment_size, side="left")
+    batch_times = np.asarray(times[first:last], dtype=np.float64)
+    segment = np.searchsorted(starts, batch_times, side="right") - 1
+    bin_index = np.floor((batch_times - starts[segment]) / dt).astype(np.int64)
+    inside = bin_index < n_bin
+    combined = segment[inside] * n_bin + bin_index[inside]
+    counts = np.bincount(combined, minlength=len(starts) * n_bin)
+    return counts.reshape(len(starts), n_bin).astype(np.float64)
+
+
+def dynamical_power_spectrum(
+    times,
+    gti,
+    segment_size,
+    dt,
+    norm="leahy",
+    max_freq_bins=MAX_FREQ_BINS,
+    max_time_bins=MAX_TIME_BINS,
+    progress=None,
+    cancel_event=None,
+):
+    """Power spectra of consecutive segments of a sorted event list.
+
+    Segments are binned and transformed in batches, one FFT call per batch,
+    and their powers written into a preallocated (time, frequency) array.
+    Adjacent frequencies, and adjacent segments, are averaged down so that
+    the array never exceeds max_time_bins x max_freq_bins, whatever the
+    observation length and time resolution. As in stingray's
+    DynamicalPowerspectrum, every segment is normalized with the mean count
+    rate of all segments; the normalization being linear, it is applied once
+    to the accumulated powers.
+    """
+    n_bin = int(round(segment_size / dt))
+    if n_bin < 2:
+        raise ValueError("The segment size must span at least two time bins.")
+    starts = segment_starts(gti, times[0], times[-1], segment_size)
+    if not len(starts):
+        raise ValueError("No GTI is long enough for a single segment.")
+
+    # Positive frequencies only, as in stingray: the Nyquist bin is left out
+    n_freq = (n_bin - 1) // 2
+    freq_factor = int(np.ceil(n_freq / max_freq_bins))
+    n_freq_out = n_freq // freq_factor
+    freq = np.fft.rfftfreq(n_bin, dt)[1 : 1 + n_freq_out * freq_factor]
+    freq = freq.reshape(n_freq_out, freq_factor).mean(axis=1)
+
+    n_segments = len(starts)
+    time_factor = int(np.ceil(n_segments / max_time_bins))
+    n_rows = int(np.ceil(n_segments / time_factor))
+    power = np.zeros((n_rows, n_freq_out))
+    segments_per_row = np.bincount(np.arange(n_segments) // time_factor, minlength=n_rows)
+
+    batch = max(1, min(SEGMENT_BATCH, BATCH_BINS // n_bin))
+    n_ph = 0.0
+    for i in range(0, n_segments, batch):
+        check_cancelled(cancel_event)
+        batch_starts = starts[i : i + batch]
+        counts = _bin_segments(times, batch_starts, segment_size, dt, n_bin)
+        ft = np.fft.rfft(counts, axis=1)[:, 1 : 1 + n_freq_out * freq_factor]
+        segment_power = ft.real**2 + ft.imag**2
+        del ft
+        n_ph += counts.sum()
+        segment_power = segment_power.reshape(-1, n_freq_out, freq_factor).mean(axis=2)
+
+        rows = np.arange(i, i + len(batch_starts)) // time_factor
+        row_ids, row_first = np.unique(rows, return_index=True)
+        power[row_ids] += np.add.reduceat(segment_power, row_first, axis=0)
+        if progress is not None:
+            progress(min(i + batch, n_segments) / n_segments)
+
+    power /= segments_per_row[:, None]
+    n_ph /= n_segments
+    with np.errstate(divide="ignore", invalid="ignore"):
+        power = normalize_periodograms(
+            power,
+            dt,
+            n_bin,
+            mean_flux=n_ph / n_bin,
+            n_ph=n_ph,
+            norm=norm,
+            power_type="all",
+        )
+    # Without any event there is no normalized power
+    power = np.nan_to_num(np.real(power))
+    segment_mid = starts + segment_size / 2
+    time = np.bincount(
+        np.arange(n_segments) // time_factor, weights=segment_mid, minlength=n_rows
+    ) / segments_per_row
+    return {
+        "time": time,
+        "freq": freq,
+        "power": power,
+        "n_segments": n_segments,
+        "n_bin": n_bin,
+        "segments_per_row": time_factor,
+        "freqs_per_column": freq_factor,
+    }
+
+
+def downsample_image(power, max_rows, max_cols):
+    # Block means down to at most max_rows x max_cols, so that the browser only
+    # receives about one value per pixel
+    row_factor = int(np.ceil(power.shape[0] / max_rows))
+    col_factor = int(np.ceil(power.shape[1] / max_cols))
+    n_rows = power.shape[0] // row_factor
+    n_cols = power.shape[1] // col_factor
+    trimmed = power[: n_rows * row_factor, : n_cols * col_factor]
+    return (
+        trimmed.reshape(n_rows, row_factor, n_cols, col_factor).mean(axis=(1, 3)),
+        row_factor,
+        col_factor,
+    )
@@ -0,0 +1,114 @@
+import numpy as np
+from stingray import Lightcurve
+
+# Events binned per chunk, bounding the temporary index arrays of a pass
+CHUNK_EVENTS = 4_000_000
+
+
+class EnergyIndex:
+    """Energies of one event list in sorted order, with the permutation that
+    sorts them.
+
+    Built once per list; the events of any band are then a contiguous run of
+    the permutation, found with two binary searches, so changing bands never
+    compares every energy against every band.
+    """
+
+    def __init__(self, energy):
+        energy = np.asarray(energy)
+        self.order = np.argsort(energy, kind="stable")
+        self.sorted_energy = energy[self.order]
+
+    def band_labels(self, bands):
+        # Band number of each event (in event order), or -1 outside every band.
+        # Bands are [emin, emax), as in bin_event_list
+        labels_sorted = np.full(len(self.order), -1, dtype=np.int16)
+        starts = np.searchsorted(self.sorted_energy, bands[:, 0], side="left")
+        stops = np.searchsorted(self.sorted_energy, bands[:, 1], side="left")
+        for band, (start, stop) in enumerate(zip(starts, stops)):
+            labels_sorted[start:stop] = band
+        labels = np.empty_like(labels_sorted)
+        labels[self.order] = labels_sorted
+        return labels
+
+
+def check_bands(bands):
+    bands = np.asarray(bands, dtype=np.float64).reshape(-1, 2)
+    if not len(bands):
+        raise ValueError("Enter at least one energy band.")
+    if np.any(bands[:, 1] <= bands[:, 0]):
+        raise ValueError("Each energy band needs a lower bound below its upper bound.")
+    ordered = bands[np.argsort(bands[:, 0])]
+    if np.any(ordered[1:, 0] < ordered[:-1, 1]):
+        raise ValueError("Energy bands must not overlap.")
+    return bands
+
+
+def time_grid(event_list, dt):
+    # (tstart, number of bins) as chosen by Lightcurve.make_lightcurve, so that
+    # band light curves line up with the ones binned from all events
+    gti = event_list.gti
+    time = event_list.time
+    if gti is not None and len(gti):
+        tstart, tstop = float(np.min(gti)), float(np.max(gti))
+    else:
+        tstart, tstop = float(np.min(time)), float(np.max(time))
+    n_bins = int((tstop - tstart) / dt)
+    if (tstop - tstart) / dt - n_bins >= 0.99:
+        n_bins += 1
+    return tstart, max(n_bins, 1)
+
+
+def multiband_counts(times, labels, n_bands, dt, tstart, n_bins, chunk_events=CHUNK_EVENTS):
+    """Counts per (time bin, band), shape (n_bins, n_bands), in one pass.
+
+    Each event gets the combined index time_bin * n_bands + band, and a single
+    bincount over it fills every band at once.
+    """
+    counts = np.zeros(n_bins * n_bands, dtype=np.int64)
+    for start in range(0, len(times), chunk_events):
+        stop = start + chunk_events
+        bin_index = np.floor((times[start:stop] - tstart) / dt).astype(np.int64)
+        chunk_labels = labels[start:stop]
+        good = (chunk_labels >= 0) & (bin_index >= 0) & (bin_index < n_bins)
+        combined = bin_index[good] * n_bands + chunk_labels[good]
+        counts += np.bincount(combined, minlength=n_bins * n_bands)
+    return counts.reshape(n_bins, n_bands)
+
+
+def band_lightcurves(event_list, bands, dt, energy_index):
+    # One Lightcurve per band, all from the same pass over the events
+    if event_list.energy is None:
+        raise ValueError("This event list has no energy information.")
+    bands = check_bands(bands)
+    dt = event_list.suggest_compatible_dt(dt)
+    tstart, n_bins = time_grid(event_list, dt)
+    labels = energy_index.band_labels(bands)
+    counts = multiband_counts(event_list.time, labels, len(bands), dt, tstart, n_bins)
+    time = tstart + np.arange(0.5, 0.5 + n_bins) * dt
+    return [
+        Lightcurve(
+            time,
+            counts[:, band],
+            gti=event_list.gti,
+            mjdref=event_list.mjdref,
+            dt=dt,
+            skip_checks=True,
+            err_dist="poisson",
+        )
+        for band in range(len(bands))
+    ]
+
+
+def hardness_ratio(soft_counts, hard_counts):
+    # (H - S) / (H + S) and its Poisson error; NaN in bins with no counts
+    soft = np.asarray(soft_counts, dtype=np.float64)
+    hard = np.asarray(hard_counts, dtype=np.float64)
+    total = soft + hard
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (hard - soft) / total
+        error = 2 * np.sqrt(hard * soft * total) / total**2
+    empty = total == 0
+    ratio[empty] = np.nan
+    error[empty] = np.nan
+    return ratio, error
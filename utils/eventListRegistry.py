@@ -0,0 +1,155 @@
+import itertools
+import time
+import numpy as np
+
+
+def compute_event_list_metadata(event_list):
+    # Summary computed once at registration so that dropdowns and previews
+    # never need to touch the raw event arrays again
+    time = event_list.time
+    n_events = 0 if time is None else len(time)
+
+    if n_events:
+        tmin = float(np.min(time))
+        tmax = float(np.max(time))
+        is_sorted = bool(np.all(time[1:] >= time[:-1]))
+    else:
+        tmin = tmax = None
+        is_sorted = True
+
+    gti = event_list.gti
+    if gti is not None and len(gti):
+        gti = np.asarray(gti, dtype=float)
+        exposure = float(np.sum(gti[:, 1] - gti[:, 0]))
+        n_gti = len(gti)
+    elif n_events:
+        exposure = tmax - tmin
+        n_gti = 0
+    else:
+        exposure = 0.0
+        n_gti = 0
+
+    energy = getattr(event_list, "energy", None)
+    has_energy = energy is not None and len(energy) == n_events and n_events > 0
+    if has_energy:
+        energy_min = float(np.min(energy))
+        energy_max = float(np.max(energy))
+    else:
+        energy_min = energy_max = None
+
+    return {
+        "n_events": n_events,
+        "tmin": tmin,
+        "tmax": tmax,
+        "exposure": exposure,
+        "count_rate": n_events / exposure if exposure > 0 else None,
+        "n_gti": n_gti,
+        "has_energy": has_energy,
+        "energy_min": energy_min,
+        "energy_max": energy_max,
+        "is_sorted": is_sorted,
+        "mjdref": event_list.mjdref,
+    }
+
+
+class EventListEntry:
+    __slots__ = ("id", "name", "event_list", "metadata", "last_access", "__weakref__")
+
+    def __init__(self, entry_id, name, event_list, metadata):
+        self.id = entry_id
+        self.name = name
+        self.event_list = event_list
+        self.metadata = metadata
+        self.last_access = time.monotonic()
+
+    def __repr__(self):
+        return f"EventListEntry(id={self.id}, name={self.name!r})"
+
+
+class EventListRegistry:
+    """Name-keyed store of loaded event lists with stable integer IDs.
+
+    Lookups by name or ID are O(1); iteration follows insertion order. With an
+    array_pool, the arrays of every added event list are deduplicated against
+    those already held by other registries. With a memory_budget, lookups
+    record recency and additions may spill the least recently used lists.
+    """
+
+    def __init__(self, array_pool=None, memory_budget=None, executor=None):
+        self.array_pool = array_pool
+        self.memory_budget = memory_budget
+        self.executor = executor
+        self._by_name = {}
+        self._by_id = {}
+        self._ids = itertools.count()
+        if memory_budget is not None:
+            memory_budget.track(self)
+
+    def add(self, name, event_list):
+        if name in self._by_name:
+            raise ValueError(f"A file with the name '{name}' already exists in memory.")
+
+        if self.array_pool is not None:
+            self.array_pool.intern_event_list(event_list)
+        entry = EventListEntry(
+            next(self._ids), name, event_list, compute_event_list_metadata(event_list)
+        )
+        self._by_name[name] = entry
+        self._by_id[entry.id] = entry
+        if self.memory_budget is not None:
+            self.memory_budget.request_enforce(self.executor)
+        return entry
+
+    def remove(self, name):
+        entry = self._by_name.pop(name)
+        del self._by_id[entry.id]
+        return entry
+
+    def get(self, name):
+        return self._touch(self._by_name.get(name))
+
+    def get_by_id(self, entry_id):
+        return self._touch(self._by_id.get(entry_id))
+
+    @staticmethod
+    def _touch(entry):
+        if entry is not None:
+            entry.last_access = time.monotonic()
+        return entry
+
+    def refresh_metadata(self, name):
+        entry = self._by_name[name]
+        entry.metadata = compute_event_list_metadata(entry.event_list)
+        return entry
+
+    def names(self):
+        return list(self._by_name)
+
+    def items(self):
+        # (name, event_list) pairs, as the old list of tuples provided
+        return [(entry.name, entry.event_list) for entry in self._by_name.values()]
+
+    def summary_rows(self):
+        # One row of precomputed metadata per list, for tables and previews
+        return [
+            {"name": entry.name, **entry.metadata} for entry in self._by_name.values()
+        ]
+
+    def dropdown_options(self):
+        return {name: entry.id for name, entry in self._by_name.items()}
+
+    def clear(self):
+        self._by_name.clear()
+        self._by_id.clear()
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __iter__(self):
+        return iter(list(self._by_name.values()))
+
+    def __bool__(self):
+        return bool(self._by_name)
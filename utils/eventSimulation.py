@@ -0,0 +1,85 @@
+import numpy as np
+from .computePipeline import check_cancelled
+
+SHAPES = ("Random", "Flat", "Sinusoidal", "Gaussian flare", "Exponential decay")
+METHODS = ("Standard Method", "Inverse CDF Method")
+
+# Events generated per step; bounds the temporaries next to the output array
+CHUNK_EVENTS = 4_000_000
+
+
+def light_curve_shape(shape, n_bins, max_counts, rng):
+    # Model counts per bin, peaking at max_counts
+    phase = np.linspace(0, 1, n_bins, endpoint=False)
+    if shape == "Random":
+        # What the simulation always did, now drawn from the seeded generator
+        return np.floor(rng.random(n_bins) * max_counts)
+    if shape == "Flat":
+        profile = np.ones(n_bins)
+    elif shape == "Sinusoidal":
+        profile = 0.5 * (1 + np.sin(2 * np.pi * 4 * phase))
+    elif shape == "Gaussian flare":
+        profile = 0.1 + 0.9 * np.exp(-0.5 * ((phase - 0.5) / 0.05) ** 2)
+    elif shape == "Exponential decay":
+        profile = np.exp(-phase / 0.2)
+    else:
+        raise ValueError(f"Unknown light curve shape '{shape}'.")
+    return profile * max_counts
+
+
+def draw_bin_counts(model_counts, method, rng):
+    # Standard: the model counts themselves, as EventList.from_lc does.
+    # Inverse CDF: a Poisson realisation of them, as simulate_times does.
+    if method == "Standard Method":
+        return np.rint(np.clip(model_counts, 0, None)).astype(np.int64)
+    return rng.poisson(np.clip(model_counts, 0, None)).astype(np.int64)
+
+
+def simulate_event_times(
+    model_counts,
+    dt,
+    method="Inverse CDF Method",
+    seed=None,
+    tstart=0.0,
+    progress=None,
+    cancel_event=None,
+    chunk_events=CHUNK_EVENTS,
+):
+    """Sorted photon arrival times following a binned light-curve model.
+
+    The times are written chunk by chunk into a single preallocated array, so
+    memory stays at the size of the result plus one chunk. With the same seed
+    the result is identical whatever the chunk size.
+    """
+    rng = np.random.default_rng(seed)
+    counts = draw_bin_counts(model_counts, method, rng)
+    n_events = int(counts.sum())
+    times = np.empty(n_events, dtype=np.float64)
+
+    # Bin boundaries of the chunks, each holding about chunk_events events
+    bounds = np.cumsum(counts)
+    cuts = np.searchsorted(bounds, np.arange(chunk_events, n_events, chunk_events))
+    bin_edges = np.unique(np.concatenate([[0], cuts + 1, [len(counts)]]))
+
+    written = 0
+    for first, last in zip(bin_edges[:-1], bin_edges[1:]):
+        check_cancelled(cancel_event)
+        chunk_counts = counts[first:last]
+        n = int(chunk_counts.sum())
+        out = times[written : written + n]
+        bin_starts = tstart + np.arange(first, last) * dt
+        if method == "Standard Method":
+            # Every event of a bin at the bin centre
+            out[:] = np.repeat(bin_starts + dt / 2, chunk_counts)
+        else:
+            rng.random(out=out)
+            out *= dt
+            out += np.repeat(bin_starts, chunk_counts)
+            # Bins do not overlap, so sorting the chunk sorts it globally
+            out.sort()
+        written += n
+        if progress is not None:
+            progress(written / max(n_events, 1))
+
+    gti = np.array([[tstart, tstart + len(counts) * dt]])
+    return times, gti
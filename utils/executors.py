@@ -0,0 +1,44 @@
+import os
+import warnings
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Shared worker pools. They are created lazily so that importing this module
+# stays cheap, and they live for the lifetime of the server process.
+_process_pool = None
+_thread_pool = None
+
+
+def get_process_pool():
+    global _process_pool
+    # A worker that dies (e.g. OOM-killed) leaves the pool unusable, start afresh
+    if _process_pool is None or getattr(_process_pool, "_broken", False):
+        # Forking a threaded Bokeh server is unsafe, so workers are spawned
+        _process_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def get_thread_pool():
+    # For work that needs the server's in-memory objects (event lists, caches),
+    # which would be too costly to pickle across to a process
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 1, thread_name_prefix="stingray-explorer"
+        )
+    return _thread_pool
+
+
+def run_with_warnings(func, *args, **kwargs):
+    # Warnings raised inside a worker process never reach the server's warning
+    # handler, so record them here and ship them back alongside the result
+    with warnings.catch_warnings(record=True) as caught:
+        result = func(*args, **kwargs)
+
+    caught_warnings = [
+        (str(w.message), w.category, w.filename, w.lineno) for w in caught
+    ]
+    return result, caught_warnings
@@ -1 +1,81 @@
-loaded_event_data = []
+import os
+import weakref
+import panel as pn
+from .eventListRegistry import EventListRegistry
+from .lightCurveCache import LightCurveCache, EventListResultCache
+from .binningPyramid import BinningPyramidStore
+from .sharedArrayPool import SharedArrayPool
+from .memoryBudget import MemoryBudget, budget_from_environment
+from .ingestionCache import default_cache_root
+from .executors import get_thread_pool
+
+# Read-only event arrays shared by all sessions, deduplicated by content, so
+# that N sessions loading the same observation hold one copy of its data
+shared_array_pool = SharedArrayPool()
+
+# Upper bound on the memory held by loaded event lists of all sessions; the
+# least recently used lists beyond it are spilled to disk
+memory_budget = MemoryBudget(
+    budget_from_environment(),
+    os.path.join(default_cache_root(), "spill"),
+    array_pool=shared_array_pool,
+)
+
+# Multi-resolution counts of each event list, so that changing dt rebins
+# existing bins instead of the raw events
+binning_pyramids = BinningPyramidStore()
+memory_budget.track_cache(binning_pyramids)
+
+# Light curves binned from loaded event lists, shared by every view that bins
+lightcurve_cache = LightCurveCache(pyramids=binning_pyramids)
+
+# Averaged (unnormalized) power spectra, keyed by event list, dt and segment size
+power_spectrum_cache = EventListResultCache(max_bytes=256 * 1024**2)
+
+# Sorted energy index of each event list, built once and reused whenever the
+# energy bands change
+energy_index_cache = EventListResultCache(max_bytes=512 * 1024**2)
+
+# Boolean GTI masks, keyed by event list and GTI set
+gti_mask_cache = EventListResultCache(max_bytes=256 * 1024**2)
+
+
+def _new_session_store():
+    return {
+        "loaded_event_data": EventListRegistry(
+            array_pool=shared_array_pool,
+            memory_budget=memory_budget,
+            executor=get_thread_pool(),
+        ),
+        # Binned products (light curve, GTIs, energy histogram) of files
+        # ingested with the streaming reader, keyed by name
+        "streamed_products": {},
+    }
+
+
+# Per-session stores, keyed by the session's Bokeh Document. Outside of a
+# server session (scripts, notebooks) a single default store is used.
+_session_stores = weakref.WeakKeyDictionary()
+_default_store = _new_session_store()
+
+
+def _session_store():
+    doc = pn.state.curdoc
+    if doc is None:
+        return _default_store
+
+    store = _session_stores.get(doc)
+    if store is None:
+        store = _session_stores[doc] = _new_session_store()
+        doc.on_session_destroyed(lambda session_context: _session_stores.pop(doc, None))
+    return store
+
+
+def session_event_data():
+    # Must be called on the event loop (in a callback or while building a
+    # view), where Panel knows the current session; not from worker threads
+    return _session_store()["loaded_event_data"]
+
+
+def session_streamed_products():
+    return _session_store()["streamed_products"]
@@ -0,0 +1,107 @@
+import hashlib
+import numpy as np
+
+
+def normalize_gti(gti):
+    # Sorted, non-overlapping (n, 2) intervals; overlapping or touching
+    # intervals are merged, and empty ones dropped
+    gti = np.asarray(gti, dtype=np.float64).reshape(-1, 2)
+    gti = gti[gti[:, 1] > gti[:, 0]]
+    if len(gti) < 2:
+        return gti
+    gti = gti[np.argsort(gti[:, 0], kind="stable")]
+    # An interval starts a new group unless it begins before every earlier one ends
+    running_stop = np.maximum.accumulate(gti[:, 1])
+    new_group = np.concatenate([[True], gti[1:, 0] > running_stop[:-1]])
+    group_starts = np.flatnonzero(new_group)
+    group_stops = np.concatenate([group_starts[1:], [len(gti)]]) - 1
+    return np.column_stack([gti[group_starts, 0], running_stop[group_stops]])
+
+
+def gti_key(gti):
+    # Compact, hashable identity of a GTI set, for cache keys
+    gti = np.ascontiguousarray(gti, dtype=np.float64)
+    return (len(gti), hashlib.blake2b(gti.tobytes(), digest_size=16).hexdigest())
+
+
+def gti_exposure(gti):
+    return float(np.sum(gti[:, 1] - gti[:, 0])) if len(gti) else 0.0
+
+
+def gti_event_ranges(times, gti):
+    # [first, last) indices of the events of each GTI, for sorted times: two
+    # binary searches per interval, whatever the number of events
+    first = np.searchsorted(times, gti[:, 0], side="left")
+    last = np.searchsorted(times, gti[:, 1], side="right")
+    return first, last
+
+
+def gti_mask(times, gti, assume_sorted=None):
+    """Boolean mask of the events inside any interval of a normalized GTI set.
+
+    For sorted times the intervals are located with searchsorted and the mask
+    is filled from their index ranges; otherwise each event is looked up among
+    the interval starts. Neither way loops over events or intervals in Python.
+    """
+    times = np.asarray(times)
+    n_events = len(times)
+    if not len(gti) or not n_events:
+        return np.zeros(n_events, dtype=bool)
+    if assume_sorted is None:
+        assume_sorted = bool(np.all(times[1:] >= times[:-1]))
+
+    if assume_sorted:
+        first, last = gti_event_ranges(times, gti)
+        # +1 where a range opens and -1 where it closes; the running sum is
+        # positive inside a range
+        delta = np.bincount(first, minlength=n_events + 1) - np.bincount(
+            last, minlength=n_events + 1
+        )
+        return np.cumsum(delta[:n_events]) > 0
+
+    index = np.searchsorted(gti[:, 0], times, side="right") - 1
+    return (index >= 0) & (times <= gti[np.maximum(index, 0), 1])
+
+
+def intersect_gti(gti_a, gti_b):
+    # Intervals covered by both normalized sets: a sweep over all edges, where
+    # coverage reaches two
+    if not len(gti_a) or not len(gti_b):
+        return np.empty((0, 2))
+    edges = np.concatenate([gti_a.ravel(), gti_b.ravel()])
+    steps = np.tile([1, -1], len(gti_a) + len(gti_b))
+    # At equal times closings come first, so touching intervals do not overlap
+    order = np.lexsort((steps, edges))
+    coverage = np.cumsum(steps[order])
+    edges = edges[order]
+    opens = np.flatnonzero(coverage == 2)
+    gti = np.column_stack([edges[opens], edges[opens + 1]])
+    return gti[gti[:, 1] > gti[:, 0]]
+
+
+def gti_from_threshold(
+    counts, dt, tstart, min_rate=None, max_rate=None, min_length=0.0, min_gap=0.0
+):
+    """GTIs where the count rate of a binned light curve stays within limits.
+
+    Runs of good bins are found from the edges of the boolean selection, gaps
+    shorter than min_gap are bridged and intervals shorter than min_length
+    dropped, all as array operations over the bins.
+    """
+    rate = np.asarray(counts, dtype=np.float64) / dt
+    good = np.ones(len(rate), dtype=bool)
+    if min_rate is not None:
+        good &= rate >= min_rate
+    if max_rate is not None:
+        good &= rate <= max_rate
+
+    change = np.diff(np.concatenate([[0], good.view(np.int8), [0]]))
+    starts = np.flatnonzero(change == 1)
+    stops = np.flatnonzero(change == -1)
+    if min_gap > 0 and len(starts) > 1:
+        keep = (starts[1:] - stops[:-1]) * dt >= min_gap
+        starts = starts[np.concatenate([[True], keep])]
+        stops = stops[np.concatenate([keep, [True]])]
+
+    gti = np.column_stack([tstart + starts * dt, tstart + stops * dt])
+    return gti[gti[:, 1] - gti[:, 0] >= min_length]
@@ -0,0 +1,210 @@
+import hashlib
+import os
+import pickle
+import shutil
+import threading
+import uuid
+import numpy as np
+from stingray.events import EventList
+
+# Bump when the on-disk layout changes, so that old entries are ignored
+CACHE_VERSION = 1
+HASH_BLOCK_SIZE = 4 * 1024**2
+META_FILE = "meta.pkl"
+
+CACHE_DIR_ENV_VAR = "STINGRAY_EXPLORER_CACHE_DIR"
+CACHE_SIZE_ENV_VAR = "STINGRAY_EXPLORER_INGESTION_CACHE_MB"
+DEFAULT_MAX_CACHE_BYTES = 4 * 1024**3
+
+
+def default_cache_root():
+    # Outside the working directory, so that the file selector never lists the
+    # cache and spill files
+    root = os.environ.get(CACHE_DIR_ENV_VAR)
+    if not root:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        root = os.path.join(base, "stingray-explorer")
+    return root
+
+
+def max_cache_bytes_from_environment(default=DEFAULT_MAX_CACHE_BYTES):
+    value = os.environ.get(CACHE_SIZE_ENV_VAR)
+    if not value:
+        return default
+    return int(float(value) * 1024**2)
+
+# Content hashes of files already seen by this server, keyed by
+# (path, size, mtime), so unchanged files are not re-read just to be hashed
+_content_hashes = {}
+_content_hashes_lock = threading.Lock()
+
+
+def file_content_hash(file_path):
+    stat = os.stat(file_path)
+    index_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    with _content_hashes_lock:
+        content_hash = _content_hashes.get(index_key)
+    if content_hash is None:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        content_hash = digest.hexdigest()
+        with _content_hashes_lock:
+            _content_hashes[index_key] = content_hash
+    return content_hash
+
+
+def cache_key(file_path, file_format):
+    # Same bytes read with the same options always give the same event list
+    options = f"v{CACHE_VERSION}|{file_format}"
+    return hashlib.sha256(
+        f"{file_content_hash(file_path)}|{options}".encode()
+    ).hexdigest()
+
+
+def _entry_dir(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key)
+
+
+def store_event_list(cache_dir, key, event_list):
+    # Each array column becomes one .npy file; the small meta attributes are
+    # pickled. The entry is built in a temporary directory and renamed into
+    # place, so a partially written entry is never visible.
+    entry_dir = _entry_dir(cache_dir, key)
+    if os.path.isdir(entry_dir):
+        return entry_dir
+
+    parent = os.path.dirname(entry_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = os.path.join(parent, f".{key}.{uuid.uuid4().hex}.tmp")
+    os.makedirs(tmp_dir)
+    try:
+        array_names = [event_list.main_array_attr]
+        array_names += event_list.array_attrs() + event_list.internal_array_attrs()
+        arrays = {}
+        for name in array_names:
+            value = getattr(event_list, name, None)
+            if value is not None:
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(value))
+                arrays[name] = True
+
+        meta = {}
+        for name in event_list.meta_attrs():
+            value = getattr(event_list, name, None)
+            if isinstance(value, np.ndarray):
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), value)
+                arrays[name] = True
+            else:
+                meta[name] = value
+
+        with open(os.path.join(tmp_dir, META_FILE), "wb") as f:
+            pickle.dump({"arrays": list(arrays), "meta": meta}, f)
+
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another worker stored the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return entry_dir
+
+
+def load_event_list(cache_dir, key):
+    # Returns None on a miss. Columns are memory-mapped copy-on-write: nothing
+    # is read until used, and in-place edits never reach the cache files.
+    entry_dir = _entry_dir(cache_dir, key)
+    meta_path = os.path.join(entry_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path, "rb") as f:
+        contents = pickle.load(f)
+    try:
+        # The modification time of the meta file orders entries for eviction
+        os.utime(meta_path)
+    except OSError:
+        pass
+
+    event_list = EventList()
+    main = event_list.main_array_attr
+    # The main array must be set before the others, as in from_astropy_table
+    for name in sorted(contents["arrays"], key=lambda name: name != main):
+        setattr(
+            event_list,
+            name,
+            np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode="c"),
+        )
+    for name, value in contents["meta"].items():
+        attribute = getattr(EventList, name, None)
+        if isinstance(attribute, property) and attribute.fset is None:
+            continue
+        setattr(event_list, name, value)
+    return event_list
+
+
+def _entries(cache_dir):
+    # (last use, size in bytes, directory) of every complete entry
+    entries = []
+    for prefix in os.listdir(cache_dir):
+        prefix_dir = os.path.join(cache_dir, prefix)
+        if not os.path.isdir(prefix_dir):
+            continue
+        for name in os.listdir(prefix_dir):
+            entry_dir = os.path.join(prefix_dir, name)
+            try:
+                last_use = os.stat(os.path.join(entry_dir, META_FILE)).st_mtime
+                size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+            except OSError:
+                # Temporary directories, or entries being removed
+                continue
+            entries.append((last_use, size, entry_dir))
+    return entries
+
+
+def prune_cache(cache_dir, max_bytes, keep=None):
+    # Removes least recently used entries until the cache fits in max_bytes.
+    # Lists memory-mapped from a removed entry keep reading it, as open memory
+    # maps survive the removal of their files.
+    if not os.path.isdir(cache_dir):
+        return 0
+    entries = sorted(_entries(cache_dir))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    keep_dir = None if keep is None else _entry_dir(cache_dir, keep)
+    for _, size, entry_dir in entries:
+        if total <= max_bytes:
+            break
+        if entry_dir == keep_dir:
+            continue
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def read_and_cache_event_list(cache_dir, key, file_path, file_format, max_bytes=None):
+    # The normal parsing path, used on a miss; may run in a worker process
+    event_list = EventList.read(file_path, file_format)
+    try:
+        store_event_list(cache_dir, key, event_list)
+        if max_bytes is not None:
+            prune_cache(cache_dir, max_bytes, keep=key)
+    except OSError:
+        # A full or read-only disk must not make the load itself fail
+        pass
+    return event_list
+
+
+def read_event_list_cached(cache_dir, file_path, file_format, max_bytes=None):
+    key = cache_key(file_path, file_format)
+    event_list = load_event_list(cache_dir, key)
+    if event_list is None:
+        event_list = read_and_cache_event_list(
+            cache_dir, key, file_path, file_format, max_bytes
+        )
+    return event_list
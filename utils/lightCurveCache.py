@@ -0,0 +1,168 @@
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+from stingray import Lightcurve
+
+# Default upper bound on the memory held by a cache
+DEFAULT_MAX_BYTES = 512 * 1024**2
+
+
+def bin_event_list(event_list, dt, gti=None, energy_band=None):
+    time = event_list.time
+    if energy_band is not None:
+        if event_list.energy is None:
+            raise ValueError("This event list has no energy information.")
+        emin, emax = energy_band
+        time = time[(event_list.energy >= emin) & (event_list.energy < emax)]
+
+    if gti is None:
+        gti = event_list.gti
+
+    dt = event_list.suggest_compatible_dt(dt)
+    return Lightcurve.make_lightcurve(time, dt, gti=gti, mjdref=event_list.mjdref)
+
+
+def result_nbytes(result):
+    # Memory held by the arrays of a cached result: an array, a container of
+    # arrays, or an object (e.g. a Lightcurve) with array attributes
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, dict):
+        return sum(result_nbytes(value) for value in result.values())
+    if isinstance(result, (list, tuple)):
+        return sum(result_nbytes(value) for value in result)
+    if hasattr(result, "__dict__"):
+        return sum(
+            value.nbytes
+            for value in vars(result).values()
+            if isinstance(value, np.ndarray)
+        )
+    return 0
+
+
+def _gti_key(gti):
+    if gti is None:
+        return None
+    gti = np.asarray(gti, dtype=np.float64)
+    return (gti.shape, gti.tobytes())
+
+
+class EventListResultCache:
+    """Byte-bounded LRU cache of results computed from event lists.
+
+    Keys start with the identity of the event list they were computed from,
+    and all entries of an event list are dropped once it is garbage collected.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._watched = set()
+        self._lock = threading.Lock()
+
+    def _watch(self, event_list):
+        # id() values are reused after garbage collection, so forget every entry
+        # of an event list as soon as it goes away
+        list_id = id(event_list)
+        if list_id not in self._watched:
+            self._watched.add(list_id)
+            weakref.finalize(event_list, self.invalidate_id, list_id)
+
+    def get_or_compute(self, event_list, key, compute):
+        key = (id(event_list),) + tuple(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        result = compute()
+        self.put(key, result, event_list)
+        return result
+
+    def put(self, key, result, event_list):
+        nbytes = result_nbytes(result)
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            self._watch(event_list)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (result, nbytes)
+            self.current_bytes += nbytes
+
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+
+    def invalidate(self, event_list):
+        self.invalidate_id(id(event_list))
+
+    def invalidate_id(self, list_id):
+        with self._lock:
+            self._watched.discard(list_id)
+            for key in [key for key in self._entries if key[0] == list_id]:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class LightCurveCache(EventListResultCache):
+    """Byte-bounded LRU cache of light curves binned from event lists.
+
+    Entries are keyed by (event list identity, dt, GTI, energy band). When a
+    BinningPyramidStore is given, plain light curves (no GTI or energy band
+    override) at a whole multiple of the pyramid's base dt are summed from it
+    instead of histogramming every event; they equal the output of to_lc.
+    from_events=True always bins the events, e.g. for spectral products.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, pyramids=None):
+        super().__init__(max_bytes)
+        self.pyramids = pyramids
+
+    def get(self, event_list, dt, gti=None, energy_band=None, from_events=False):
+        band = None if energy_band is None else tuple(map(float, energy_band))
+        use_pyramid = (
+            self.pyramids is not None
+            and not from_events
+            and gti is None
+            and energy_band is None
+        )
+        key = (float(dt), _gti_key(gti), band, use_pyramid)
+
+        def compute():
+            lc = None
+            if use_pyramid:
+                lc = self.pyramids.lightcurve(
+                    event_list, event_list.suggest_compatible_dt(dt)
+                )
+            if lc is None:
+                lc = bin_event_list(event_list, dt, gti=gti, energy_band=energy_band)
+            return lc
+
+        return self.get_or_compute(event_list, key, compute)
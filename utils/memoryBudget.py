@@ -0,0 +1,187 @@
+import collections
+import os
+import shutil
+import threading
+import time
+import uuid
+import weakref
+import numpy as np
+from .ingestionCache import store_event_list, load_event_list, _entry_dir
+
+DEFAULT_BUDGET_BYTES = 2 * 1024**3
+BUDGET_ENV_VAR = "STINGRAY_EXPLORER_MEMORY_BUDGET_MB"
+
+
+def budget_from_environment(default=DEFAULT_BUDGET_BYTES):
+    value = os.environ.get(BUDGET_ENV_VAR)
+    if not value:
+        return default
+    return int(float(value) * 1024**2)
+
+
+def event_list_arrays(event_list):
+    names = [event_list.main_array_attr, "gti"]
+    names += event_list.array_attrs() + event_list.internal_array_attrs()
+    for name in names:
+        value = getattr(event_list, name, None)
+        if isinstance(value, np.ndarray):
+            yield value
+
+
+def _owns_memory(array):
+    # Views count through their base; memory maps are backed by files the OS
+    # can page out, so they are not part of the resident footprint
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return not isinstance(array, np.memmap), array
+
+
+def resident_arrays(event_list):
+    arrays = {}
+    for array in event_list_arrays(event_list):
+        owned, root = _owns_memory(array)
+        if owned:
+            arrays[id(root)] = root
+    return arrays
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MemoryBudget:
+    """Bounds the memory held by loaded event lists across all sessions.
+
+    When the resident footprint exceeds the budget, the least recently used
+    event lists are written to disk and replaced by memory-mapped copies, which
+    views keep reading transparently while the OS pages them in on demand.
+    """
+
+    def __init__(self, budget_bytes, spill_dir, array_pool=None):
+        self.budget_bytes = budget_bytes
+        self.root_spill_dir = spill_dir
+        # One directory per budget and process: worker processes import this
+        # module too, and must not touch the files the server is reading
+        self.spill_dir = os.path.join(
+            spill_dir, f"pid-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self._spill_dir_checked = False
+        self.array_pool = array_pool
+        self.spills = 0
+        self.spilled_bytes = 0
+        self.events = collections.deque(maxlen=20)
+        self._registries = weakref.WeakSet()
+        self._caches = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._pending = threading.Event()
+
+    def track(self, registry):
+        self._registries.add(registry)
+
+    def track_cache(self, cache):
+        # Derived data (e.g. binning pyramids) with an nbytes property and a
+        # clear() method; it counts towards the footprint and is dropped
+        # before any event list is spilled, as it can be rebuilt
+        self._caches.add(cache)
+
+    def _entries(self):
+        for registry in list(self._registries):
+            yield from registry
+
+    def footprint(self):
+        # Arrays shared between sessions through the pool are counted once
+        arrays = {}
+        for entry in self._entries():
+            arrays.update(resident_arrays(entry.event_list))
+        cache_bytes = sum(cache.nbytes for cache in list(self._caches))
+        return sum(array.nbytes for array in arrays.values()) + cache_bytes
+
+    def request_enforce(self, executor):
+        # Spilling writes whole event lists to disk, so it runs off the event
+        # loop; requests arriving while one is queued are coalesced
+        if executor is None:
+            self.enforce()
+        elif not self._pending.is_set():
+            self._pending.set()
+            executor.submit(self.enforce)
+
+    def enforce(self):
+        self._pending.clear()
+        with self._lock:
+            footprint = self.footprint()
+            if footprint <= self.budget_bytes:
+                return
+            for cache in list(self._caches):
+                cache.clear()
+            if self.footprint() <= self.budget_bytes:
+                return
+            candidates = sorted(
+                (entry for entry in self._entries() if resident_arrays(entry.event_list)),
+                key=lambda entry: entry.last_access,
+            )
+            for entry in candidates:
+                self._spill(entry)
+                # Arrays still shared with a resident list are not freed yet
+                if self.footprint() <= self.budget_bytes:
+                    break
+
+    def _remove_stale_spills(self):
+        # Lists spilled by server processes that are gone can never be reloaded
+        if self._spill_dir_checked:
+            return
+        self._spill_dir_checked = True
+        if not os.path.isdir(self.root_spill_dir):
+            return
+        for name in os.listdir(self.root_spill_dir):
+            parts = name.split("-")
+            pid = int(parts[1]) if len(parts) == 3 and parts[1].isdigit() else None
+            if pid is None or not _process_alive(pid):
+                shutil.rmtree(os.path.join(self.root_spill_dir, name), ignore_errors=True)
+
+    def _spill(self, entry):
+        self._remove_stale_spills()
+        event_list = entry.event_list
+        freed = sum(array.nbytes for array in resident_arrays(event_list).values())
+        key = uuid.uuid4().hex
+        store_event_list(self.spill_dir, key, event_list)
+        spilled = load_event_list(self.spill_dir, key)
+        if self.array_pool is not None:
+            self.array_pool.intern_event_list(spilled)
+        # Open memory maps survive the removal of their files, so the spill
+        # directory can go as soon as the event list itself is gone
+        weakref.finalize(spilled, shutil.rmtree, _entry_dir(self.spill_dir, key), True)
+
+        # Views holding the entry pick up the disk-backed copy on their next read
+        entry.event_list = spilled
+        self.spills += 1
+        self.spilled_bytes += freed
+        # Entries are referenced weakly: the history never keeps a list alive
+        self.events.append((time.time(), weakref.ref(entry), freed))
+
+    def stats(self, registry=None):
+        # Totals cover every session; the recent spills only list the entries
+        # of the given registry, so that sessions never see each other's names
+        entries = list(self._entries())
+        own = [] if registry is None else list(registry)
+        recent = []
+        for timestamp, entry_ref, freed in list(self.events):
+            entry = entry_ref()
+            if entry is not None and any(entry is own_entry for own_entry in own):
+                recent.append((timestamp, entry.name, freed))
+        return {
+            "budget_bytes": self.budget_bytes,
+            "footprint_bytes": self.footprint(),
+            "event_lists": len(entries),
+            "disk_backed_lists": sum(
+                1 for entry in entries if not resident_arrays(entry.event_list)
+            ),
+            "spills": self.spills,
+            "spilled_bytes": self.spilled_bytes,
+            "recent": recent,
+        }
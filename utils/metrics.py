@@ -0,0 +1,173 @@
+import asyncio
+import functools
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets; the last is +Inf
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+METRIC_PREFIX = "stingray_explorer"
+
+
+class LatencyHistogram:
+    __slots__ = ("bucket_counts", "count", "errors", "total", "max")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds, error=False):
+        index = len(LATENCY_BUCKETS)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                index = i
+                break
+        self.bucket_counts[index] += 1
+        self.count += 1
+        self.errors += bool(error)
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation, as precise as
+        # the buckets allow; the maximum stands in for the +Inf bucket
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS, self.bucket_counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class MetricsRegistry:
+    """Latency histograms and call counts of callback dispatch and compute stages.
+
+    Shared by every session of the server process; observations come from the
+    event loop and from worker threads alike.
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def observe(self, name, kind, seconds, error=False):
+        with self._lock:
+            histogram = self._histograms.get((kind, name))
+            if histogram is None:
+                histogram = self._histograms[(kind, name)] = LatencyHistogram()
+            histogram.observe(seconds, error)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def summary_rows(self):
+        with self._lock:
+            items = sorted(self._histograms.items())
+            return [
+                {
+                    "name": name,
+                    "kind": kind,
+                    "calls": histogram.count,
+                    "errors": histogram.errors,
+                    "mean_ms": 1e3 * histogram.total / histogram.count,
+                    "p50_ms": 1e3 * histogram.quantile(0.5),
+                    "p95_ms": 1e3 * histogram.quantile(0.95),
+                    "p99_ms": 1e3 * histogram.quantile(0.99),
+                    "max_ms": 1e3 * histogram.max,
+                }
+                for (kind, name), histogram in items
+            ]
+
+    def histogram_counts(self, name, kind):
+        # Non-cumulative counts per bucket, labelled by their upper bound
+        with self._lock:
+            histogram = self._histograms.get((kind, name))
+            counts = list(histogram.bucket_counts) if histogram else []
+        labels = [f"{bound:g}" for bound in LATENCY_BUCKETS] + ["+Inf"]
+        return list(zip(labels, counts))
+
+    def render_text(self):
+        # Prometheus text exposition format
+        latency = f"{METRIC_PREFIX}_latency_seconds"
+        errors = f"{METRIC_PREFIX}_errors_total"
+        lines = [
+            f"# HELP {latency} Latency of callback dispatch and compute stages.",
+            f"# TYPE {latency} histogram",
+        ]
+        with self._lock:
+            items = sorted(self._histograms.items())
+            for (kind, name), histogram in items:
+                labels = f'kind="{kind}",name="{_escape(name)}"'
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS, histogram.bucket_counts):
+                    cumulative += n
+                    lines.append(f'{latency}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+                lines.append(f'{latency}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{latency}_sum{{{labels}}} {histogram.total:.6f}")
+                lines.append(f"{latency}_count{{{labels}}} {histogram.count}")
+            lines += [
+                f"# HELP {errors} Callback dispatches and compute stages that raised.",
+                f"# TYPE {errors} counter",
+            ]
+            for (kind, name), histogram in items:
+                labels = f'kind="{kind}",name="{_escape(name)}"'
+                lines.append(f"{errors}{{{labels}}} {histogram.errors}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_start_time_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_start_time_seconds {self.started:.3f}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# One registry per server process, so the endpoint sees every session
+metrics = MetricsRegistry()
+
+
+def timed(name, kind="dispatch"):
+    # Records the duration of each call of the decorated function, sync or
+    # async; for a coroutine function the time until it completes is recorded.
+    # UI callbacks hand their work to a LatestRequestRunner or a task, so on
+    # them this is only the time they hold the event loop ("dispatch"); the
+    # work itself is recorded by the runner or the task as a "stage".
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                error = False
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    error = True
+                    raise
+                finally:
+                    metrics.observe(name, kind, time.perf_counter() - start, error)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            error = False
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                metrics.observe(name, kind, time.perf_counter() - start, error)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,14 @@
+from tornado.web import RequestHandler
+from .metrics import metrics
+
+METRICS_PATH = "metrics"
+
+
+class MetricsHandler(RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.write(metrics.render_text())
+
+
+# Picked up by `panel serve app.py --plugins utils.metricsEndpoint`
+ROUTES = [(f"/{METRICS_PATH}", MetricsHandler, {})]
@@ -0,0 +1,103 @@
+import numpy as np
+from stingray.fourier import normalize_periodograms
+
+NORMALIZATIONS = ("leahy", "frac", "abs", "none")
+
+# Segments transformed per batched FFT call. Bounds the temporary complex array
+# to about SEGMENT_BATCH * n_bin * 8 bytes regardless of the observation length.
+SEGMENT_BATCH = 256
+
+
+def segment_start_indices(lc, n_bin):
+    # Start bin of every run of n_bin consecutive bins lying fully inside a GTI
+    tstart = lc.time[0] - lc.dt / 2
+    gti = lc.gti
+    if gti is None:
+        gti = np.array([[tstart, tstart + lc.n * lc.dt]])
+
+    first = np.ceil((gti[:, 0] - tstart) / lc.dt - 1e-6).astype(np.int64)
+    last = np.floor((gti[:, 1] - tstart) / lc.dt + 1e-6).astype(np.int64)
+    first = np.clip(first, 0, lc.n)
+    last = np.clip(last, 0, lc.n)
+    n_segments = np.maximum((last - first) // n_bin, 0)
+
+    # All segment starts of all GTIs at once, without a Python loop over GTIs
+    gti_of_segment = np.repeat(np.arange(len(gti)), n_segments)
+    rank_in_gti = np.arange(n_segments.sum()) - np.repeat(
+        np.cumsum(n_segments) - n_segments, n_segments
+    )
+    return first[gti_of_segment] + rank_in_gti * n_bin
+
+
+def iter_segment_batches(counts, starts, n_bin, batch=SEGMENT_BATCH):
+    # 2-D (n_segments, n_bin) blocks of the light curve, gathered by fancy indexing
+    offsets = np.arange(n_bin)
+    for i in range(0, len(starts), batch):
+        yield counts[starts[i : i + batch, None] + offsets]
+
+
+def averaged_unnormalized_power(lc, segment_size):
+    n_bin = int(round(segment_size / lc.dt))
+    if n_bin < 2:
+        raise ValueError("The segment size must span at least two time bins.")
+
+    starts = segment_start_indices(lc, n_bin)
+    if not len(starts):
+        raise ValueError("No GTI is long enough for a single segment.")
+
+    counts = np.asarray(lc.counts, dtype=np.float64)
+    # Positive frequencies only, as in stingray: the Nyquist bin is left out
+    n_freq = (n_bin - 1) // 2
+    power_sum = np.zeros(n_freq, dtype=np.float64)
+    n_ph_sum = 0.0
+    for block in iter_segment_batches(counts, starts, n_bin):
+        # One FFT call for the whole batch of segments
+        ft = np.fft.rfft(block, axis=1)[:, 1 : n_freq + 1]
+        power_sum += (ft.real**2 + ft.imag**2).sum(axis=0)
+        n_ph_sum += block.sum()
+
+    n_segments = len(starts)
+    return {
+        "freq": np.fft.rfftfreq(n_bin, lc.dt)[1 : n_freq + 1],
+        "unnorm_power": power_sum / n_segments,
+        "n_segments": n_segments,
+        "n_bin": n_bin,
+        "dt": lc.dt,
+        "mean_n_ph": n_ph_sum / n_segments,
+    }
+
+
+def normalize_averaged_power(result, norm="leahy"):
+    n_ph = result["mean_n_ph"]
+    power = normalize_periodograms(
+        result["unnorm_power"],
+        result["dt"],
+        result["n_bin"],
+        mean_flux=n_ph / result["n_bin"],
+        n_ph=n_ph,
+        norm=norm,
+        power_type="all",
+    )
+    return np.real(power), np.real(power) / np.sqrt(result["n_segments"])
+
+
+def log_rebin(freq, power, power_err, f=0.01):
+    # Logarithmic rebinning: each bin is (1 + f) times wider than the previous
+    if f <= 0:
+        return freq, power, power_err
+
+    df = freq[1] - freq[0] if len(freq) > 1 else 1.0
+    fmin = freq[0] - df / 2
+    span = freq[-1] + df / 2 - fmin
+    n_edges = int(np.ceil(np.log(span * f / df + 1) / np.log(1 + f))) + 1
+    widths = df * (1 + f) ** np.arange(n_edges)
+    edges = fmin + np.concatenate([[0], np.cumsum(widths)])
+
+    index = np.searchsorted(edges, freq, side="right") - 1
+    n_per_bin = np.bincount(index)
+    filled = n_per_bin > 0
+    n = n_per_bin[filled]
+    new_freq = np.bincount(index, weights=freq)[filled] / n
+    new_power = np.bincount(index, weights=power)[filled] / n
+    new_err = np.sqrt(np.bincount(index, weights=power_err**2)[filled]) / n
+    return new_freq, new_power, new_err
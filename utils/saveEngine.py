@@ -0,0 +1,55 @@
+import os
+import time
+import uuid
+
+# Partially written files are kept hidden under this suffix until complete
+TEMP_SUFFIX = ".tmp"
+# Temporary files older than this were left behind by a crashed save
+STALE_TEMP_AGE = 3600
+
+
+def temp_path_for(save_path):
+    directory, name = os.path.split(save_path)
+    return os.path.join(directory, f".{name}.{uuid.uuid4().hex}{TEMP_SUFFIX}")
+
+
+def _fsync_file(path):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def write_event_list_atomic(event_list, save_path, file_format, compression="gzip"):
+    # Runs in a worker thread. The file is written under a temporary name in
+    # the same directory and renamed into place only once complete, so readers
+    # never see (and a crash never leaves) a half-written save_path.
+    tmp_path = temp_path_for(save_path)
+    try:
+        if file_format == "hdf5":
+            # Compression makes h5py store the table as a chunked dataset
+            event_list.to_astropy_table().write(
+                tmp_path, format="hdf5", path="data", compression=compression
+            )
+        else:
+            event_list.write(tmp_path, file_format)
+        _fsync_file(tmp_path)
+        os.replace(tmp_path, save_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return save_path
+
+
+def remove_stale_temp_files(directory, max_age=STALE_TEMP_AGE):
+    now = time.time()
+    removed = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.startswith(".") and name.endswith(TEMP_SUFFIX):
+            try:
+                if now - os.path.getmtime(path) > max_age:
+                    os.remove(path)
+                    removed.append(path)
+            except OSError:
+                pass
+    return removed
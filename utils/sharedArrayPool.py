@@ -0,0 +1,67 @@
+import hashlib
+import threading
+import weakref
+import numpy as np
+
+
+class SharedArrayPool:
+    """Process-wide pool of read-only arrays, deduplicated by content.
+
+    Event lists registered by different sessions that hold identical arrays
+    end up referencing a single copy. The pool keeps only weak references, so
+    an array is freed once no event list uses it any more.
+    """
+
+    def __init__(self):
+        self._arrays = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def content_key(array):
+        # Memory maps of the content-addressed ingestion cache are identified
+        # by their file, which avoids reading them just to hash them
+        if isinstance(array, np.memmap) and array.filename is not None:
+            return ("mmap", array.filename, array.offset, array.dtype.str, array.shape)
+        data = np.ascontiguousarray(array)
+        if array.dtype == np.longdouble and np.finfo(np.longdouble).nmant == 63:
+            # x87 extended precision uses 10 of its 12/16 bytes and the padding is
+            # uninitialised, so only the meaningful bytes can be hashed
+            data = np.ascontiguousarray(
+                data.view(np.uint8).reshape(-1, array.dtype.itemsize)[:, :10]
+            )
+        digest = hashlib.blake2b(data.data, digest_size=20)
+        return ("data", array.dtype.str, array.shape, digest.hexdigest())
+
+    def intern(self, array):
+        key = self.content_key(array)
+        with self._lock:
+            pooled = self._arrays.get(key)
+            if pooled is not None:
+                self.hits += 1
+                self.bytes_saved += array.nbytes
+                return pooled
+            # Shared between sessions, so nobody may modify it in place
+            array.flags.writeable = False
+            self._arrays[key] = array
+            return array
+
+    def intern_event_list(self, event_list):
+        names = [event_list.main_array_attr, "gti"]
+        names += event_list.array_attrs() + event_list.internal_array_attrs()
+        for name in names:
+            value = getattr(event_list, name, None)
+            if isinstance(value, np.ndarray) and value.size:
+                setattr(event_list, name, self.intern(value))
+        return event_list
+
+    def stats(self):
+        with self._lock:
+            arrays = list(self._arrays.values())
+            return {
+                "arrays": len(arrays),
+                "bytes": sum(array.nbytes for array in arrays),
+                "hits": self.hits,
+                "bytes_saved": self.bytes_saved,
+            }
@@ -1,7 +1,41 @@
+import importlib
 import panel as pn
+from .metrics import timed
 
-from functionality.QuickLook.LightCurve import create_quicklook_lightcurve
-from utils.dataIngestion import create_data_ingestion_tabs
+# Each view is imported on first use, so that the heavy dependencies of a view
+# (stingray, holoviews, matplotlib, ...) are only loaded once it is opened
+VIEWS = {
+    "LoadData": ("utils.dataIngestion", "create_data_ingestion_tabs"),
+    "QuickLookLightCurve": (
+        "functionality.QuickLook.LightCurve",
+        "create_quicklook_lightcurve",
+    ),
+    "QuickLookPowerspectra": (
+        "functionality.QuickLook.PowerSpectrum",
+        "create_quicklook_powerspectrum",
+    ),
+    "QuickLookCrossCorrelation": (
+        "functionality.QuickLook.CrossCorrelation",
+        "create_quicklook_crosscorrelation",
+    ),
+    "QuickLookEnergyBands": (
+        "functionality.QuickLook.EnergyBands",
+        "create_quicklook_energy_bands",
+    ),
+    "LightCurveAnalysis": (
+        "functionality.LightCurve.LightCurveAnalysisPanel",
+        "create_light_curve_analysis_panel",
+    ),
+    "Admin": ("utils.adminPanel", "create_admin_panel"),
+}
+
+
+def create_view(key):
+    module_name, factory_name = VIEWS[key]
+    build = timed(f"view.{key}", kind="view")(
+        getattr(importlib.import_module(module_name), factory_name)
+    )
+    return build()
 
 
 def create_sidebar(main):
@@ -9,6 +43,7 @@ def create_sidebar(main):
         ("Light Curve", "QuickLookLightCurve"),
         ("Powerspectra", "QuickLookPowerspectra"),
         ("CrossCorrelation", "QuickLookCrossCorrelation"),
+        ("Energy Bands", "QuickLookEnergyBands"),
     ]
 
     # Load Button
@@ -26,19 +61,34 @@ def create_sidebar(main):
 
     # Load Button changing main content
     def load_data(event):
-        main[:] = [create_data_ingestion_tabs()]
+        main[:] = [create_view("LoadData")]
 
     load_data_button.on_click(load_data)
 
+    light_curve_analysis_button = pn.widgets.Button(
+        name="Light Curve Analysis", button_type="primary", styles={"width": "100%"}
+    )
+
+    def open_light_curve_analysis(event):
+        main[:] = [create_view("LightCurveAnalysis")]
+
+    light_curve_analysis_button.on_click(open_light_curve_analysis)
+
+    # Latency metrics of callbacks and compute stages
+    admin_button = pn.widgets.Button(
+        name="Admin", button_type="light", styles={"width": "100%"}
+    )
+
+    def open_admin(event):
+        main[:] = [create_view("Admin")]
+
+    admin_button.on_click(open_admin)
+
     # Quicklook Button changing main content
     def handle_quicklook_button_selection(event):
         clicked = event.new
-        if clicked == "QuickLookLightCurve":
-            main[:] = [create_quicklook_lightcurve()]
-        elif clicked == "QuickLookPowerspectra":
-            main[:] = [pn.pane.Markdown("### Powerspectra\n\nThis is the content for Powerspectra.")]
-        elif clicked == "QuickLookCrossCorrelation":
-            main[:] = [pn.pane.Markdown("### CrossCorrelation\n\nThis is the content for CrossCorrelation.")]
+        if clicked in VIEWS:
+            main[:] = [create_view(clicked)]
         else:
             main[:] = [pn.pane.Markdown(f"### {clicked}\n\nContent not found.")]
 
@@ -48,7 +98,9 @@ def create_sidebar(main):
     sidebar = pn.Column(
         pn.pane.Markdown("# Navigation"),
         load_data_button,
-        quicklook_stingray_button
+        quicklook_stingray_button,
+        light_curve_analysis_button,
+        admin_button,
     )
 
     return sidebar
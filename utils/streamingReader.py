@@ -0,0 +1,281 @@
+import gzip
+import warnings
+import numpy as np
+from astropy.io import fits
+from stingray import Lightcurve
+from stingray.gti import cross_gtis
+from .binningPyramid import lightcurve_bins
+
+# Rows read per chunk. At ~16-32 bytes per row this keeps each chunk in the
+# tens of megabytes, whatever the size of the file.
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+GTI_HDU_NAMES = ("GTI", "STDGTI")
+ENERGY_COLUMN_CANDIDATES = ("PI", "PHA", "ENERGY")
+# Histogram bins of a float energy column given without bin edges
+DEFAULT_ENERGY_BINS = 256
+
+
+def _open_raw(file_path):
+    with open(file_path, "rb") as f:
+        is_gzip = f.read(2) == b"\x1f\x8b"
+    return gzip.open(file_path, "rb") if is_gzip else open(file_path, "rb")
+
+
+def _find_events_hdu_index(hdul, hduname=None):
+    if hduname is not None:
+        return hdul.index_of(hduname)
+    if "EVENTS" in hdul:
+        return hdul.index_of("EVENTS")
+    for i, hdu in enumerate(hdul):
+        if isinstance(hdu, fits.BinTableHDU) and "TIME" in [
+            name.upper() for name in hdu.columns.names
+        ]:
+            return i
+    raise ValueError("No event HDU with a TIME column found.")
+
+
+def _read_gti(hdul):
+    # GTI extensions are small, so they are read whole; several are crossed,
+    # as stingray does
+    gtis = []
+    for hdu in hdul:
+        if hdu.name.upper() in GTI_HDU_NAMES and isinstance(hdu, fits.BinTableHDU):
+            names = {name.upper(): name for name in hdu.columns.names}
+            if "START" in names and "STOP" in names:
+                gti = np.column_stack(
+                    [hdu.data[names["START"]], hdu.data[names["STOP"]]]
+                ).astype(np.float64)
+                gtis.append(gti[np.argsort(gti[:, 0])])
+    if not gtis:
+        return None
+    return gtis[0] if len(gtis) == 1 else np.asarray(cross_gtis(gtis), dtype=np.float64)
+
+
+def read_event_file_info(file_path, hduname=None):
+    # Only headers and the (small) GTI extension are read here, never the events
+    with fits.open(file_path, lazy_load_hdus=True) as hdul:
+        index = _find_events_hdu_index(hdul, hduname)
+        hdu = hdul[index]
+        header = hdu.header.copy()
+        columns = hdu.columns
+        data_offset = hdul.fileinfo(index)["datLoc"]
+        gti = _read_gti(hdul)
+
+    # FITS tables are stored big-endian, whatever astropy reports natively
+    row_dtype = columns.dtype.newbyteorder(">")
+    if row_dtype.itemsize != header["NAXIS1"]:
+        raise ValueError(
+            f"Unsupported row layout in '{file_path}' (variable-length columns?)."
+        )
+
+    # TIMEZERO (and TIMEPIXR, the position of the time stamp within a TIMEDEL
+    # frame) shift the GTIs and the header time range as well as the events
+    timedel = header.get("TIMEDEL", 0.0)
+    timezero = header.get("TIMEZERO", 0.0)
+    if "TIMEPIXR" in header:
+        timezero += (0.5 - header["TIMEPIXR"]) * timedel
+    if gti is not None:
+        gti = gti + timezero
+
+    if "MJDREFI" in header:
+        mjdref = header["MJDREFI"] + header.get("MJDREFF", 0.0)
+    else:
+        mjdref = header.get("MJDREF", 0.0)
+
+    return {
+        "file_path": file_path,
+        "header": header,
+        "columns": {
+            col.name.upper(): (col.name, col.bscale, col.bzero) for col in columns
+        },
+        "column_limits": {
+            col.name.upper(): (header[f"TLMIN{i}"], header[f"TLMAX{i}"])
+            for i, col in enumerate(columns, start=1)
+            if f"TLMIN{i}" in header and f"TLMAX{i}" in header
+        },
+        "dt": timedel,
+        "row_dtype": row_dtype,
+        "n_rows": header["NAXIS2"],
+        "data_offset": data_offset,
+        "gti": gti,
+        "mjdref": mjdref,
+        "timezero": timezero,
+        "tstart": None if "TSTART" not in header else header["TSTART"] + timezero,
+        "tstop": None if "TSTOP" not in header else header["TSTOP"] + timezero,
+    }
+
+
+def iter_event_chunks(
+    file_path, columns=("TIME",), chunk_rows=DEFAULT_CHUNK_ROWS, info=None
+):
+    # Yields {column: ndarray} for consecutive blocks of at most chunk_rows rows,
+    # reading the raw table bytes directly so that only one chunk is in memory
+    if info is None:
+        info = read_event_file_info(file_path)
+
+    wanted = [name.upper() for name in columns]
+    missing = [name for name in wanted if name not in info["columns"]]
+    if missing:
+        raise ValueError(f"Columns {missing} not found in '{file_path}'.")
+
+    row_dtype = info["row_dtype"]
+    n_rows = info["n_rows"]
+
+    with _open_raw(file_path) as f:
+        f.seek(info["data_offset"])
+        for start in range(0, n_rows, chunk_rows):
+            n = min(chunk_rows, n_rows - start)
+            buffer = f.read(n * row_dtype.itemsize)
+            records = np.frombuffer(buffer, dtype=row_dtype, count=n)
+
+            chunk = {}
+            for name in wanted:
+                raw_name, bscale, bzero = info["columns"][name]
+                values = records[raw_name]
+                if bscale not in (None, 1) or bzero not in (None, 0):
+                    values = values * (1 if bscale is None else bscale) + (
+                        0 if bzero is None else bzero
+                    )
+                else:
+                    values = values.astype(values.dtype.newbyteorder("="))
+                chunk[name] = values
+            if "TIME" in chunk:
+                chunk["TIME"] = chunk["TIME"].astype(np.float64) + info["timezero"]
+            yield chunk
+
+
+class StreamingEventBinner:
+    # Accumulates a light curve and an energy histogram one chunk at a time on
+    # a fixed grid of n_bins time bins starting at tstart
+
+    def __init__(self, dt, tstart, n_bins, energy_edges=None):
+        self.dt = dt
+        self.tstart = tstart
+        self.n_bins = max(n_bins, 1)
+        self.counts = np.zeros(self.n_bins, dtype=np.int64)
+        self.energy_edges = energy_edges
+        self.energy_counts = (
+            None
+            if energy_edges is None
+            else np.zeros(len(energy_edges) - 1, dtype=np.int64)
+        )
+        self.n_events = 0
+        self.n_outside = 0
+        self.time_range = [np.inf, -np.inf]
+
+    def update(self, time, energy=None):
+        self.n_events += time.size
+        if time.size:
+            self.time_range[0] = min(self.time_range[0], float(time.min()))
+            self.time_range[1] = max(self.time_range[1], float(time.max()))
+
+        bin_index = np.floor((time - self.tstart) / self.dt).astype(np.int64)
+        inside = (bin_index >= 0) & (bin_index < self.n_bins)
+        self.n_outside += int(time.size - np.count_nonzero(inside))
+        self.counts += np.bincount(bin_index[inside], minlength=self.n_bins)
+
+        if energy is not None:
+            self._update_energy(energy)
+
+    def _update_energy(self, energy):
+        if self.energy_edges is not None:
+            self.energy_counts += np.histogram(energy, bins=self.energy_edges)[0]
+            return
+
+        # Integer channels (PI/PHA): one bin per channel, grown as needed
+        channels = energy.astype(np.int64)
+        channels = channels[channels >= 0]
+        chunk_counts = np.bincount(channels)
+        if self.energy_counts is None:
+            self.energy_counts = chunk_counts
+        else:
+            if chunk_counts.size > self.energy_counts.size:
+                chunk_counts[: self.energy_counts.size] += self.energy_counts
+                self.energy_counts = chunk_counts
+            else:
+                self.energy_counts[: chunk_counts.size] += chunk_counts
+
+    @property
+    def time(self):
+        return self.tstart + (np.arange(self.n_bins) + 0.5) * self.dt
+
+
+def stream_binned_products(
+    file_path,
+    dt,
+    chunk_rows=DEFAULT_CHUNK_ROWS,
+    energy_column=None,
+    energy_edges=None,
+):
+    info = read_event_file_info(file_path)
+
+    if energy_column is None:
+        energy_column = next(
+            (name for name in ENERGY_COLUMN_CANDIDATES if name in info["columns"]),
+            None,
+        )
+    else:
+        energy_column = energy_column.upper()
+    if energy_column is not None and energy_edges is None:
+        raw_name = info["columns"][energy_column][0]
+        if info["row_dtype"][raw_name].kind == "f":
+            # Calibrated energies: linear bins over the column's declared range
+            limits = info["column_limits"].get(energy_column)
+            if limits is None:
+                warnings.warn(
+                    f"No range declared for the '{energy_column}' column; "
+                    "the energy histogram is skipped."
+                )
+                energy_column = None
+            else:
+                energy_edges = np.linspace(*limits, DEFAULT_ENERGY_BINS + 1)
+
+    # The dt that EventList.to_lc would use: a multiple of the time resolution
+    if info["dt"] > 0 and not np.isclose(info["dt"], dt, rtol=1e-4):
+        dt = info["dt"] * max(np.rint(dt / info["dt"]), 1)
+
+    gti = info["gti"]
+    if gti is None or not len(gti):
+        # Without a GTI extension, stingray takes the span of the events, found
+        # in a cheap first pass over TIME alone
+        tstart, tstop = np.inf, -np.inf
+        for chunk in iter_event_chunks(file_path, ("TIME",), chunk_rows, info):
+            if chunk["TIME"].size:
+                tstart = min(tstart, chunk["TIME"].min())
+                tstop = max(tstop, chunk["TIME"].max())
+        if not np.isfinite(tstart):
+            raise ValueError(f"No events found in '{file_path}'.")
+        gti = np.array([[tstart, tstop]])
+
+    # The grid of Lightcurve.make_lightcurve, anchored on the first GTI start
+    tstart, tstop = float(np.min(gti)), float(np.max(gti))
+    binner = StreamingEventBinner(
+        dt, tstart, lightcurve_bins(tstart, tstop, dt), energy_edges=energy_edges
+    )
+    columns = ("TIME",) if energy_column is None else ("TIME", energy_column)
+    for chunk in iter_event_chunks(file_path, columns, chunk_rows, info):
+        binner.update(
+            chunk["TIME"], None if energy_column is None else chunk[energy_column]
+        )
+
+    lc = Lightcurve(
+        binner.time,
+        binner.counts,
+        dt=dt,
+        gti=gti,
+        mjdref=info["mjdref"],
+        skip_checks=True,
+    )
+
+    return {
+        "lightcurve": lc,
+        "gti": gti,
+        "n_events": binner.n_events,
+        "n_outside": binner.n_outside,
+        "time_range": tuple(binner.time_range),
+        "energy_column": energy_column,
+        "energy_edges": energy_edges,
+        "energy_counts": binner.energy_counts,
+        "mjdref": info["mjdref"],
+    }
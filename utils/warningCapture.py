@@ -0,0 +1,190 @@
+import asyncio
+import contextlib
+import contextvars
+import functools
+import sys
+import threading
+import warnings
+from collections import OrderedDict
+
+# Distinct warnings kept per capture; older ones are dropped first
+DEFAULT_MAX_ENTRIES = 100
+
+_current_log = contextvars.ContextVar("warning_log", default=None)
+# Warnings raised outside any capture, already passed on once
+_uncaptured_seen = set()
+_uncaptured_lock = threading.Lock()
+MAX_UNCAPTURED_SEEN = 10_000
+
+# The dispatcher is installed while at least one capture is active, in any
+# task or thread, and the previous warnings state restored after the last one
+_install_lock = threading.Lock()
+_active_captures = 0
+_original_showwarning = None
+_installed_filters = []
+_saved_filters = []
+_default_showwarning = warnings.showwarning
+
+
+class WarningLog:
+    """Warnings of one task, deduplicated with counts, in a bounded buffer.
+
+    A repeated warning only increments the count of its entry, so a file that
+    raises the same warning for every row costs one entry.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.dropped = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, message, category=None, filename=None, lineno=None):
+        key = (str(message), category, filename, lineno)
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] += 1
+                self._entries.move_to_end(key)
+                return
+            if len(self._entries) >= self.max_entries:
+                self._entries.popitem(last=False)
+                self.dropped += 1
+            self._entries[key] = 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.dropped = 0
+
+    def entries(self):
+        with self._lock:
+            return [(*key, count) for key, count in self._entries.items()]
+
+    def format(self):
+        lines = []
+        if self.dropped:
+            lines.append(f"({self.dropped} older distinct warnings not shown)\n")
+        for message, category, filename, lineno, count in self.entries():
+            text = (
+                f"Message: {message}\n"
+                f"Category: {category.__name__ if category else 'N/A'}\n"
+                f"File: {filename if filename else 'N/A'}\n"
+                f"Line: {lineno if lineno else 'N/A'}\n"
+            )
+            if count > 1:
+                text += f"Occurrences: {count}\n"
+            lines.append(text)
+        return "\n".join(lines)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+
+def _showwarning(message, category, filename, lineno, file=None, line=None):
+    log = _current_log.get()
+    if log is not None:
+        log.add(message, category, filename, lineno)
+        return
+    show = _original_showwarning or _default_showwarning
+    if _installed_filters:
+        # The "always" filter is ours: outside a capture, behave like the
+        # "default" action and show each warning once per location
+        key = (str(message), category, filename, lineno)
+        with _uncaptured_lock:
+            if key in _uncaptured_seen:
+                return
+            if len(_uncaptured_seen) >= MAX_UNCAPTURED_SEEN:
+                _uncaptured_seen.clear()
+            _uncaptured_seen.add(key)
+    show(message, category, filename, lineno, file, line)
+
+
+def _install():
+    global _active_captures, _original_showwarning
+    with _install_lock:
+        _active_captures += 1
+        if _active_captures > 1:
+            return
+        _original_showwarning = warnings.showwarning
+        warnings.showwarning = _showwarning
+        # Filters given with -W or PYTHONWARNINGS are left to decide
+        if not sys.warnoptions:
+            _saved_filters[:] = warnings.filters
+            # Every warning reaches the dispatcher, which counts repeats itself
+            warnings.simplefilter("always")
+            _installed_filters.append(warnings.filters[0])
+            # Raised by the garbage collector, in whichever task triggers it
+            warnings.filterwarnings("ignore", category=ResourceWarning)
+            _installed_filters.append(warnings.filters[0])
+
+
+def _uninstall():
+    global _active_captures, _original_showwarning
+    with _install_lock:
+        _active_captures -= 1
+        if _active_captures:
+            return
+        if warnings.showwarning is _showwarning:
+            warnings.showwarning = _original_showwarning
+        _original_showwarning = None
+        # Only our own entries are removed, whatever was added meanwhile, and
+        # equal entries they displaced are put back where they were
+        filters = [
+            entry
+            for entry in warnings.filters
+            if not any(entry is installed for installed in _installed_filters)
+        ]
+        for index, entry in enumerate(_saved_filters):
+            if entry in _installed_filters and not any(entry is kept for kept in filters):
+                filters.insert(index, entry)
+        warnings.filters[:] = filters
+        _installed_filters.clear()
+        _saved_filters.clear()
+
+
+def current_warning_log():
+    return _current_log.get()
+
+
+@contextlib.contextmanager
+def capture_warnings(max_entries=DEFAULT_MAX_ENTRIES):
+    # Nested captures share the outermost log of the task
+    log = _current_log.get()
+    if log is not None:
+        yield log
+        return
+    log = WarningLog(max_entries)
+    token = _current_log.set(log)
+    _install()
+    try:
+        yield log
+    finally:
+        _uninstall()
+        _current_log.reset(token)
+
+
+def captures_warnings(func):
+    # Runs each call of func, sync or async, in its own warning capture
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with capture_warnings():
+                return await func(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with capture_warnings():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def in_context(func, *args):
+    # For run_in_executor: threads do not inherit context variables, so the
+    # call runs in a copy of the caller's context and warns into its log
+    return functools.partial(contextvars.copy_context().run, func, *args)